@@ -1,3 +0,0 @@
-from __future__ import absolute_import
-
-from . import urllib3
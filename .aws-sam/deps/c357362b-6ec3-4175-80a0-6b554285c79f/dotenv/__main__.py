@@ -1,6 +0,0 @@
-"""Entry point for cli, enables execution with `python -m dotenv`"""
-
-from .cli import cli
-
-if __name__ == "__main__":
-    cli()
@@ -1,2 +0,0 @@
-# This file is protected via CODEOWNERS
-__version__ = "1.26.19"
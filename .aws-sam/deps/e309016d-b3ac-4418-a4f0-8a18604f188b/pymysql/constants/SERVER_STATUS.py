@@ -1,10 +0,0 @@
-SERVER_STATUS_IN_TRANS = 1
-SERVER_STATUS_AUTOCOMMIT = 2
-SERVER_MORE_RESULTS_EXISTS = 8
-SERVER_QUERY_NO_GOOD_INDEX_USED = 16
-SERVER_QUERY_NO_INDEX_USED = 32
-SERVER_STATUS_CURSOR_EXISTS = 64
-SERVER_STATUS_LAST_ROW_SENT = 128
-SERVER_STATUS_DB_DROPPED = 256
-SERVER_STATUS_NO_BACKSLASH_ESCAPES = 512
-SERVER_STATUS_METADATA_CHANGED = 1024
@@ -0,0 +1,96 @@
+import os
+import logging
+from saes_common.profiles import TOKEN_CLAIMS
+from saes_common.tokens import ROLE_CLAIM, InvalidToken, issuer_url, verify_token
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+
+# Roles que solo concede la pertenencia al grupo de Cognito, nunca ``custom:role``:
+# el usuario puede escribir sus atributos con UpdateUserAttributes
+GROUP_ONLY_ROLES = frozenset(('admin',))
+
+# Rutas protegidas por JwtAuthorizer: (método, recurso de API Gateway) -> roles que pueden usarla
+ROUTE_ROLES = {
+    ('POST', '/profile'): ('admin', 'usuario'),
+    ('POST', '/admin'): ('admin',),
+    ('POST', '/users/bulk'): ('admin',),
+    ('GET', '/users'): ('admin',),
+}
+
+def lambda_handler(event, context):
+    """
+    Authorizer de tipo TOKEN para API Gateway.
+
+    Verifica en local el JWT de Cognito de la cabecera ``Authorization`` con
+    el JWKS del user pool (descargado una vez por contenedor) y devuelve una
+    política con todas las rutas que permite el rol del usuario, no solo la
+    pedida: API Gateway la guarda en caché por token y la reutiliza en las
+    demás rutas. Un token inválido responde 401 (``Unauthorized``).
+    """
+    token = event.get('authorizationToken') or ''
+    if token.lower().startswith('bearer '):
+        token = token[7:]
+
+    try:
+        claims = verify_token(token, issuer_url(os.environ['REGION_NAME'], os.environ['USER_POOL_ID']),
+                              client_id=os.environ.get('CLIENT_ID'))
+    except InvalidToken as e:
+        logging.info("Rejected token: %s", e)
+        # API Gateway solo traduce a 401 esta excepción exacta
+        raise Exception('Unauthorized')
+
+    groups = list(claims.get('cognito:groups') or [])
+    roles = token_roles(claims, groups)
+    role = 'admin' if 'admin' in roles else (roles[0] if roles else None)
+    return {
+        'principalId': claims['sub'],
+        'policyDocument': build_policy(event['methodArn'], roles),
+        'context': build_context(claims, groups, role),
+    }
+
+def token_roles(claims, groups):
+    """
+    Roles del usuario: sus grupos de Cognito. Sin grupos se usa ``custom:role``
+    (solo en el IdToken), salvo que sea uno de ``GROUP_ONLY_ROLES``.
+    """
+    if groups:
+        return groups
+    role = claims.get(ROLE_CLAIM)
+    return [role] if role and role not in GROUP_ONLY_ROLES else []
+
+def build_policy(method_arn, roles):
+    # methodArn: arn:aws:execute-api:<region>:<cuenta>:<api>/<stage>/<método>/<recurso>
+    api_arn = '/'.join(method_arn.split('/')[:2])
+    resources = [route_arn(api_arn, method, resource)
+                 for (method, resource), allowed in ROUTE_ROLES.items() if set(allowed) & set(roles)]
+    return {
+        'Version': '2012-10-17',
+        'Statement': [{
+            'Action': 'execute-api:Invoke',
+            'Effect': 'Allow' if resources else 'Deny',
+            'Resource': resources or [f"{api_arn}/*"],
+        }],
+    }
+
+def route_arn(api_arn, method, resource):
+    # Los parámetros de ruta ({id}) se cubren con un comodín
+    path = '/'.join('*' if part.startswith('{') else part for part in resource.strip('/').split('/'))
+    return f"{api_arn}/{method}/{path}"
+
+def build_context(claims, groups, role):
+    """
+    Contexto que API Gateway pasa a los handlers en ``requestContext.authorizer``
+    (solo admite valores simples): los claims del usuario con los mismos
+    nombres que los del ``CognitoAuthorizer``, los grupos reales de Cognito
+    separados por comas (``profile_admin`` confía en ellos) y el rol resuelto.
+    """
+    context = {name: value for name, value in claims.items()
+               if name not in TOKEN_CLAIMS and isinstance(value, (str, int, float, bool))}
+    context.update({
+        'token_use': claims['token_use'],
+        'cognito:username': claims.get('cognito:username') or claims.get('username'),
+        'cognito:groups': ','.join(groups),
+        'role': role or '',
+    })
+    return context
@@ -0,0 +1,71 @@
+"""
+Compara el coste por invocación de crear un cliente de boto3 dentro del handler
+frente a reutilizar el cliente de ``saes_common.clients``.
+
+Las llamadas a Cognito se responden con un ``Stubber`` de botocore, así que la
+medición recoge la construcción del cliente (carga del modelo, endpoint,
+handlers) pero no el handshake TLS que además se ahorra en AWS.
+
+    python benchmarks/bench_clients.py --iterations 200
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'layers', 'common'))
+
+import boto3
+from botocore.stub import Stubber
+
+from saes_common import clients
+
+REGION = 'us-east-1'
+USER_POOL_ID = 'us-east-1_example'
+
+def _stubbed_call(client):
+    with Stubber(client) as stubber:
+        stubber.add_response('admin_get_user', {'Username': 'user@example.com', 'UserAttributes': []})
+        client.admin_get_user(UserPoolId=USER_POOL_ID, Username='user@example.com')
+
+def per_invocation_client():
+    # Patrón anterior: cliente nuevo en cada lambda_handler
+    _stubbed_call(boto3.client('cognito-idp', region_name=REGION))
+
+def shared_client():
+    _stubbed_call(clients.cognito_client(REGION))
+
+def measure(func, iterations):
+    func()  # primera llamada fuera de la medición (equivale al cold start)
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return {
+        'p50_ms': round(statistics.median(samples), 3),
+        'p99_ms': round(samples[int(len(samples) * 0.99) - 1], 3),
+        'mean_ms': round(statistics.mean(samples), 3),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--iterations', type=int, default=100)
+    args = parser.parse_args()
+
+    os.environ.setdefault('AWS_ACCESS_KEY_ID', 'testing')
+    os.environ.setdefault('AWS_SECRET_ACCESS_KEY', 'testing')
+
+    results = {
+        'per_invocation_client': measure(per_invocation_client, args.iterations),
+        'shared_client': measure(shared_client, args.iterations),
+    }
+    results['saving_per_invocation_ms'] = round(
+        results['per_invocation_client']['mean_ms'] - results['shared_client']['mean_ms'], 3)
+    print(json.dumps(results, indent=2))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,118 @@
+"""
+Latencia por alta de usuario en MySQL: escritura anterior de ``create_user``
+(INSERT, COMMIT, SELECT LAST_INSERT_ID(), INSERT, COMMIT) frente a
+``insert_user_with_profile`` (una transacción con ``cursor.lastrowid``).
+
+Sin ``--mysql-host`` se usa la conexión falsa de ``local_stubs`` con una
+latencia simulada por round trip (``--round-trip-ms``). Con ``--mysql-host``
+se escribe en un MySQL local; se crean las tablas ``users`` y
+``user_profiles`` si no existen, así que conviene usar una base de pruebas.
+
+    python benchmarks/bench_create_user.py --signups 200 --round-trip-ms 1
+    python benchmarks/bench_create_user.py --mysql-host 127.0.0.1 --mysql-user root --mysql-database saes_bench
+"""
+import argparse
+import json
+import statistics
+import time
+import uuid
+
+import local_stubs
+
+local_stubs.use_layer()
+
+import pymysql
+
+from saes_common import db
+from saes_common.users import insert_user_with_profile
+
+SCHEMA = (
+    """CREATE TABLE IF NOT EXISTS users (
+        user_id INT AUTO_INCREMENT PRIMARY KEY,
+        username VARCHAR(255), password VARCHAR(255), email VARCHAR(255), role VARCHAR(50))""",
+    """CREATE TABLE IF NOT EXISTS user_profiles (
+        profile_id INT AUTO_INCREMENT PRIMARY KEY,
+        user_id INT NOT NULL)""",
+)
+
+def legacy_insert(connection, username, password, email, role):
+    # Escritura anterior de create_user/app.py, para comparar
+    with connection.cursor() as cursor:
+        cursor.execute("INSERT INTO users (username, password, email, role) VALUES (%s, %s, %s, %s)",
+                       (username, password, email, role))
+        connection.commit()
+        cursor.execute("SELECT LAST_INSERT_ID()")
+        user_id = cursor.fetchone()[0]
+        cursor.execute("INSERT INTO user_profiles (user_id) VALUES (%s)", (user_id,))
+        connection.commit()
+    return user_id
+
+def count_round_trips(connection):
+    """Cuenta los comandos enviados por una conexión real de PyMySQL (cada uno es un round trip)."""
+    original = connection._execute_command
+    connection.round_trips = 0
+
+    def execute_command(command, sql):
+        connection.round_trips += 1
+        return original(command, sql)
+
+    connection._execute_command = execute_command
+    return connection
+
+def run(insert, connection, signups):
+    samples = []
+    round_trips_before = connection.round_trips
+    for _ in range(signups):
+        email = f"bench-{uuid.uuid4().hex[:12]}@example.com"
+        start = time.perf_counter()
+        insert(connection, email, 'Temp1234!', email, 'usuario')
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return {
+        'signups': signups,
+        'round_trips_per_signup': (connection.round_trips - round_trips_before) / signups,
+        'p50_ms': round(statistics.median(samples), 3),
+        'p99_ms': round(samples[min(len(samples) - 1, int(len(samples) * 0.99))], 3),
+        'mean_ms': round(statistics.mean(samples), 3),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description='create_user write path benchmark')
+    parser.add_argument('--signups', type=int, default=200)
+    parser.add_argument('--round-trip-ms', type=float, default=1.0,
+                        help='Simulated latency per round trip (fake connection only)')
+    parser.add_argument('--mysql-host')
+    parser.add_argument('--mysql-port', type=int, default=3306)
+    parser.add_argument('--mysql-user', default='root')
+    parser.add_argument('--mysql-password', default='')
+    parser.add_argument('--mysql-database', default='saes_bench')
+    parser.add_argument('--output', help='Write JSON results to this file')
+    args = parser.parse_args()
+
+    if args.mysql_host:
+        connection = count_round_trips(pymysql.connect(
+            host=args.mysql_host, port=args.mysql_port, user=args.mysql_user,
+            password=args.mysql_password, database=args.mysql_database, autocommit=True
+        ))
+        with connection.cursor() as cursor:
+            for statement in SCHEMA:
+                cursor.execute(statement)
+        target = f"mysql://{args.mysql_host}:{args.mysql_port}/{args.mysql_database}"
+    else:
+        connection = local_stubs.FakeConnection(round_trip_ms=args.round_trip_ms)
+        target = f"fake connection, {args.round_trip_ms} ms per round trip"
+
+    results = {
+        'target': target,
+        'legacy': run(legacy_insert, connection, args.signups),
+        'single_transaction': run(insert_user_with_profile, connection, args.signups),
+        'layer_round_trips': dict(db.round_trips),
+    }
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output)
+    print(output)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,155 @@
+"""
+Compara el despliegue de una función por ruta con el de una sola función
+enrutada (``RouterFunction``, parámetro ``Lambdalith=true``).
+
+Se reproduce la misma secuencia de peticiones en ambos modelos:
+
+- por función: un intérprete nuevo por función; su primera petición es un
+  cold start y cada función abre su propia conexión y lee su propio secreto;
+- lambdalith: un único intérprete para todas las rutas, que comparten
+  contenedor, conexión a MySQL, secreto en caché y clientes de AWS.
+
+Las latencias de red se simulan con ``--aws-latency-ms`` (cada llamada a
+Cognito / Secrets Manager) y ``--db-handshake-ms`` (TCP + TLS + auth a RDS).
+
+    python benchmarks/bench_lambdalith.py --aws-latency-ms 30 --db-handshake-ms 25
+"""
+import argparse
+import importlib
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, HERE)
+
+import local_stubs
+from cold_start import SCENARIOS, load_functions
+
+# Función -> (método, recurso) con el que API Gateway la invoca
+ROUTES = {
+    'CreateUserFunction': ('POST', '/users'),
+    'BulkCreateUsersFunction': ('POST', '/users/bulk'),
+    'GetUserFunction': ('GET', '/users/{id}'),
+    'GetUsersFunction': ('GET', '/users'),
+    'UpdateUserFunction': ('PUT', '/users/{id}'),
+    'DeleteUserFunction': ('DELETE', '/users/{id}'),
+    'LoginUserFunction': ('POST', '/login'),
+    'ProfileUserFunction': ('POST', '/profile'),
+    'ProfileAdminFunction': ('POST', '/admin'),
+}
+
+# Mezcla de tráfico por defecto: rutas frecuentes (login, perfil, lectura) y
+# rutas poco usadas (/admin, DELETE) que en el modelo por función casi siempre
+# caen en un contenedor frío.
+DEFAULT_MIX = (
+    ['LoginUserFunction', 'ProfileUserFunction', 'GetUserFunction'] * 4
+    + ['UpdateUserFunction', 'ProfileAdminFunction', 'DeleteUserFunction', 'CreateUserFunction']
+)
+
+def run_sequence(logical_id, sequence, aws_latency_ms, db_handshake_ms):
+    """Se ejecuta en un intérprete nuevo: importa el handler e invoca la secuencia."""
+    code_dir, handler, environment, _ = load_functions()[logical_id]
+    os.environ.update(environment)
+    local_stubs.fake_aws_environment()
+    sys.path.insert(0, code_dir)
+    local_stubs.use_layer()
+
+    module_name, function_name = handler.rsplit('.', 1)
+    start = time.perf_counter()
+    lambda_handler = getattr(importlib.import_module(module_name), function_name)
+    import_ms = (time.perf_counter() - start) * 1000
+
+    # Respuestas de Cognito en el orden en que se van a pedir; el secreto se
+    # ofrece una vez por petición aunque la caché solo lo lea la primera vez.
+    cognito = [response for route in sequence for response in SCENARIOS[route].get('cognito', [])]
+    rows = [row for route in sequence for row in SCENARIOS[route].get('rows', [])]
+    connection = local_stubs.install_fake_mysql(rows=rows[:1], handshake_ms=db_handshake_ms)
+    if cognito:
+        local_stubs.stub_client('cognito-idp', cognito, latency_ms=aws_latency_ms)
+    local_stubs.stub_secret(times=len(sequence), latency_ms=aws_latency_ms)
+
+    calls = []
+    for route in sequence:
+        method, resource = ROUTES[route]
+        event = dict(SCENARIOS[route]['event'], httpMethod=method, resource=resource)
+        start = time.perf_counter()
+        response = lambda_handler(event, None)
+        calls.append({'route': route, 'ms': (time.perf_counter() - start) * 1000,
+                      'status_code': response['statusCode']})
+
+    print(json.dumps({
+        'import_ms': import_ms,
+        'calls': calls,
+        'db_handshakes': connection.handshakes,
+        'aws_calls': {f"{service}:{operation}": count
+                      for (service, operation), count in local_stubs.aws_calls.items()},
+    }))
+
+def spawn(logical_id, sequence, args):
+    process = subprocess.run(
+        [sys.executable, __file__, '--run', logical_id, '--sequence', ','.join(sequence),
+         '--aws-latency-ms', str(args.aws_latency_ms), '--db-handshake-ms', str(args.db_handshake_ms)],
+        capture_output=True, text=True, cwd=local_stubs.ROOT
+    )
+    if process.returncode != 0:
+        raise RuntimeError(f"{logical_id} failed:\n{process.stderr[-2000:]}")
+    return json.loads(process.stdout.strip().splitlines()[-1])
+
+def summarize(runs):
+    calls = [call for run in runs for call in run['calls']]
+    aws_calls = {}
+    for run in runs:
+        for key, count in run['aws_calls'].items():
+            aws_calls[key] = aws_calls.get(key, 0) + count
+    per_route = {}
+    for call in calls:
+        per_route.setdefault(call['route'], []).append(call['ms'])
+    return {
+        'cold_starts': len(runs),
+        'total_ms': round(sum(run['import_ms'] for run in runs) + sum(call['ms'] for call in calls), 3),
+        'import_ms': round(sum(run['import_ms'] for run in runs), 3),
+        'db_handshakes': sum(run['db_handshakes'] for run in runs),
+        'aws_calls': aws_calls,
+        'route_p50_ms': {route: round(statistics.median(samples), 3) for route, samples in per_route.items()},
+        'errors': [call for call in calls if call['status_code'] >= 500],
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description='Per-function vs single routed function benchmark')
+    parser.add_argument('--sequence', help='Comma separated logical ids (default: built-in traffic mix)')
+    parser.add_argument('--aws-latency-ms', type=float, default=0.0)
+    parser.add_argument('--db-handshake-ms', type=float, default=0.0)
+    parser.add_argument('--output', help='Write JSON results to this file')
+    parser.add_argument('--run', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    sequence = args.sequence.split(',') if args.sequence else DEFAULT_MIX
+
+    if args.run:
+        run_sequence(args.run, sequence, args.aws_latency_ms, args.db_handshake_ms)
+        return
+
+    # Un contenedor por función, cada uno con las peticiones de su ruta en orden
+    per_function = [spawn(logical_id, [route for route in sequence if route == logical_id], args)
+                    for logical_id in dict.fromkeys(sequence)]
+    lambdalith = [spawn('RouterFunction', sequence, args)]
+
+    results = {
+        'sequence': sequence,
+        'aws_latency_ms': args.aws_latency_ms,
+        'db_handshake_ms': args.db_handshake_ms,
+        'per_function': summarize(per_function),
+        'lambdalith': summarize(lambdalith),
+    }
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output)
+    print(output)
+
+if __name__ == '__main__':
+    main()
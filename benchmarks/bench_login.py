@@ -0,0 +1,95 @@
+"""
+Latencia de ``login_user``: rol leído de los claims del IdToken frente al
+``admin_get_user`` que se hacía en cada login (y que sigue siendo el respaldo
+cuando el token no trae ``custom:role``), y renovación con ``refresh_token``.
+
+Cognito se responde con un ``Stubber`` y una latencia simulada por llamada
+(``--cognito-latency-ms``), así que la diferencia es el round trip ahorrado
+más el coste de decodificar el token en local.
+
+    python benchmarks/bench_login.py --logins 200 --cognito-latency-ms 20
+"""
+import argparse
+import importlib
+import json
+import os
+import statistics
+import sys
+import time
+
+import local_stubs
+
+local_stubs.use_layer()
+local_stubs.fake_aws_environment()
+sys.path.insert(0, os.path.join(local_stubs.ROOT, 'login_user'))
+
+USERNAME = 'user@example.com'
+EVENT = {'body': json.dumps({'username': USERNAME, 'password': 'Secret1!'})}
+REFRESH_EVENT = {'body': json.dumps({'refresh_token': 'refresh'})}
+
+def auth_result(claims):
+    return ('initiate_auth', {'AuthenticationResult': {
+        'IdToken': local_stubs.fake_jwt(claims), 'AccessToken': 'access', 'RefreshToken': 'refresh'}})
+
+SCENARIOS = {
+    # Token sin el claim: mismo número de llamadas que el login anterior
+    'admin_get_user': [
+        auth_result({'cognito:username': USERNAME}),
+        ('admin_get_user', {'Username': USERNAME, 'UserAttributes': [{'Name': 'custom:role', 'Value': 'usuario'}]}),
+    ],
+    'token_claims': [
+        auth_result({'cognito:username': USERNAME, 'custom:role': 'usuario'}),
+    ],
+    # Renovación de sesión con REFRESH_TOKEN_AUTH (en Cognito no repite la comprobación de contraseña)
+    'refresh_token': [
+        auth_result({'cognito:username': USERNAME, 'custom:role': 'usuario'}),
+    ],
+}
+
+def run(handler, event, logins):
+    samples = []
+    for _ in range(logins):
+        start = time.perf_counter()
+        response = handler(event, None)
+        samples.append((time.perf_counter() - start) * 1000)
+        assert response['statusCode'] == 200 and json.loads(response['body'])['role'] == 'usuario', response
+    samples.sort()
+    return {
+        'logins': logins,
+        'p50_ms': round(statistics.median(samples), 3),
+        'p99_ms': round(samples[min(len(samples) - 1, int(len(samples) * 0.99))], 3),
+        'mean_ms': round(statistics.mean(samples), 3),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description='login_user role lookup benchmark')
+    parser.add_argument('--logins', type=int, default=200)
+    parser.add_argument('--cognito-latency-ms', type=float, default=20.0,
+                        help='Simulated latency per Cognito API call')
+    parser.add_argument('--output', help='Write JSON results to this file')
+    args = parser.parse_args()
+
+    os.environ.update({'REGION_NAME': local_stubs.REGION, 'CLIENT_ID': 'client', 'USER_POOL_ID': 'pool'})
+    app = importlib.import_module('app')
+
+    # Las respuestas de todas las iteraciones se encolan de una vez, escenario tras escenario
+    responses = [response for scenario in SCENARIOS.values() for response in scenario * (args.logins + 1)]
+    stubber = local_stubs.stub_client('cognito-idp', responses, latency_ms=args.cognito_latency_ms)
+
+    results = {'cognito_latency_ms': args.cognito_latency_ms}
+    for name in SCENARIOS:
+        event = REFRESH_EVENT if name == 'refresh_token' else EVENT
+        app.lambda_handler(event, None)  # calentamiento, fuera de la medición
+        calls_before = sum(local_stubs.aws_calls.values())
+        results[name] = run(app.lambda_handler, event, args.logins)
+        results[name]['cognito_calls_per_login'] = (sum(local_stubs.aws_calls.values()) - calls_before) / args.logins
+    stubber.assert_no_pending_responses()
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output)
+    print(output)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,170 @@
+"""
+Mide el retraso de replicación entre el writer y el reader de MySQL y cuántas
+lecturas justo después de una escritura verían un dato viejo en el reader
+(lo que evita ``READ_YOUR_WRITES``).
+
+Cada sonda escribe una marca de tiempo en ``replication_heartbeat`` en el
+writer, lee una vez el reader y el writer (lectura inmediata tras escribir) y
+después sondea el reader hasta ver la marca.
+
+Sin ``--writer-host`` se usa una réplica simulada con ``--simulated-lag-ms``
+de retraso (más ``--simulated-jitter-ms`` aleatorio). Con ``--writer-host`` y
+``--reader-host`` se mide contra MySQL/RDS real; la tabla se crea si no
+existe, así que conviene usar una base de pruebas.
+
+    python benchmarks/bench_replica_lag.py --simulated-lag-ms 20 --simulated-jitter-ms 10
+    python benchmarks/bench_replica_lag.py --writer-host primary.local --reader-host replica.local \\
+        --mysql-user admin --mysql-password secret --mysql-database saes_bench
+"""
+import argparse
+import json
+import random
+import statistics
+import time
+
+import pymysql
+
+SCHEMA = "CREATE TABLE IF NOT EXISTS replication_heartbeat (id TINYINT PRIMARY KEY, ts BIGINT NOT NULL)"
+WRITE = ("INSERT INTO replication_heartbeat (id, ts) VALUES (1, %s) "
+         "ON DUPLICATE KEY UPDATE ts = VALUES(ts)")
+READ = "SELECT ts FROM replication_heartbeat WHERE id = 1"
+
+class SimulatedReplication:
+    """Writer y reader en memoria; cada escritura llega al reader tras el retraso simulado."""
+
+    def __init__(self, lag_ms, jitter_ms):
+        self.lag_ms = lag_ms
+        self.jitter_ms = jitter_ms
+        self.primary = None
+        self.pending = []
+        self.replica = None
+
+    def write(self, value):
+        self.primary = value
+        delay = (self.lag_ms + random.uniform(0, self.jitter_ms)) / 1000
+        self.pending.append((time.perf_counter() + delay, value))
+
+    def read_replica(self):
+        now = time.perf_counter()
+        while self.pending and self.pending[0][0] <= now:
+            self.replica = self.pending.pop(0)[1]
+        return self.replica
+
+class SimulatedConnection:
+
+    def __init__(self, replication, role):
+        self.replication = replication
+        self.role = role
+
+    def cursor(self):
+        return SimulatedCursor(self)
+
+class SimulatedCursor:
+
+    def __init__(self, connection):
+        self.connection = connection
+        self.value = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+    def execute(self, query, params=None):
+        replication = self.connection.replication
+        if query.startswith('INSERT'):
+            replication.write(params[0])
+        elif query.startswith('SELECT'):
+            self.value = replication.primary if self.connection.role == 'writer' else replication.read_replica()
+
+    def fetchone(self):
+        return None if self.value is None else (self.value,)
+
+def read_ts(connection):
+    with connection.cursor() as cursor:
+        cursor.execute(READ)
+        row = cursor.fetchone()
+    return row[0] if row else None
+
+def probe(writer, reader, poll_ms, timeout_s):
+    """Una escritura y sus lecturas; devuelve (retraso en ms, reader viejo, writer viejo)."""
+    ts = time.time_ns()
+    with writer.cursor() as cursor:
+        cursor.execute(WRITE, (ts,))
+    written = time.perf_counter()
+
+    stale_reader = read_ts(reader) != ts
+    stale_writer = read_ts(writer) != ts
+
+    deadline = written + timeout_s
+    while read_ts(reader) != ts:
+        if time.perf_counter() > deadline:
+            return None, stale_reader, stale_writer
+        time.sleep(poll_ms / 1000)
+    return (time.perf_counter() - written) * 1000, stale_reader, stale_writer
+
+def main():
+    parser = argparse.ArgumentParser(description='Read replica lag benchmark')
+    parser.add_argument('--probes', type=int, default=100)
+    parser.add_argument('--poll-ms', type=float, default=1.0)
+    parser.add_argument('--timeout-s', type=float, default=10.0)
+    parser.add_argument('--simulated-lag-ms', type=float, default=20.0)
+    parser.add_argument('--simulated-jitter-ms', type=float, default=10.0)
+    parser.add_argument('--writer-host')
+    parser.add_argument('--reader-host')
+    parser.add_argument('--mysql-port', type=int, default=3306)
+    parser.add_argument('--mysql-user', default='root')
+    parser.add_argument('--mysql-password', default='')
+    parser.add_argument('--mysql-database', default='saes_bench')
+    parser.add_argument('--output', help='Write JSON results to this file')
+    args = parser.parse_args()
+
+    if args.writer_host:
+        def connect(host):
+            return pymysql.connect(host=host, port=args.mysql_port, user=args.mysql_user,
+                                   password=args.mysql_password, database=args.mysql_database,
+                                   autocommit=True)
+        writer, reader = connect(args.writer_host), connect(args.reader_host or args.writer_host)
+        with writer.cursor() as cursor:
+            cursor.execute(SCHEMA)
+        target = f"writer={args.writer_host} reader={args.reader_host or args.writer_host}"
+    else:
+        replication = SimulatedReplication(args.simulated_lag_ms, args.simulated_jitter_ms)
+        writer, reader = SimulatedConnection(replication, 'writer'), SimulatedConnection(replication, 'reader')
+        target = f"simulated lag {args.simulated_lag_ms} ms + up to {args.simulated_jitter_ms} ms jitter"
+
+    lags, stale_reader, stale_writer, timeouts = [], 0, 0, 0
+    for _ in range(args.probes):
+        lag_ms, reader_was_stale, writer_was_stale = probe(writer, reader, args.poll_ms, args.timeout_s)
+        stale_reader += reader_was_stale
+        stale_writer += writer_was_stale
+        if lag_ms is None:
+            timeouts += 1
+        else:
+            lags.append(lag_ms)
+
+    lags.sort()
+    results = {
+        'target': target,
+        'probes': args.probes,
+        'lag_ms': {
+            'p50': round(statistics.median(lags), 3) if lags else None,
+            'p99': round(lags[min(len(lags) - 1, int(len(lags) * 0.99))], 3) if lags else None,
+            'max': round(lags[-1], 3) if lags else None,
+        },
+        'timeouts': timeouts,
+        # Lectura inmediata tras escribir: del reader (por defecto) y del writer (READ_YOUR_WRITES)
+        'stale_read_rate': {
+            'reader': stale_reader / args.probes,
+            'read_your_writes': stale_writer / args.probes,
+        },
+    }
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output)
+    print(output)
+
+if __name__ == '__main__':
+    main()
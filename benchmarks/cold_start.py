@@ -0,0 +1,317 @@
+"""
+Benchmark de cold start por función de ``template.yaml``.
+
+Para cada función se arranca un intérprete nuevo con ``-X importtime`` que
+importa ``app`` desde su ``CodeUri`` (con la layer compartida en el path) y
+ejecuta el primer ``lambda_handler`` contra sustitutos locales: ``Stubber``
+de botocore para Cognito y Secrets Manager y una conexión MySQL falsa
+(ver ``local_stubs``). Los resultados se escriben en JSON para poder
+compararlos entre commits.
+
+    python benchmarks/cold_start.py --repeat 5 --output cold_start.json
+    python benchmarks/cold_start.py --function LoginUserFunction
+"""
+import argparse
+import importlib
+import io
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+import zipfile
+
+import yaml
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, HERE)
+
+import local_stubs
+
+TEMPLATE = os.path.join(local_stubs.ROOT, 'template.yaml')
+
+# Marcas en stderr que delimitan el import del handler dentro de la salida de -X importtime
+IMPORT_START = '--- handler import start ---'
+IMPORT_END = '--- handler import end ---'
+
+USER_COLUMNS = ('user_id', 'username', 'password', 'email', 'role')
+USER_ROW = (1, 'user@example.com', 'x', 'user@example.com', 'usuario')
+
+# Evento y respuestas de Cognito esperadas en la primera invocación de cada función
+SCENARIOS = {
+    'CreateUserFunction': {
+        'event': {'body': json.dumps({'email': 'new@example.com'})},
+        'cognito': [
+            ('admin_create_user', {'User': {'Username': 'new@example.com'}}),
+            ('get_group', {'Group': {'GroupName': 'usuario'}}),
+            ('admin_add_user_to_group', {}),
+        ],
+        'secret': True,
+    },
+    'BulkCreateUsersFunction': {
+        'event': {'headers': {'Content-Type': 'text/csv'}, 'body': 'email\nnew@example.com\n'},
+        'cognito': [
+            ('get_group', {'Group': {'GroupName': 'usuario'}}),
+            ('admin_create_user', {'User': {'Username': 'new@example.com'}}),
+            ('admin_add_user_to_group', {}),
+        ],
+        'secret': True,
+        'rows': [('new@example.com', 1)],
+    },
+    'GetUserFunction': {
+        'event': {'pathParameters': {'id': '1'}},
+        'secret': True,
+        'rows': [dict(zip(USER_COLUMNS, USER_ROW))],
+    },
+    'GetUsersFunction': {
+        'event': {'queryStringParameters': {'ids': '1,2,3'}},
+        'secret': True,
+        'rows': [dict(zip(USER_COLUMNS, USER_ROW))],
+    },
+    'UpdateUserFunction': {
+        'event': {'pathParameters': {'id': '1'},
+                  'body': json.dumps({'username': 'user', 'email': 'user@example.com'})},
+        'secret': True,
+    },
+    'DeleteUserFunction': {
+        'event': {'pathParameters': {'id': '1'}},
+        'secret': True,
+    },
+    'LoginUserFunction': {
+        'event': {'body': json.dumps({'username': 'user@example.com', 'password': 'Secret1!'})},
+        'cognito': [
+            ('initiate_auth', {'AuthenticationResult': {
+                'IdToken': local_stubs.fake_jwt({'cognito:username': 'user@example.com', 'custom:role': 'usuario'}),
+                'AccessToken': 'access', 'RefreshToken': 'refresh'}}),
+        ],
+    },
+    # Detrás de CognitoAuthorizer: perfil y grupos salen de los claims del IdToken, sin llamar a Cognito
+    'ProfileUserFunction': {
+        'event': {'requestContext': {'authorizer': {'claims': {
+            'token_use': 'id', 'cognito:username': 'user@example.com', 'email': 'user@example.com',
+            'custom:role': 'usuario'}}}},
+    },
+    'RouterFunction': {
+        'event': {'httpMethod': 'POST', 'resource': '/login',
+                  'body': json.dumps({'username': 'user@example.com', 'password': 'Secret1!'})},
+        'cognito': [
+            ('initiate_auth', {'AuthenticationResult': {
+                'IdToken': local_stubs.fake_jwt({'cognito:username': 'user@example.com', 'custom:role': 'usuario'}),
+                'AccessToken': 'access', 'RefreshToken': 'refresh'}}),
+        ],
+    },
+    # Authorizer de API Gateway: el token se firma con la clave local al instalar los stubs
+    'AuthorizerFunction': {
+        'event': {'type': 'TOKEN', 'methodArn': 'arn:aws:execute-api:us-east-1:123456789012:api/Prod/POST/profile'},
+        'jwt': {'sub': 'abc', 'token_use': 'id', 'cognito:username': 'user@example.com',
+                'cognito:groups': ['usuario'], 'exp': 4102444800},
+    },
+    'ProfileAdminFunction': {
+        'event': {'requestContext': {'authorizer': {'claims': {
+            'token_use': 'id', 'cognito:username': 'admin@example.com', 'email': 'admin@example.com',
+            'custom:role': 'admin', 'cognito:groups': 'admin'}}}},
+    },
+}
+
+class _TemplateLoader(yaml.SafeLoader):
+    """Loader que acepta las funciones intrínsecas de CloudFormation (!Ref, !GetAtt...)."""
+
+def _intrinsic(loader, tag_suffix, node):
+    if isinstance(node, yaml.ScalarNode):
+        return loader.construct_scalar(node)
+    if isinstance(node, yaml.SequenceNode):
+        return loader.construct_sequence(node)
+    return loader.construct_mapping(node)
+
+_TemplateLoader.add_multi_constructor('!', _intrinsic)
+
+def load_functions(template_path=TEMPLATE):
+    """Devuelve ``{logical_id: (code_dir, handler, environment, build_method)}`` de las funciones del template."""
+    with open(template_path, encoding='utf-8') as f:
+        template = yaml.load(f, Loader=_TemplateLoader)
+
+    global_env = template.get('Globals', {}).get('Function', {}).get('Environment', {}).get('Variables', {})
+    functions = {}
+    for logical_id, resource in template['Resources'].items():
+        if resource['Type'] != 'AWS::Serverless::Function':
+            continue
+        properties = resource['Properties']
+        environment = dict(global_env)
+        environment.update(properties.get('Environment', {}).get('Variables', {}))
+        functions[logical_id] = (
+            os.path.join(local_stubs.ROOT, properties['CodeUri']),
+            properties['Handler'],
+            {key: str(value) for key, value in environment.items()},
+            resource.get('Metadata', {}).get('BuildMethod'),
+        )
+    return functions
+
+def run_one(logical_id):
+    """Se ejecuta en el intérprete nuevo: importa el handler e invoca la primera petición."""
+    code_dir, handler, environment, _ = load_functions()[logical_id]
+    scenario = SCENARIOS.get(logical_id, {'event': {}})
+    os.environ.update(environment)
+    local_stubs.fake_aws_environment()
+    sys.path.insert(0, code_dir)
+    local_stubs.use_layer()
+
+    module_name, function_name = handler.rsplit('.', 1)
+    sys.stderr.write(IMPORT_START + '\n')
+    start = time.perf_counter()
+    module = importlib.import_module(module_name)
+    import_ms = (time.perf_counter() - start) * 1000
+    sys.stderr.write(IMPORT_END + '\n')
+
+    # Si el handler difiere el import de boto3 hasta el primer uso, ese coste se
+    # paga en la primera invocación; lo medimos aquí porque los stubs lo adelantan.
+    deferred_import_ms = 0.0
+    if scenario.get('cognito') or scenario.get('secret'):
+        deferred = [name for name in ('botocore.session', 'botocore.config', 'saes_common.clients')
+                    if name not in sys.modules]
+        start = time.perf_counter()
+        for name in deferred:
+            __import__(name)
+        deferred_import_ms = (time.perf_counter() - start) * 1000
+
+    # Los sustitutos se instalan después de importar para no contarlos en el import
+    local_stubs.install_fake_mysql(rows=scenario.get('rows', ()))
+    if scenario.get('cognito'):
+        local_stubs.stub_client('cognito-idp', scenario['cognito'])
+    if scenario.get('secret'):
+        local_stubs.stub_secret()
+    event = scenario['event']
+    if scenario.get('jwt'):
+        local_stubs.stub_jwks()
+        issuer = f"https://cognito-idp.{os.environ['REGION_NAME']}.amazonaws.com/{os.environ['USER_POOL_ID']}"
+        claims = dict(scenario['jwt'], iss=issuer, aud=os.environ.get('CLIENT_ID'))
+        event = dict(event, authorizationToken=f"Bearer {local_stubs.signed_jwt(claims)}")
+
+    error = None
+    start = time.perf_counter()
+    try:
+        response = getattr(module, function_name)(event, None)
+    except Exception as e:
+        response, error = None, repr(e)
+    first_invoke_ms = (time.perf_counter() - start) * 1000 + deferred_import_ms
+
+    print(json.dumps({
+        'import_ms': import_ms,
+        'first_invoke_ms': first_invoke_ms,
+        'deferred_import_ms': deferred_import_ms,
+        # Un authorizer no devuelve statusCode: su política equivale a un 200
+        'status_code': (response.get('statusCode', 200 if 'policyDocument' in response else None)
+                        if isinstance(response, dict) else None),
+        'error': error,
+    }))
+
+def parse_importtime(stderr, top=10):
+    """Extrae de la salida de ``-X importtime`` el total y los módulos más costosos del handler."""
+    entries = []
+    lines = stderr.splitlines()
+    if IMPORT_START in lines:
+        lines = lines[lines.index(IMPORT_START) + 1:lines.index(IMPORT_END)]
+    for line in lines:
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|', 2)
+        # El nombre viene precedido de un espacio más dos por nivel de anidamiento
+        entries.append((name.rstrip()[1:], int(self_us), int(cumulative_us)))
+
+    top_level = [entry for entry in entries if not entry[0].startswith(' ')]
+    heaviest = sorted(entries, key=lambda entry: entry[1], reverse=True)[:top]
+    return {
+        'modules_imported': len(entries),
+        'total_self_ms': round(sum(entry[1] for entry in entries) / 1000, 3),
+        'top_level_cumulative_ms': {name.strip(): round(cum / 1000, 3) for name, _, cum in top_level},
+        'heaviest_self_ms': {name.strip(): round(own / 1000, 3) for name, own, _ in heaviest},
+    }
+
+def _makefile_dirs(code_dir):
+    # Directorios que copia el Makefile (HANDLERS = ...) en las funciones con BuildMethod: makefile
+    with open(os.path.join(code_dir, 'Makefile'), encoding='utf-8') as f:
+        for line in f:
+            if line.startswith('HANDLERS'):
+                return [os.path.join(code_dir, name) for name in line.split('=', 1)[1].split()]
+    return [code_dir]
+
+def package_size(code_dir, build_method=None):
+    """Tamaño del zip del código de la función y dependencias que empaqueta (sin la layer)."""
+    dirs_to_zip = _makefile_dirs(code_dir) if build_method == 'makefile' else [code_dir]
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as archive:
+        for top in dirs_to_zip:
+            for folder, dirs, files in os.walk(top):
+                dirs[:] = [name for name in dirs if name != '__pycache__']
+                for name in files:
+                    path = os.path.join(folder, name)
+                    archive.write(path, os.path.relpath(path, code_dir))
+
+    requirements_path = os.path.join(code_dir, 'requirements.txt')
+    requirements = []
+    if os.path.exists(requirements_path):
+        with open(requirements_path, encoding='utf-8') as f:
+            requirements = [line.strip() for line in f if line.strip() and not line.startswith('#')]
+    return {'code_zip_kb': round(len(buffer.getvalue()) / 1024, 2), 'requirements': requirements}
+
+def _code_and_build_method(logical_id):
+    code_dir, _, _, build_method = load_functions()[logical_id]
+    return code_dir, build_method
+
+def measure(logical_id, repeat):
+    runs = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        process = subprocess.run(
+            [sys.executable, '-X', 'importtime', __file__, '--run-one', logical_id],
+            capture_output=True, text=True, cwd=local_stubs.ROOT
+        )
+        wall_ms = (time.perf_counter() - start) * 1000
+        if process.returncode != 0:
+            raise RuntimeError(f"{logical_id} failed:\n{process.stderr[-2000:]}")
+        run = json.loads(process.stdout.strip().splitlines()[-1])
+        run['process_wall_ms'] = wall_ms
+        run['importtime'] = parse_importtime(process.stderr)
+        runs.append(run)
+
+    def median(key):
+        return round(statistics.median(run[key] for run in runs), 3)
+
+    return {
+        'import_ms': median('import_ms'),
+        'first_invoke_ms': median('first_invoke_ms'),
+        'deferred_import_ms': median('deferred_import_ms'),
+        'process_wall_ms': median('process_wall_ms'),
+        'status_code': runs[-1]['status_code'],
+        'error': runs[-1]['error'],
+        'importtime': runs[-1]['importtime'],
+        'package': package_size(*_code_and_build_method(logical_id)),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description='Cold start benchmark per function in template.yaml')
+    parser.add_argument('--function', action='append', help='Logical id to measure (default: all)')
+    parser.add_argument('--repeat', type=int, default=3, help='Fresh interpreters per function')
+    parser.add_argument('--output', help='Write JSON results to this file')
+    parser.add_argument('--run-one', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_one:
+        run_one(args.run_one)
+        return
+
+    functions = args.function or sorted(load_functions())
+    results = {
+        'python': sys.version.split()[0],
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+        'functions': {logical_id: measure(logical_id, args.repeat) for logical_id in functions},
+    }
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output)
+    print(output)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,253 @@
+"""
+Sustitutos locales de las dependencias externas para los benchmarks.
+
+- Cognito y Secrets Manager: clientes reales de botocore con un ``Stubber``
+  activo, registrados en la fábrica de ``saes_common.clients``, y tokens de
+  Cognito de prueba (``fake_jwt`` sin firma, ``signed_jwt`` con el JWKS local
+  de ``stub_jwks``).
+- MySQL: ``FakeConnection`` en lugar de ``pymysql.connect``, con una latencia
+  opcional por round trip para simular la red hasta RDS.
+"""
+import json
+import os
+import sys
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+LAYER_PATH = os.path.join(ROOT, 'layers', 'common')
+
+REGION = 'us-east-1'
+DB_SECRET = {'host': 'localhost', 'username': 'admin', 'password': 'admin123'}
+
+def use_layer():
+    """Añade la layer compartida al path, como hace Lambda con /opt/python."""
+    if LAYER_PATH not in sys.path:
+        sys.path.insert(0, LAYER_PATH)
+
+def fake_aws_environment():
+    os.environ.setdefault('AWS_ACCESS_KEY_ID', 'testing')
+    os.environ.setdefault('AWS_SECRET_ACCESS_KEY', 'testing')
+    os.environ.setdefault('AWS_REGION', REGION)
+    os.environ.setdefault('AWS_DEFAULT_REGION', REGION)
+
+# Llamadas a AWS respondidas por los stubs, por (servicio, operación)
+aws_calls = {}
+
+def stub_client(service_name, responses, region_name=REGION, latency_ms=0.0):
+    """
+    Registra en la fábrica de clientes un cliente con ``Stubber`` para ``service_name``.
+
+    Args:
+        responses (list): Tuplas ``(operación, respuesta)``; si la respuesta es
+            un ``str`` se devuelve como error con ese código.
+        latency_ms (float): Latencia simulada por llamada a la API.
+    """
+    use_layer()
+    from botocore.stub import Stubber
+    from saes_common import clients
+
+    client = clients.get_client(service_name, region_name)
+    stubber = Stubber(client)
+    for operation, response in responses:
+        if isinstance(response, str):
+            stubber.add_client_error(operation, service_error_code=response)
+        else:
+            stubber.add_response(operation, response)
+
+    def before_call(model, **kwargs):
+        key = (service_name, model.name)
+        aws_calls[key] = aws_calls.get(key, 0) + 1
+        if latency_ms:
+            time.sleep(latency_ms / 1000)
+
+    client.meta.events.register('before-call.*.*', before_call)
+    stubber.activate()
+    return stubber
+
+def fake_jwt(claims):
+    """JWT sin firma válida con ``claims`` en el payload (como los tokens que devuelve Cognito)."""
+    import base64
+
+    def encode(part):
+        return base64.urlsafe_b64encode(json.dumps(part).encode()).rstrip(b'=').decode()
+
+    return f"{encode({'alg': 'RS256', 'kid': 'local'})}.{encode(claims)}.signature"
+
+# Clave RSA de los tokens firmados en local (se genera en el primer uso)
+_signing_key = None
+
+def _probable_prime(bits):
+    import random
+    while True:
+        n = random.getrandbits(bits) | (1 << (bits - 1)) | 1
+        d, r = n - 1, 0
+        while d % 2 == 0:
+            d, r = d // 2, r + 1
+        for _ in range(20):
+            x = pow(random.randrange(2, n - 1), d, n)
+            if x in (1, n - 1):
+                continue
+            for _ in range(r - 1):
+                x = pow(x, 2, n)
+                if x == n - 1:
+                    break
+            else:
+                break
+        else:
+            return n
+
+def signing_key(bits=1024, e=65537):
+    """Par de claves RSA local ``(kid, n, e, d)``; 1024 bits basta para medir y se genera rápido."""
+    global _signing_key
+    if _signing_key is None:
+        while True:
+            p, q = _probable_prime(bits // 2), _probable_prime(bits // 2)
+            phi = (p - 1) * (q - 1)
+            if p != q and phi % e:
+                break
+        _signing_key = ('local', p * q, e, pow(e, -1, phi))
+    return _signing_key
+
+def signed_jwt(claims):
+    """JWT RS256 firmado con ``signing_key``, verificable con el JWKS de ``stub_jwks``."""
+    import base64
+    import hashlib
+
+    def encode(data):
+        return base64.urlsafe_b64encode(data).rstrip(b'=').decode()
+
+    kid, n, e, d = signing_key()
+    signing_input = f"{encode(json.dumps({'alg': 'RS256', 'kid': kid}).encode())}.{encode(json.dumps(claims).encode())}"
+    size = (n.bit_length() + 7) // 8
+    digest = bytes.fromhex('3031300d060960864801650304020105000420') + hashlib.sha256(signing_input.encode()).digest()
+    padded = b'\x00\x01' + b'\xff' * (size - len(digest) - 3) + b'\x00' + digest
+    return f"{signing_input}.{encode(pow(int.from_bytes(padded, 'big'), d, n).to_bytes(size, 'big'))}"
+
+def stub_jwks(latency_ms=0.0):
+    """Sustituye la descarga del JWKS de Cognito por la clave pública de ``signing_key``."""
+    use_layer()
+    from saes_common import tokens
+
+    kid, n, e, _ = signing_key()
+
+    def fetch_jwks(url, timeout=None):
+        key = ('jwks', url)
+        aws_calls[key] = aws_calls.get(key, 0) + 1
+        if latency_ms:
+            time.sleep(latency_ms / 1000)
+        return {kid: (n, e)}
+
+    tokens.fetch_jwks = fetch_jwks
+
+def stub_secret(secret=None, times=1, latency_ms=0.0):
+    return stub_client('secretsmanager', [
+        ('get_secret_value', {'SecretString': json.dumps(secret or DB_SECRET)})
+    ] * times, latency_ms=latency_ms)
+
+class FakeCursor:
+
+    def __init__(self, connection):
+        self.connection = connection
+        self.lastrowid = None
+        self.rowcount = 0
+        self._last_query = ''
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+    def _round_trip(self):
+        self.connection.round_trips += 1
+        if self.connection.round_trip_ms:
+            time.sleep(self.connection.round_trip_ms / 1000)
+
+    def execute(self, query, params=None):
+        self._round_trip()
+        self._last_query = query
+        self.connection.queries.append((query, params))
+        self.connection.next_id += 1
+        self.lastrowid = self.connection.next_id
+        self.rowcount = 1
+        return 1
+
+    def executemany(self, query, seq):
+        self._round_trip()
+        seq = list(seq)
+        self.connection.queries.append((query, seq))
+        self.lastrowid = self.connection.next_id + 1
+        self.connection.next_id += len(seq)
+        self.rowcount = len(seq)
+        return len(seq)
+
+    def fetchone(self):
+        if 'wait_timeout' in self._last_query:
+            return (28800,)
+        if 'LAST_INSERT_ID' in self._last_query:
+            return (self.connection.next_id - 1,)
+        rows = self.connection.rows
+        return rows[0] if rows else None
+
+    def fetchall(self):
+        return tuple(self.connection.rows)
+
+    def fetchmany(self, size=1):
+        return tuple(self.connection.rows[:size])
+
+    def close(self):
+        pass
+
+class FakeConnection:
+
+    def __init__(self, rows=(), round_trip_ms=0.0):
+        self.rows = list(rows)
+        self.round_trip_ms = round_trip_ms
+        self.round_trips = 0
+        self.queries = []
+        self.next_id = 0
+        self.handshakes = 0
+        self.open = True
+
+    def cursor(self, cursor=None):
+        return FakeCursor(self)
+
+    def _round_trip(self):
+        self.round_trips += 1
+        if self.round_trip_ms:
+            time.sleep(self.round_trip_ms / 1000)
+
+    def ping(self, reconnect=False):
+        self._round_trip()
+
+    def begin(self):
+        self._round_trip()
+
+    def commit(self):
+        self._round_trip()
+
+    def rollback(self):
+        self._round_trip()
+
+    def close(self):
+        self.open = False
+
+def install_fake_mysql(rows=(), round_trip_ms=0.0, handshake_ms=0.0):
+    """
+    Sustituye ``pymysql.connect`` por una conexión falsa y la devuelve.
+
+    ``handshake_ms`` simula el coste de TCP + TLS + autenticación de una conexión nueva.
+    """
+    import pymysql
+
+    connection = FakeConnection(rows, round_trip_ms)
+
+    def connect(**kwargs):
+        if handshake_ms:
+            time.sleep(handshake_ms / 1000)
+        connection.handshakes += 1
+        connection.open = True
+        return connection
+
+    pymysql.connect = connect
+    return connection
@@ -0,0 +1,204 @@
+import csv
+import io
+import os
+import json
+import base64
+import logging
+from botocore.exceptions import ClientError
+from saes_common.clients import cognito_client
+from saes_common.concurrency import TokenBucket, get_executor
+from saes_common.db import get_connection_from_secret
+from saes_common.deadline import compensation, deadline_aware
+from saes_common.responses import build_response, cors_headers
+from saes_common.users import (ensure_group, generate_temporary_password, insert_users_with_profiles,
+                               note_user_created)
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+
+ROLE = "usuario"
+
+# Filas por petición; importaciones más grandes se envían en varias peticiones
+MAX_BULK_ROWS = int(os.environ.get('MAX_BULK_ROWS', '200'))
+# Hilos para las llamadas a Cognito y presupuesto de llamadas por segundo
+BULK_WORKERS = int(os.environ.get('BULK_WORKERS', '8'))
+COGNITO_RPS = float(os.environ.get('COGNITO_RPS', '20'))
+# Usuarios insertados por transacción en MySQL
+DB_BATCH_SIZE = int(os.environ.get('DB_BATCH_SIZE', '100'))
+
+# Presupuesto compartido por todas las invocaciones del contenedor
+cognito_budget = TokenBucket(COGNITO_RPS)
+
+@deadline_aware
+def lambda_handler(event, context):
+    headers = cors_headers('OPTIONS,POST')
+
+    try:
+        rows = parse_rows(read_body(event), content_type(event))
+    except ValueError as e:
+        return build_response(400, {"error_message": str(e)}, headers)
+
+    if not rows:
+        return build_response(400, {"error_message": "No rows to import"}, headers)
+    if len(rows) > MAX_BULK_ROWS:
+        return build_response(400, {"error_message": f"At most {MAX_BULK_ROWS} rows per request"}, headers)
+
+    results = validate_rows(rows)
+    pending = [result for result in results if result['status'] == 'pending']
+
+    try:
+        client = cognito_client(os.environ['REGION_NAME'])
+        user_pool_id = os.environ['USER_POOL_ID']
+        ensure_group(client, user_pool_id, ROLE)
+    except ClientError as e:
+        logging.error(f"ClientError: {e}")
+        return build_response(400, {"error_message": e.response['Error']['Message']}, headers)
+    except Exception as e:
+        logging.error(f"Exception: {e}")
+        return build_response(500, {"error_message": str(e)}, headers)
+
+    # Desde aquí puede haber usuarios ya creados en Cognito: los fallos (también el
+    # plazo agotado o un circuito abierto) se anotan por fila y se responde siempre
+    # con los resultados, para que el cliente sepa qué filas reintentar
+
+    # Cognito: admin_create_user + admin_add_user_to_group en paralelo, bajo presupuesto
+    executor = get_executor('bulk-cognito', BULK_WORKERS)
+    list(executor.map(lambda result: create_cognito_user(client, user_pool_id, result), pending))
+
+    # MySQL: inserciones por lotes, una transacción por lote
+    created = [result for result in pending if result['status'] == 'pending']
+    if created:
+        try:
+            connection = get_connection_from_secret(
+                os.environ['RDS_SECRET_NAME'],
+                database=os.environ['RDS_DB_NAME'],
+                host=os.environ['RDS_ENDPOINT']
+            )
+        except Exception as e:
+            logging.error("Error connecting to the database: %s", e)
+            rollback_cognito_users(client, user_pool_id, created)
+        else:
+            for start in range(0, len(created), DB_BATCH_SIZE):
+                insert_batch(connection, client, user_pool_id, created[start:start + DB_BATCH_SIZE])
+
+    summary = {}
+    for result in results:
+        summary[result['status']] = summary.get(result['status'], 0) + 1
+    return build_response(200, {"summary": summary, "results": results}, headers)
+
+def read_body(event):
+    body = event.get('body') or ''
+    if event.get('isBase64Encoded'):
+        body = base64.b64decode(body).decode('utf-8')
+    return body
+
+def content_type(event):
+    for name, value in (event.get('headers') or {}).items():
+        if name.lower() == 'content-type':
+            return value.split(';')[0].strip().lower()
+    return ''
+
+def parse_rows(body, media_type):
+    """
+    Lee las filas de un CSV con cabecera (columna ``email``) o de un JSONL
+    (un objeto ``{"email": ...}`` por línea). Sin Content-Type se deduce del contenido.
+    """
+    body = body.strip()
+    if not body:
+        return []
+
+    is_jsonl = media_type in ('application/x-ndjson', 'application/jsonl', 'application/x-jsonlines') or (
+        media_type != 'text/csv' and body.startswith('{'))
+
+    rows = []
+    if is_jsonl:
+        for line in body.splitlines():
+            if not line.strip():
+                continue
+            try:
+                rows.append(json.loads(line))
+            except ValueError:
+                raise ValueError(f"Invalid JSON on line {len(rows) + 1}")
+    else:
+        reader = csv.DictReader(io.StringIO(body))
+        if 'email' not in (reader.fieldnames or []):
+            raise ValueError("CSV must have an email column")
+        rows = list(reader)
+    return rows
+
+def validate_rows(rows):
+    """Una entrada de resultado por fila; las válidas quedan en estado ``pending``."""
+    results = []
+    seen = set()
+    for line, row in enumerate(rows, start=1):
+        email = (row.get('email') or '').strip() if isinstance(row, dict) else ''
+        result = {'line': line, 'email': email, 'status': 'pending'}
+        if '@' not in email:
+            result.update(status='invalid', error_message='Missing or invalid email')
+        elif email.lower() in seen:
+            result.update(status='invalid', error_message='Duplicate email in file')
+        else:
+            seen.add(email.lower())
+        results.append(result)
+    return results
+
+def create_cognito_user(client, user_pool_id, result):
+    email = result['email']
+    result['password'] = generate_temporary_password()
+    cognito_user_created = False
+    try:
+        cognito_budget.acquire()
+        client.admin_create_user(
+            UserPoolId=user_pool_id,
+            Username=email,
+            UserAttributes=[
+                {'Name': 'email', 'Value': email},
+                {'Name': 'email_verified', 'Value': 'false'},
+                {'Name': 'custom:role', 'Value': ROLE}
+            ],
+            TemporaryPassword=result['password']
+        )
+        cognito_user_created = True
+        cognito_budget.acquire()
+        client.admin_add_user_to_group(UserPoolId=user_pool_id, Username=email, GroupName=ROLE)
+    except client.exceptions.UsernameExistsException:
+        result.update(status='exists', error_message='User account already exists')
+    except ClientError as e:
+        result.update(status='error', error_message=e.response['Error']['Message'])
+    except Exception as e:
+        result.update(status='error', error_message=str(e))
+
+    if result['status'] != 'pending':
+        del result['password']
+        if cognito_user_created:
+            # Sin grupo el usuario quedaría a medias: se borra para poder reintentar la fila
+            try:
+                with compensation():
+                    client.admin_delete_user(UserPoolId=user_pool_id, Username=email)
+            except Exception as e:
+                logging.error("Could not roll back Cognito user %s: %s", email, e)
+
+def insert_batch(connection, client, user_pool_id, batch):
+    """Inserta un lote en MySQL; si falla, deshace también los usuarios de Cognito del lote."""
+    users = [(result['email'], result.pop('password'), result['email'], ROLE) for result in batch]
+    try:
+        user_ids = insert_users_with_profiles(connection, users)
+    except Exception as e:
+        logging.error("Error inserting batch: %s", e)
+        rollback_cognito_users(client, user_pool_id, batch)
+        return
+
+    for result in batch:
+        result.update(status='created', user_id=user_ids.get(result['email']))
+        note_user_created(result['user_id'])
+
+def rollback_cognito_users(client, user_pool_id, batch):
+    """Borra de Cognito los usuarios que no se pudieron guardar en MySQL."""
+    for result in batch:
+        result.pop('password', None)
+        try:
+            with compensation():
+                client.admin_delete_user(UserPoolId=user_pool_id, Username=result['email'])
+        except Exception as e:
+            logging.error("Could not roll back Cognito user %s: %s", result['email'], e)
+        result.update(status='error', error_message='Database error, user not created')
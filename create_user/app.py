@@ -1,21 +1,25 @@
 import json
 import os
-import random
-import string
-import boto3
 from botocore.exceptions import ClientError
-from connection_bd import connect_to_db, execute_query, close_connection
+from saes_common.clients import cognito_client
+from saes_common.concurrency import get_executor
+from saes_common.db import get_connection_from_secret
+from saes_common.deadline import compensation, deadline_aware
+from saes_common.metrics import emit, timed
+from saes_common.responses import build_response, cors_headers
+from saes_common.users import (delete_user_with_profile, ensure_group, forget_group,
+                               generate_temporary_password, insert_user_with_profile, note_user_created)
 import logging
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 
+# Hilos para el grupo de Cognito y la inserción en MySQL, en paralelo
+CREATE_USER_WORKERS = 2
+
+@deadline_aware
 def lambda_handler(event, context):
-    headers = {
-        'Access-Control-Allow-Origin': '*',  # Permite todas las fuentes
-        'Access-Control-Allow-Headers': 'Content-Type',
-        'Access-Control-Allow-Methods': 'OPTIONS,POST',  # Métodos permitidos
-    }
+    headers = cors_headers('OPTIONS,POST')  # Métodos permitidos
 
     body_parameters = json.loads(event["body"])
     email = body_parameters.get('email')
@@ -24,132 +28,100 @@ def lambda_handler(event, context):
     role = "usuario"
 
     if email is None:
-        return {
-            "statusCode": 400,
-            "headers": headers,
-            "body": json.dumps({"message": "Missing input parameters"})
-        }
+        return build_response(400, {"message": "Missing input parameters"}, headers)
 
     try:
-        # Configura el cliente de Cognito
-        client = boto3.client('cognito-idp', region_name=os.environ['REGION_NAME'])
+        # Cliente de Cognito reutilizado entre invocaciones
+        client = cognito_client(os.environ['REGION_NAME'])
         user_pool_id = os.environ['USER_POOL_ID']
 
-        # Verifica si el usuario ya existe
-        try:
-            client.admin_get_user(
-                UserPoolId=user_pool_id,
-                Username=username
-            )
-            return {
-                'statusCode': 400,
-                'headers': headers,
-                'body': json.dumps({"error_message": "User account already exists"})
-            }
-        except client.exceptions.UserNotFoundException:
-            pass  # El usuario no existe, podemos continuar con la creación
-
-        # Crea el usuario con el atributo custom:role
-        client.admin_create_user(
-            UserPoolId=user_pool_id,
-            Username=username,
-            UserAttributes=[
-                {'Name': 'email', 'Value': email},
-                {'Name': 'email_verified', 'Value': 'false'},
-                {'Name': 'custom:role', 'Value': role}  # Añade el rol como atributo personalizado
-            ],
-            TemporaryPassword=password
-        )
-
-        # Verifica si el grupo 'usuario' existe
+        timings = {}
+
+        # Crea el usuario directamente; si ya existe, Cognito lo rechaza
         try:
-            client.get_group(
-                GroupName=role,
-                UserPoolId=user_pool_id
-            )
-        except client.exceptions.ResourceNotFoundException:
-            # Si el grupo no existe, créalo
-            client.create_group(
-                GroupName=role,
-                UserPoolId=user_pool_id
-            )
-
-        client.admin_add_user_to_group(
-            UserPoolId=user_pool_id,
-            Username=username,
-            GroupName=role
-        )
-
-        # Inserta el usuario en la base de datos y registra el perfil
-        insert_db(username, password, email, role)
-
-        return {
-            'statusCode': 200,
-            'headers': headers,
-            'body': json.dumps({"message": "User created successfully, verification email sent."})
-        }
+            with timed(timings, 'admin_create_user'):
+                client.admin_create_user(
+                    UserPoolId=user_pool_id,
+                    Username=username,
+                    UserAttributes=[
+                        {'Name': 'email', 'Value': email},
+                        {'Name': 'email_verified', 'Value': 'false'},
+                        {'Name': 'custom:role', 'Value': role}  # Añade el rol como atributo personalizado
+                    ],
+                    TemporaryPassword=password
+                )
+        except client.exceptions.UsernameExistsException:
+            return build_response(400, {"error_message": "User account already exists"}, headers)
+
+        # El grupo y la base de datos no dependen el uno del otro: se hacen a la vez
+        executor = get_executor('create-user', CREATE_USER_WORKERS)
+        group_step = executor.submit(run_step, timings, 'add_user_to_group',
+                                     add_user_to_group, client, user_pool_id, username, role)
+        db_step = executor.submit(run_step, timings, 'insert_db',
+                                  insert_db, username, password, email, role)
+        errors = [step.exception() for step in (group_step, db_step) if step.exception() is not None]
+
+        if errors:
+            with timed(timings, 'rollback'):
+                rollback_signup(client, user_pool_id, username, None if db_step.exception() else db_step.result())
+            emit('create_user', timings, outcome='rolled_back')
+            raise errors[0]
+
+        emit('create_user', timings, outcome='created')
+        return build_response(200, {"message": "User created successfully, verification email sent."}, headers)
 
     except ClientError as e:
         logging.error(f"ClientError: {e}")
-        return {
-            'statusCode': 400,
-            'headers': headers,
-            'body': json.dumps({"error_message": e.response['Error']['Message']})
-        }
+        return build_response(400, {"error_message": e.response['Error']['Message']}, headers)
     except Exception as e:
         logging.error(f"Exception: {e}")
-        return {
-            'statusCode': 500,
-            'headers': headers,
-            'body': json.dumps({"error_message": str(e)})
-        }
+        return build_response(500, {"error_message": str(e)}, headers)
 
-def insert_db(username, password, email, role):
-    connection = connect_to_db(
-        host=os.environ['RDS_ENDPOINT'],
-        user=os.environ['RDS_USERNAME'],
-        password=os.environ['RDS_PASSWORD'],
-        database=os.environ['RDS_DB_NAME']
-    )
+def run_step(timings, step, func, *args):
+    with timed(timings, step):
+        return func(*args)
+
+def add_user_to_group(client, user_pool_id, username, role):
+    # El grupo 'usuario' se comprueba (y crea si falta) una vez por contenedor
+    ensure_group(client, user_pool_id, role)
     try:
-        with connection.cursor() as cursor:
-            # Inserta el usuario en la tabla de usuarios
-            user_insert_query = """
-                INSERT INTO users (username, password, email, role) 
-                VALUES (%s, %s, %s, %s)
-            """
-            cursor.execute(user_insert_query, (username, password, email, role))
-            connection.commit()
-
-            # Obtén el user_id del usuario recién insertado
-            cursor.execute("SELECT LAST_INSERT_ID()")
-            user_id = cursor.fetchone()[0]
-
-            # Inserta un registro en la tabla profile con el user_id
-            profile_insert_query = """
-                INSERT INTO user_profiles (user_id) 
-                VALUES (%s)
-            """
-            cursor.execute(profile_insert_query, (user_id,))
-            connection.commit()
-
-    finally:
-        close_connection(connection)
-
-def generate_temporary_password(length=12):
-    """Genera una contraseña temporal segura"""
-    special_characters = '^$*.[]{}()?-"!@#%&/\\,><\':;|_~+= '
-    characters = string.ascii_letters + string.digits + special_characters
-
-    while True:
-        # Genera una contraseña aleatoria
-        password = ''.join(random.choice(characters) for _ in range(length))
-
-        # Verifica los criterios
-        has_digit = any(char.isdigit() for char in password)
-        has_upper = any(char.isupper() for char in password)
-        has_lower = any(char.islower() for char in password)
-        has_special = any(char in special_characters for char in password)
-
-        if has_digit and has_upper and has_lower and has_special and len(password) >= 8:
-            return password
+        client.admin_add_user_to_group(UserPoolId=user_pool_id, Username=username, GroupName=role)
+    except client.exceptions.ResourceNotFoundException:
+        # El grupo se borró desde que lo comprobamos: se vuelve a crear
+        forget_group(user_pool_id, role)
+        ensure_group(client, user_pool_id, role)
+        client.admin_add_user_to_group(UserPoolId=user_pool_id, Username=username, GroupName=role)
+
+def rollback_signup(client, user_pool_id, username, user_id):
+    """
+    Deshace un alta a medias: borra las filas de MySQL (si se insertaron) y el usuario de Cognito.
+
+    Ambos borrados son compensaciones: pueden gastar el margen final del plazo y
+    un fallo en uno no impide intentar el otro.
+    """
+    if user_id is not None:
+        try:
+            with compensation():
+                delete_user_with_profile(db_connection(), user_id)
+        except Exception as e:
+            logging.error("Could not roll back user_id %s: %s", user_id, e)
+    try:
+        with compensation():
+            client.admin_delete_user(UserPoolId=user_pool_id, Username=username)
+    except Exception as e:
+        logging.error("Could not roll back Cognito user %s: %s", username, e)
+
+def db_connection():
+    # Reutiliza la conexión del contenedor entre invocaciones; respeta DB_AUTH (secreto o IAM)
+    return get_connection_from_secret(
+        os.environ['RDS_SECRET_NAME'],
+        database=os.environ['RDS_DB_NAME'],
+        host=os.environ['RDS_ENDPOINT']
+    )
+
+def insert_db(username, password, email, role):
+    # Usuario y perfil en una sola transacción
+    user_id = insert_user_with_profile(db_connection(), username, password, email, role)
+    logging.info("User %s stored with user_id %s", username, user_id)
+    note_user_created(user_id)
+    return user_id
@@ -0,0 +1,3 @@
+-- Versión de fila de users: update_user la incrementa en cada cambio y
+-- get_user la usa como ETag (GET /users/{id} con If-None-Match).
+ALTER TABLE users ADD COLUMN version INT UNSIGNED NOT NULL DEFAULT 1;
@@ -1,39 +1,27 @@
-import json
 import os
-import boto3
-import pymysql
-
-def get_db_credentials():
-    client = boto3.client('secretsmanager')
-    secret_name = os.environ['RDS_SECRET_NAME']
-    secret_value = client.get_secret_value(SecretId=secret_name)
-    return json.loads(secret_value['SecretString'])
+from saes_common.db import get_connection_from_secret, discard_connection, execute
+from saes_common.deadline import deadline_aware
+from saes_common.responses import build_response
+from saes_common.users import invalidate_user
 
+@deadline_aware
 def lambda_handler(event, context):
-    db_credentials = get_db_credentials()
-    connection = pymysql.connect(
-        host=os.environ['RDS_ENDPOINT'],
-        user=db_credentials['username'],
-        password=db_credentials['password'],
-        db=os.environ['RDS_DB_NAME']
+    # Credenciales en caché y conexión reutilizada entre invocaciones
+    connection = get_connection_from_secret(
+        os.environ['RDS_SECRET_NAME'],
+        database=os.environ['RDS_DB_NAME'],
+        host=os.environ['RDS_ENDPOINT']
     )
     try:
         user_id = event['pathParameters']['id']
 
-        with connection.cursor() as cursor:
-            sql = "DELETE FROM users WHERE user_id = %s"
-            cursor.execute(sql, (user_id,))
-            connection.commit()
+        sql = "DELETE FROM users WHERE user_id = %s"
+        execute(connection, sql, (user_id,))
+        # La siguiente lectura de GET /users/{id} irá a MySQL
+        invalidate_user(user_id)
 
-        return {
-            'statusCode': 200,
-            'body': json.dumps('User deleted successfully')
-        }
+        return build_response(200, 'User deleted successfully')
     except Exception as e:
         print(f"Error: {e}")
-        return {
-            'statusCode': 500,
-            'body': json.dumps('Internal server error')
-        }
-    finally:
-        connection.close()
+        discard_connection()
+        return build_response(500, 'Internal server error')
@@ -1,106 +1,116 @@
 import os
-import boto3
-from botocore.exceptions import ClientError
 import json
-from typing import Dict
-from connection_bd import connect_to_db, execute_query, close_connection
+import hashlib
+from botocore.exceptions import ClientError
+from pymysql.cursors import DictCursor
+from saes_common.cache import get_cache
+from saes_common.db import get_reader_connection_from_secret, discard_connection, fetch_all
+from saes_common.deadline import deadline_aware
+from saes_common.metrics import emit
+from saes_common.responses import build_response, request_header
+from saes_common.users import (NEGATIVE_CACHE_TTL, USER_CACHE, USER_ID_FILTER,
+                                refresh_user_id_filter, user_cache_key, user_id_filter)
 import logging
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 
+# Segundos que un cliente, API Gateway o una CDN pueden reutilizar la respuesta sin
+# revalidarla; con 0 siempre revalidan con If-None-Match (y reciben un 304 si no cambió)
+USER_HTTP_MAX_AGE = int(os.environ.get('USER_HTTP_MAX_AGE', '0'))
+
+@deadline_aware
 def lambda_handler(event, __):
     # Obtener el ID del usuario desde el evento
     user_id = event['pathParameters'].get('id')
 
     if user_id is None:
-        return {
-            "statusCode": 400,
-            "body": json.dumps({"message": "User ID is required."})
-        }
-
-    # Obtener credenciales de la base de datos desde AWS Secrets Manager
-    secret_name = os.environ['RDS_SECRET_NAME']
-    region_name = os.environ['AWS_REGION']
+        return build_response(400, {"message": "User ID is required."})
+
+    # Un id no numérico no puede existir: se responde sin ir a MySQL
+    if not user_id.strip().isdigit():
+        return build_response(204, {"message": "No results found."})
+
+    cache = get_cache(USER_CACHE)
     try:
-        secret = get_secret(secret_name, region_name)
+        # Lectura a través de la caché: MySQL solo se consulta en un miss.
+        # Los ids que no existen se recuerdan NEGATIVE_CACHE_TTL segundos.
+        user, hit = cache.get_or_load(user_cache_key(user_id), lambda: load_user(user_id),
+                                      cache_if=lambda user: bool(user['data']), negative_ttl=NEGATIVE_CACHE_TTL)
     except ClientError as e:
-        return {
-            'statusCode': 400,
-            'body': json.dumps(
-                {'error': "An error occurred while processing the request get_secret"})
-        }
-
-    # Parámetros de conexión a la base de datos
-    host = secret['host']
-    user = secret['username']
-    password = secret['password']
-    database = os.environ['RDS_DB_NAME']
+        return build_response(400, {'error': "An error occurred while processing the request get_secret"})
+    except Exception as e:
+        # Registrar y devolver respuesta de error
+        logging.error("Error executing query: %s", e)
+        discard_connection()
+        return build_response(500, {"error": "An error occurred while processing the request."})
+    finally:
+        emit('get_user', cache.take_stats(), unit='Count')
+
+    if not user['data']:
+        # Devolver respuesta vacía si no se encuentran resultados
+        return build_response(204, {"message": "No results found."})
+
+    headers = {
+        'ETag': user['etag'],
+        'Cache-Control': f"max-age={USER_HTTP_MAX_AGE}, must-revalidate",
+    }
+    # El cliente ya tiene esta versión: 304 sin cuerpo ni serialización
+    if etag_matches(request_header(event, 'If-None-Match'), user['etag']):
+        return build_response(304, None, headers)
+
+    # Devolver respuesta exitosa con los datos
+    return build_response(200, {"data": user['data']}, headers)
+
+def load_user(user_id):
+    # Con el filtro activo, los ids que seguro no existen no abren conexión;
+    # mientras no haya filtro se consulta MySQL como siempre
+    current_filter = user_id_filter(filter_connection) if USER_ID_FILTER else None
+    if current_filter is not None and current_filter.definitely_absent(int(user_id)):
+        return {'data': [], 'etag': None}
+
+    # Al reader, salvo que este usuario se acabe de escribir (read-your-writes)
+    connection = db_connection(consistency_key=user_cache_key(user_id))
 
     # Consulta para seleccionar el usuario por ID
-    query = f"SELECT * FROM users WHERE user_id = {user_id}"
-
-    # Establecer conexión con la base de datos
-    connection = connect_to_db(host, user, password, database)
-
-    if connection:
-        try:
-            # Ejecutar la consulta
-            results = execute_query(connection, query)
-            # Cerrar la conexión
-            close_connection(connection)
-
-            if results:
-                # Si se obtienen resultados, registrarlos
-                logging.info("Results:")
-                for row in results:
-                    logging.info(row)
-
-                # Devolver respuesta exitosa con los datos
-                return {
-                    "statusCode": 200,
-                    "body": json.dumps({"data": results})
-                }
-            else:
-                # Devolver respuesta vacía si no se encuentran resultados
-                return {
-                    "statusCode": 204,
-                    "body": json.dumps({"message": "No results found."})
-                }
-        except Exception as e:
-            # Registrar y devolver respuesta de error
-            logging.error("Error executing query: %s", e)
-            return {
-                "statusCode": 500,
-                "body": json.dumps({"error": "An error occurred while processing the request."})
-            }
-    else:
-        # Devolver respuesta de error si la conexión falla
-        logging.error("Connection to the database failed.")
-        return {
-            "statusCode": 500,
-            "body": json.dumps({"error": "Failed to connect to the database."})
-        }
-
-def get_secret(secret_name: str, region_name: str) -> Dict[str, str]:
-    """
-    Retrieves the secret value from AWS Secrets Manager.
+    query = "SELECT * FROM users WHERE user_id = %s"
+    rows = fetch_all(connection, query, (user_id,), cursor_class=DictCursor)
+    # La respuesta sigue siendo una lista de valores por fila, en el orden de las columnas
+    return {
+        'data': [list(row.values()) for row in rows],
+        'etag': user_etag(rows[0]) if rows else None,
+    }
 
-    Args:
-        secret_name (str): The name or ARN of the secret to retrieve.
-        region_name (str): The AWS region where the secret is stored.
+def user_etag(row):
+    """
+    ETag de la fila: ``"<user_id>-<version>"``, con la versión que incrementa update_user.
 
-    Returns:
-        dict: The secret value retrieved from AWS Secrets Manager.
+    Sin la columna ``version`` (db/migrations/0001_users_version.sql) se usa
+    un hash del contenido, que también cambia con cada modificación.
     """
-    # Crear cliente de Secrets Manager
-    session = boto3.session.Session()
-    client = session.client(service_name='secretsmanager', region_name=region_name)
+    if 'version' in row:
+        return f'"{row["user_id"]}-{row["version"]}"'
+    digest = hashlib.sha1(json.dumps(list(row.values()), default=str).encode()).hexdigest()
+    return f'"{digest[:20]}"'
 
-    try:
-        get_secret_value_response = client.get_secret_value(SecretId=secret_name)
-    except ClientError as e:
-        logging.error("Failed to retrieve secret: %s", e)
-        raise e
+def etag_matches(if_none_match, etag):
+    if not if_none_match or not etag:
+        return False
+    candidates = [candidate.strip() for candidate in if_none_match.split(',')]
+    # Comparación débil (RFC 9110): W/"x" coincide con "x"
+    return '*' in candidates or etag in [candidate[2:] if candidate.startswith('W/') else candidate
+                                         for candidate in candidates]
+
+def db_connection(consistency_key=None):
+    # Conexión con credenciales de AWS Secrets Manager (ambas en caché en warm starts)
+    return get_reader_connection_from_secret(os.environ['RDS_SECRET_NAME'], os.environ['RDS_DB_NAME'],
+                                             consistency_key=consistency_key)
+
+def filter_connection():
+    # Conexión propia: el filtro se reconstruye en un hilo mientras la petición usa la suya
+    return get_reader_connection_from_secret(os.environ['RDS_SECRET_NAME'], os.environ['RDS_DB_NAME'],
+                                             label='user-id-filter')
 
-    return json.loads(get_secret_value_response['SecretString'])
+# El filtro se construye durante el init del contenedor, fuera de la ruta de la petición
+if USER_ID_FILTER:
+    refresh_user_id_filter(filter_connection)
@@ -0,0 +1,143 @@
+import os
+import json
+import base64
+import binascii
+import logging
+from botocore.exceptions import ClientError
+from pymysql.cursors import DictCursor
+from saes_common.db import get_reader_connection_from_secret, discard_connection, fetch_all_in, stream_rows
+from saes_common.deadline import deadline_aware
+from saes_common.responses import build_response
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+
+# Máximo de ids por petición en GET /users?ids=...
+MAX_BATCH_IDS = int(os.environ.get('MAX_BATCH_IDS', '500'))
+
+# Tamaño de página por defecto y máximo del listado GET /users
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = int(os.environ.get('MAX_PAGE_SIZE', '200'))
+
+# Columnas que se pueden pedir con ?fields=...; la contraseña nunca se expone
+LISTABLE_COLUMNS = ('user_id', 'username', 'email', 'role')
+
+@deadline_aware
+def lambda_handler(event, __):
+    query_parameters = event.get('queryStringParameters') or {}
+
+    try:
+        if query_parameters.get('ids') is not None:
+            user_ids = parse_ids(query_parameters['ids'])
+        else:
+            page_size = parse_page_size(query_parameters.get('limit'))
+            after_id = decode_cursor(query_parameters.get('cursor'))
+            columns = parse_fields(query_parameters.get('fields'))
+    except ValueError as e:
+        return build_response(400, {"message": str(e)})
+
+    try:
+        # Solo lectura: al reader si está configurado
+        connection = get_reader_connection_from_secret(os.environ['RDS_SECRET_NAME'], os.environ['RDS_DB_NAME'])
+    except ClientError:
+        return build_response(400, {'error': "An error occurred while processing the request get_secret"})
+
+    try:
+        if query_parameters.get('ids') is not None:
+            return build_response(200, fetch_users(connection, user_ids))
+        return build_response(200, list_users(connection, after_id, page_size, columns))
+    except Exception as e:
+        logging.error("Error executing query: %s", e)
+        discard_connection(connection)
+        return build_response(500, {"error": "An error occurred while processing the request."})
+
+def parse_ids(raw_ids):
+    """Convierte ``"3,1,3"`` en ``[3, 1]``: enteros, sin duplicados y en el orden recibido."""
+    user_ids = []
+    for value in raw_ids.split(','):
+        value = value.strip()
+        if not value:
+            continue
+        if not value.isdigit():
+            raise ValueError(f"Invalid user id: {value}")
+        user_ids.append(int(value))
+
+    user_ids = list(dict.fromkeys(user_ids))
+    if not user_ids:
+        raise ValueError("At least one user id is required.")
+    if len(user_ids) > MAX_BATCH_IDS:
+        raise ValueError(f"At most {MAX_BATCH_IDS} user ids per request.")
+    return user_ids
+
+def fetch_users(connection, user_ids):
+    """Lee los usuarios con una consulta IN (por trozos si hace falta) y los indexa por id."""
+    # Solo las columnas listables: nunca la contraseña
+    rows = fetch_all_in(
+        connection,
+        f"SELECT {', '.join(LISTABLE_COLUMNS)} FROM users WHERE user_id IN ({{placeholders}})",
+        user_ids,
+        cursor_class=DictCursor
+    )
+    users = {row['user_id']: row for row in rows}
+    return {
+        "data": {str(user_id): users[user_id] for user_id in user_ids if user_id in users},
+        "missing": [user_id for user_id in user_ids if user_id not in users],
+    }
+
+def parse_page_size(raw_limit):
+    if raw_limit is None:
+        return DEFAULT_PAGE_SIZE
+    if not raw_limit.isdigit() or not 1 <= int(raw_limit) <= MAX_PAGE_SIZE:
+        raise ValueError(f"limit must be between 1 and {MAX_PAGE_SIZE}.")
+    return int(raw_limit)
+
+def parse_fields(raw_fields):
+    """Columnas a seleccionar; ``user_id`` se incluye siempre porque es la clave del cursor."""
+    if not raw_fields:
+        return list(LISTABLE_COLUMNS)
+    fields = [field.strip() for field in raw_fields.split(',') if field.strip()]
+    invalid = [field for field in fields if field not in LISTABLE_COLUMNS]
+    if invalid:
+        raise ValueError(f"Unknown fields: {', '.join(invalid)}")
+    return ['user_id'] + [field for field in dict.fromkeys(fields) if field != 'user_id']
+
+def encode_cursor(last_user_id):
+    payload = json.dumps({"after": last_user_id}).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip('=')
+
+def decode_cursor(token):
+    """Devuelve el último ``user_id`` de la página anterior (0 si es la primera)."""
+    if not token:
+        return 0
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        after_id = json.loads(base64.urlsafe_b64decode(padded))['after']
+    except (binascii.Error, ValueError, KeyError, TypeError):
+        raise ValueError("Invalid cursor.")
+    if not isinstance(after_id, int):
+        raise ValueError("Invalid cursor.")
+    return after_id
+
+def list_users(connection, after_id, page_size, columns):
+    """
+    Página de usuarios con paginación por clave (keyset): ``WHERE user_id > ?``.
+
+    A diferencia de ``OFFSET``, el coste de una página profunda es el mismo que
+    el de la primera. Se pide una fila de más para saber si hay página siguiente.
+    """
+    # Las columnas vienen de LISTABLE_COLUMNS, así que es seguro interpolarlas
+    query = (f"SELECT {', '.join(columns)} FROM users "
+             "WHERE user_id > %s ORDER BY user_id LIMIT %s")
+
+    users = []
+    has_more = False
+    for row in stream_rows(connection, query, (after_id, page_size + 1)):
+        if len(users) == page_size:
+            has_more = True
+            continue
+        users.append(row)
+
+    return {
+        "data": users,
+        "next_cursor": encode_cursor(users[-1]['user_id']) if has_more else None,
+    }
@@ -1,16 +1,6 @@
-import boto3
 import json
 import os
-
-def get_db_credentials():
-    try:
-        client = boto3.client('secretsmanager')
-        secret_name = os.environ['RDS_SECRET_NAME']
-        secret_value = client.get_secret_value(SecretId=secret_name)
-        return json.loads(secret_value['SecretString'])
-    except Exception as e:
-        print(f"Error fetching secret: {e}")
-        raise e
+from saes_common.credentials import get_db_credentials
 
 def lambda_handler(event, context):
     try:
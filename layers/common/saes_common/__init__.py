@@ -0,0 +1,7 @@
+"""
+Código compartido por todas las funciones de ProjectSaes.
+
+Se despliega como una Lambda layer (``CommonLayer`` en ``template.yaml``) para
+que las funciones no copien su propio ``connection_bd.py`` ni empaqueten sus
+propias dependencias de base de datos.
+"""
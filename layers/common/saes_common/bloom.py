@@ -0,0 +1,37 @@
+import math
+import hashlib
+
+class BloomFilter:
+    """
+    Filtro de Bloom sobre un ``bytearray``.
+
+    ``x in filtro`` es ``False`` solo si ``x`` nunca se añadió; si es ``True``
+    puede ser un falso positivo (con probabilidad ~``error_rate`` mientras no
+    se superen ``capacity`` elementos). No admite borrados.
+
+    Args:
+        capacity (int): Elementos previstos.
+        error_rate (float): Tasa de falsos positivos objetivo.
+    """
+
+    def __init__(self, capacity, error_rate=0.01):
+        capacity = max(int(capacity), 1)
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, item):
+        # Doble hashing (Kirsch-Mitzenmacher): k posiciones a partir de dos hashes de 64 bits
+        digest = hashlib.blake2b(str(item).encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], 'little')
+        second = int.from_bytes(digest[8:], 'little') | 1
+        return ((first + i * second) % self.size for i in range(self.hashes))
+
+    def add(self, item):
+        for position in self._positions(item):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, item):
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
@@ -0,0 +1,101 @@
+import os
+import time
+import logging
+import threading
+
+from saes_common.deadline import ServiceUnavailable, mark_unavailable
+from saes_common.metrics import emit
+
+# Fallos seguidos que abren el circuito y segundos que permanece abierto
+# antes de dejar pasar una llamada de prueba (half-open)
+BREAKER_FAILURE_THRESHOLD = int(os.environ.get('BREAKER_FAILURE_THRESHOLD', '5'))
+BREAKER_RESET_TIMEOUT = float(os.environ.get('BREAKER_RESET_TIMEOUT', '30'))
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+class CircuitOpen(ServiceUnavailable):
+    """El circuito de la dependencia está abierto; la llamada no se intenta."""
+
+class CircuitBreaker:
+    """
+    Circuito por contenedor alrededor de una dependencia (MySQL, Cognito).
+
+    Tras ``failure_threshold`` fallos seguidos se abre y rechaza las llamadas
+    con ``CircuitOpen`` durante ``reset_timeout`` segundos. Después pasa a
+    half-open y deja pasar una sola llamada de prueba: si sale bien se cierra
+    y si falla vuelve a abrirse. Cada cambio de estado se publica como métrica.
+
+    Args:
+        name (str): Nombre de la dependencia (dimensión ``<name>_breaker``).
+        failure_threshold (int): Fallos seguidos que abren el circuito.
+        reset_timeout (float): Segundos abierto antes de probar de nuevo.
+        clock (callable): Reloj monotónico, sustituible en las pruebas.
+    """
+
+    def __init__(self, name, failure_threshold=BREAKER_FAILURE_THRESHOLD,
+                 reset_timeout=BREAKER_RESET_TIMEOUT, clock=time.monotonic):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = None
+        self._trial_started_at = None
+        self._lock = threading.Lock()
+
+    def before_call(self):
+        """Deja pasar la llamada o lanza ``CircuitOpen`` (y la invocación responde 503)."""
+        with self._lock:
+            if self.state == OPEN and self.clock() - self.opened_at >= self.reset_timeout:
+                self._transition(HALF_OPEN)
+            if self.state == CLOSED:
+                return
+            # Una sola prueba a la vez; si su resultado nunca llega (p. ej. se
+            # cortó por el plazo de la invocación) se permite otra pasado reset_timeout
+            now = self.clock()
+            if self.state == HALF_OPEN and (self._trial_started_at is None
+                                            or now - self._trial_started_at >= self.reset_timeout):
+                self._trial_started_at = now
+                return
+        mark_unavailable()
+        raise CircuitOpen(f"Circuit for {self.name} is open")
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self._trial_started_at = None
+            if self.state != CLOSED:
+                self._transition(CLOSED)
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self._trial_started_at = None
+            if self.state == HALF_OPEN or (self.state == CLOSED and self.failures >= self.failure_threshold):
+                self.opened_at = self.clock()
+                self._transition(OPEN)
+
+    def _transition(self, state):
+        previous, self.state = self.state, state
+        logging.warning("Circuit for %s: %s -> %s", self.name, previous, state)
+        emit(f"{self.name}_breaker", {'StateChange': 1}, unit='Count',
+             state=state, previous=previous, failures=self.failures)
+
+# Circuitos del contenedor, por dependencia
+_breakers = {}
+_lock = threading.Lock()
+
+def get_breaker(name):
+    breaker = _breakers.get(name)
+    if breaker is None:
+        with _lock:
+            breaker = _breakers.setdefault(name, CircuitBreaker(name))
+    return breaker
+
+def reset_breakers():
+    """Olvida los circuitos creados (para pruebas)."""
+    with _lock:
+        _breakers.clear()
@@ -0,0 +1,196 @@
+import os
+import json
+import time
+import logging
+import threading
+from collections import Counter, OrderedDict
+
+# Backend de las cachés de lectura: 'local' (en el contenedor), 'redis' (compartida) o 'none'
+CACHE_BACKEND = os.environ.get('CACHE_BACKEND', 'local')
+CACHE_TTL = float(os.environ.get('CACHE_TTL', '30'))
+CACHE_MAX_ENTRIES = int(os.environ.get('CACHE_MAX_ENTRIES', '1000'))
+CACHE_REDIS_URL = os.environ.get('CACHE_REDIS_URL', '')
+
+class Cache:
+    """
+    Interfaz común de los backends de caché.
+
+    Las subclases implementan ``_get``, ``set`` y ``delete``; ``_get`` devuelve
+    ``(encontrado, valor)`` para poder guardar valores falsy. Los contadores
+    ``hits``, ``misses`` y ``evictions`` se acumulan en ``stats``.
+    """
+
+    def __init__(self):
+        self.stats = Counter()
+
+    def get(self, key, default=None):
+        found, value = self._get(key)
+        self.stats['hits' if found else 'misses'] += 1
+        return value if found else default
+
+    def get_or_load(self, key, loader, cache_if=bool, negative_ttl=None, ttl=None):
+        """
+        Lectura a través de la caché: si ``key`` no está, llama a ``loader()`` y
+        guarda el resultado cuando ``cache_if(resultado)`` es verdadero.
+
+        Con ``negative_ttl`` los resultados que no cumplen ``cache_if`` (p. ej.
+        un usuario que no existe) también se guardan, pero solo esos segundos.
+        ``ttl`` sustituye al TTL de la caché para los resultados positivos.
+
+        Returns:
+            tuple: ``(valor, hit)``.
+        """
+        found, value = self._get(key)
+        self.stats['hits' if found else 'misses'] += 1
+        if found:
+            return value, True
+        value = loader()
+        if cache_if(value):
+            self.set(key, value, ttl=ttl)
+        elif negative_ttl:
+            self.set(key, value, ttl=negative_ttl)
+        return value, False
+
+    def take_stats(self):
+        """Devuelve los contadores desde la última llamada y los pone a cero."""
+        stats = {name: self.stats[name] for name in ('hits', 'misses', 'evictions')}
+        self.stats.clear()
+        return stats
+
+    def _get(self, key):
+        raise NotImplementedError
+
+    def set(self, key, value, ttl=None):
+        raise NotImplementedError
+
+    def delete(self, key):
+        raise NotImplementedError
+
+class LocalCache(Cache):
+    """
+    Caché LRU con TTL en la memoria del contenedor, segura entre hilos.
+
+    Cada contenedor tiene su copia: una invalidación solo llega a las entradas
+    del contenedor que la hace, así que en el resto el dato puede estar
+    obsoleto como mucho ``ttl`` segundos.
+    """
+
+    def __init__(self, ttl=CACHE_TTL, max_entries=CACHE_MAX_ENTRIES, clock=time.monotonic):
+        super().__init__()
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.clock = clock
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return False, None
+            value, expires_at = entry
+            if self.clock() >= expires_at:
+                del self._entries[key]
+                return False, None
+            self._entries.move_to_end(key)
+            return True, value
+
+    def set(self, key, value, ttl=None):
+        with self._lock:
+            self._entries[key] = (value, self.clock() + (ttl or self.ttl))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats['evictions'] += 1
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+class RedisCache(Cache):
+    """
+    Caché compartida por todos los contenedores en Redis (ElastiCache).
+
+    Los valores se guardan en JSON con ``SETEX``; el LRU lo aplica el servidor
+    (``maxmemory-policy allkeys-lru``), así que ``evictions`` no se cuenta
+    aquí sino en las métricas de ElastiCache. ``client`` es cualquier objeto
+    con ``get``, ``setex`` y ``delete`` (``redis.Redis`` o un sustituto local).
+    """
+
+    def __init__(self, client, ttl=CACHE_TTL, prefix='saes:'):
+        super().__init__()
+        self.client = client
+        self.ttl = ttl
+        self.prefix = prefix
+
+    # Si Redis no responde se sigue sin caché: un fallo cuenta como miss y se registra
+    def _get(self, key):
+        try:
+            raw = self.client.get(self.prefix + key)
+        except Exception as e:
+            logging.warning("Cache get failed for %s: %s", key, e)
+            return False, None
+        if raw is None:
+            return False, None
+        return True, json.loads(raw)
+
+    def set(self, key, value, ttl=None):
+        try:
+            self.client.setex(self.prefix + key, max(1, int(ttl or self.ttl)), json.dumps(value, default=str))
+        except Exception as e:
+            logging.warning("Cache set failed for %s: %s", key, e)
+
+    def delete(self, key):
+        try:
+            self.client.delete(self.prefix + key)
+        except Exception as e:
+            # La entrada seguirá sirviéndose como mucho hasta su TTL
+            logging.error("Cache delete failed for %s: %s", key, e)
+
+class NullCache(Cache):
+    """Caché desactivada: siempre falla y no guarda nada."""
+
+    def _get(self, key):
+        return False, None
+
+    def set(self, key, value, ttl=None):
+        pass
+
+    def delete(self, key):
+        pass
+
+# Cachés reutilizadas entre invocaciones del contenedor, por nombre
+_caches = {}
+_lock = threading.Lock()
+
+def get_cache(name):
+    """
+    Devuelve la caché ``name`` del contenedor con el backend de ``CACHE_BACKEND``.
+
+    Las claves de cada caché llevan ``name`` como prefijo en Redis.
+    """
+    cache = _caches.get(name)
+    if cache is None:
+        with _lock:
+            cache = _caches.get(name)
+            if cache is None:
+                cache = _create_cache(name)
+                _caches[name] = cache
+    return cache
+
+def _create_cache(name):
+    if CACHE_BACKEND == 'none':
+        return NullCache()
+    if CACHE_BACKEND == 'redis':
+        # Importación diferida: redis solo hace falta con la caché compartida
+        import redis
+        return RedisCache(redis.Redis.from_url(CACHE_REDIS_URL, socket_timeout=0.2), prefix=f"saes:{name}:")
+    return LocalCache()
+
+def reset_caches():
+    """Olvida las cachés creadas (para pruebas)."""
+    with _lock:
+        _caches.clear()
@@ -0,0 +1,147 @@
+import os
+import logging
+import functools
+import threading
+
+from saes_common.breaker import get_breaker
+from saes_common.deadline import current_deadline
+
+def client_config():
+    """
+    Configuración común de los clientes de AWS: un pool pequeño con keep-alive
+    (Lambda atiende una petición a la vez), timeouts cortos y reintentos adaptativos
+    para no quemar el timeout de la función cuando Cognito limita las llamadas.
+    """
+    global _config
+    if _config is None:
+        # botocore.config arrastra buena parte de botocore; se importa en el primer uso
+        from botocore.config import Config
+        _config = Config(
+            max_pool_connections=int(os.environ.get('AWS_CLIENT_POOL_SIZE', '10')),
+            tcp_keepalive=True,
+            connect_timeout=float(os.environ.get('AWS_CLIENT_CONNECT_TIMEOUT', '2')),
+            read_timeout=float(os.environ.get('AWS_CLIENT_READ_TIMEOUT', '5')),
+            retries={'max_attempts': int(os.environ.get('AWS_CLIENT_MAX_ATTEMPTS', '3')), 'mode': 'adaptive'}
+        )
+    return _config
+
+# Clientes creados en este contenedor, por (servicio, región)
+_clients = {}
+_session = None
+_config = None
+_lock = threading.Lock()
+# Si la sesión HTTP de botocore admite un read timeout por petición (se comprueba en el primer uso)
+_request_timeouts = None
+
+def get_client(service_name, region_name=None):
+    """
+    Devuelve un cliente de botocore creado una sola vez por contenedor.
+
+    El cliente se construye en el primer uso (no al importar el módulo), así
+    que las funciones que no lo necesitan no pagan ni el import de botocore ni
+    la carga del modelo del servicio; cada función solo carga los modelos de
+    los servicios que usa.
+    """
+    key = (service_name, region_name or default_region())
+    client = _clients.get(key)
+    if client is None:
+        with _lock:
+            client = _clients.get(key)
+            if client is None:
+                client = _get_session().create_client(service_name, region_name=key[1], config=client_config())
+                # Cada intento (también los reintentos) comprueba el plazo de la invocación
+                # y no puede esperar más de lo que le queda
+                client.meta.events.register('before-send', functools.partial(_check_deadline, client))
+                # Tras un intento fallido sin tiempo restante no se duerme el backoff
+                # (se registra primero: el primer valor no nulo decide el reintento)
+                client.meta.events.register_first('needs-retry', _check_deadline_before_retry)
+                # Circuito por servicio: se consulta antes de cada operación y se
+                # alimenta con su resultado final (ya con los reintentos hechos)
+                client.meta.events.register('before-call', functools.partial(_check_breaker, service_name))
+                client.meta.events.register('after-call', functools.partial(_record_response, service_name))
+                client.meta.events.register('after-call-error', functools.partial(_record_error, service_name))
+                _clients[key] = client
+    return client
+
+def _check_deadline(client, request, **kwargs):
+    deadline = current_deadline()
+    if deadline is not None:
+        deadline.check(f"AWS call to {request.url}")
+        _limit_attempt(client, request, deadline.remaining())
+
+def _limit_attempt(client, request, remaining):
+    """
+    Recorta el read timeout de este intento a ``remaining`` segundos con
+    ``request.context['read_timeout']``, sin tocar el pool HTTP que comparten
+    los hilos. El connect timeout sigue siendo el de ``client_config``.
+    """
+    if _request_timeouts_supported():
+        request.context['read_timeout'] = min(client.meta.config.read_timeout, remaining)
+
+def _request_timeouts_supported():
+    global _request_timeouts
+    if _request_timeouts is None:
+        from botocore.httpsession import URLLib3Session
+        _request_timeouts = hasattr(URLLib3Session, '_get_request_timeout')
+        if not _request_timeouts:
+            # botocore antiguo: cada intento usa los timeouts de client_config,
+            # aunque el plazo se sigue comprobando antes de cada intento
+            logging.warning("botocore does not support per-request timeouts; "
+                            "AWS attempts are not capped at the remaining time")
+    return _request_timeouts
+
+def _check_deadline_before_retry(response=None, caught_exception=None, **kwargs):
+    deadline = current_deadline()
+    if deadline is not None and (caught_exception is not None or (response and _is_failure(*response))):
+        deadline.check("AWS retry")
+
+def _check_breaker(service_name, **kwargs):
+    get_breaker(service_name).before_call()
+
+def _record_response(service_name, http_response, parsed, **kwargs):
+    # Se registra el resultado que queda tras agotar los reintentos
+    if _is_failure(http_response, parsed):
+        get_breaker(service_name).record_failure()
+    else:
+        get_breaker(service_name).record_success()
+
+def _is_failure(http_response, parsed):
+    # Errores del servicio (4xx de validación, usuario inexistente...) no son una caída;
+    # sí lo son los 5xx y las limitaciones
+    code = parsed.get('Error', {}).get('Code', '')
+    return http_response.status_code >= 500 or 'Throttl' in code or code == 'TooManyRequestsException'
+
+def _record_error(service_name, exception, **kwargs):
+    # Sin respuesta HTTP: conexión rechazada, timeout... (los errores propios,
+    # como el plazo agotado o el circuito abierto, no cuentan)
+    from botocore.exceptions import ConnectionError, HTTPClientError
+    if isinstance(exception, (ConnectionError, HTTPClientError)):
+        get_breaker(service_name).record_failure()
+
+def cognito_client(region_name=None):
+    return get_client('cognito-idp', region_name)
+
+def secrets_client(region_name=None):
+    return get_client('secretsmanager', region_name)
+
+def get_credentials():
+    """Credenciales del rol de la función (las de la sesión de botocore compartida)."""
+    with _lock:
+        return _get_session().get_credentials()
+
+def reset_clients():
+    """Olvida los clientes creados (útil en pruebas)."""
+    _clients.clear()
+
+def default_region():
+    return os.environ.get('REGION_NAME') or os.environ.get('AWS_REGION')
+
+def _get_session():
+    # Usamos botocore directamente: boto3 solo añade la capa de resources, que
+    # no usamos y cuesta decenas de ms de import. La sesión se usa bajo _lock
+    # porque crear clientes desde una misma sesión no es seguro entre hilos.
+    global _session
+    if _session is None:
+        import botocore.session
+        _session = botocore.session.get_session()
+    return _session
@@ -0,0 +1,68 @@
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from saes_common.deadline import DeadlineExceeded, current_deadline
+
+# Pools de hilos reutilizados entre invocaciones del contenedor, por nombre
+_executors = {}
+_lock = threading.Lock()
+
+def get_executor(name, max_workers):
+    """
+    Devuelve un ``ThreadPoolExecutor`` creado una sola vez por contenedor.
+
+    Crear y destruir un pool en cada invocación cuesta más que las llamadas
+    cortas que se quieren paralelizar; los hilos quedan congelados junto con
+    el contenedor entre invocaciones.
+    """
+    executor = _executors.get(name)
+    if executor is None:
+        with _lock:
+            executor = _executors.get(name)
+            if executor is None:
+                executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=name)
+                _executors[name] = executor
+    return executor
+
+class TokenBucket:
+    """
+    Limitador de ritmo (token bucket) seguro entre hilos.
+
+    Args:
+        rate (float): Llamadas por segundo permitidas de forma sostenida.
+        capacity (float): Ráfaga máxima; por defecto, un segundo de ``rate``.
+        clock (callable): Reloj monotónico, sustituible en las pruebas.
+        sleep (callable): Función de espera, sustituible en las pruebas.
+    """
+
+    def __init__(self, rate, capacity=None, clock=time.monotonic, sleep=time.sleep):
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else max(rate, 1))
+        self.clock = clock
+        self.sleep = sleep
+        self._tokens = self.capacity
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens=1):
+        """
+        Bloquea hasta que haya ``tokens`` disponibles y los consume.
+
+        Raises:
+            DeadlineExceeded: Si la espera terminaría después del plazo de la invocación.
+        """
+        while True:
+            with self._lock:
+                now = self.clock()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                wait = (tokens - self._tokens) / self.rate
+            deadline = current_deadline()
+            if deadline is not None and wait >= deadline.remaining():
+                # Mejor no empezar la llamada que dormir hasta después del plazo
+                raise DeadlineExceeded("No time left to wait for the rate limit")
+            self.sleep(wait)
@@ -0,0 +1,403 @@
+import os
+import time
+from collections import Counter
+from contextlib import contextmanager
+import pymysql
+from pymysql.constants import ER
+import logging
+from saes_common.breaker import get_breaker
+from saes_common.deadline import current_deadline
+
+logging.basicConfig(level=logging.INFO)
+
+# Margen (en segundos) antes del wait_timeout del servidor para reconectar
+# en lugar de arriesgarnos a usar una conexión que MySQL ya cerró.
+WAIT_TIMEOUT_MARGIN = 5
+
+# Máximo de valores por cláusula IN en fetch_all_in; listas más largas se
+# consultan por trozos para no generar sentencias enormes.
+IN_CHUNK_SIZE = 200
+
+# Filas que se piden al servidor en cada lectura de un cursor de servidor (stream_rows)
+STREAM_BATCH_SIZE = 100
+
+# Límites de conexión y de cada lectura/escritura en el socket. Durante una
+# invocación se recortan al tiempo que le queda (ver saes_common.deadline).
+DB_CONNECT_TIMEOUT = float(os.environ.get('DB_CONNECT_TIMEOUT', '2'))
+DB_READ_TIMEOUT = float(os.environ.get('DB_READ_TIMEOUT', '5'))
+
+# Endpoint de lectura (réplica o reader del clúster); sin él todo va al writer
+RDS_READER_ENDPOINT = os.environ.get('RDS_READER_ENDPOINT', '')
+
+# Leer lo propio escrito: tras escribir una clave, sus lecturas van al writer
+# durante READ_YOUR_WRITES_WINDOW segundos para no ver la réplica atrasada
+READ_YOUR_WRITES = os.environ.get('READ_YOUR_WRITES', 'false').lower() == 'true'
+READ_YOUR_WRITES_WINDOW = float(os.environ.get('READ_YOUR_WRITES_WINDOW', '5'))
+
+# Autenticación con MySQL: 'secret' (usuario y contraseña de Secrets Manager) o
+# 'iam' (token de RDS IAM generado localmente, sin leer ningún secreto)
+DB_AUTH = os.environ.get('DB_AUTH', 'secret').lower()
+RDS_IAM_USER = os.environ.get('RDS_IAM_USER', '')
+RDS_PORT = int(os.environ.get('RDS_PORT', '3306'))
+# Bundle de CAs de RDS para verificar el certificado; obligatorio con DB_AUTH=iam
+RDS_CA_BUNDLE = os.environ.get('RDS_CA_BUNDLE', '')
+
+# Conexiones reutilizadas entre invocaciones del mismo contenedor (warm start),
+# una por (host, usuario, base de datos) para que varias rutas servidas por la
+# misma función (RouterFunction) no se pisen la conexión.
+# Cada entrada es [conexión, contraseña, último uso, wait_timeout].
+_connections = {}
+
+# Round trips a MySQL hechos dentro de ``transaction``, por etiqueta, acumulados
+# en el contenedor. Sirve para vigilar cuántas idas y vueltas cuesta cada escritura.
+round_trips = Counter()
+
+def connect_to_db(host, user, password, database, ssl=None, connect_timeout=DB_CONNECT_TIMEOUT):
+    """
+    Abre una conexión nueva a través del circuito ``db``: con MySQL caído
+    durante varios intentos seguidos se deja de intentar conectar y la
+    invocación responde 503 enseguida (ver ``saes_common.breaker``).
+    """
+    breaker = get_breaker('db')
+    breaker.before_call()
+    try:
+        connection = pymysql.connect(
+            host=host,
+            user=user,
+            password=password,
+            database=database,
+            autocommit=True,
+            connect_timeout=connect_timeout,
+            **({'ssl': ssl} if ssl else {})
+        )
+        logging.info("Connection established successfully.")
+        breaker.record_success()
+        return connection
+    except Exception as e:
+        logging.error("Error connecting to the database: %s", e)
+        # Un rechazo de credenciales es una respuesta del servidor, no una caída
+        if is_auth_error(e):
+            breaker.record_success()
+        else:
+            breaker.record_failure()
+        raise e
+
+def get_connection(host, user, password, database, ssl=None, label=None):
+    """
+    Devuelve la conexión del contenedor, creándola o reconectando si hace falta.
+
+    La conexión se reutiliza entre invocaciones mientras siga viva (``ping``) y
+    no haya superado el ``wait_timeout`` del servidor.
+
+    ``password`` puede ser una función (p. ej. un token de IAM): solo se llama
+    al abrir una conexión nueva, y que cambie no obliga a reconectar porque
+    la conexión ya autenticada sigue siendo válida.
+
+    ``label`` separa conexiones al mismo destino, p. ej. la de un hilo en
+    segundo plano, que no puede compartir el socket con la de la petición.
+    """
+    key = (host, user, database, label)
+    now = time.monotonic()
+    entry = _connections.get(key)
+    deadline = current_deadline()
+    if deadline is not None:
+        deadline.check('database connection')
+
+    if entry is not None:
+        connection, entry_password, last_used, wait_timeout = entry
+        if (not callable(password) and entry_password != password) or (wait_timeout and now - last_used >= wait_timeout - WAIT_TIMEOUT_MARGIN):
+            discard_connection(connection)
+            entry = None
+        else:
+            try:
+                apply_timeouts(connection)
+                connection.ping()
+            except Exception as e:
+                logging.info("Stale connection, reconnecting: %s", e)
+                discard_connection(connection)
+                entry = None
+
+    if entry is None:
+        connect_timeout = deadline.timeout(DB_CONNECT_TIMEOUT, 'database connection') if deadline else DB_CONNECT_TIMEOUT
+        connection = connect_to_db(host, user, password() if callable(password) else password, database, ssl,
+                                   connect_timeout=connect_timeout)
+        apply_timeouts(connection)
+        entry = [connection, password, now, _read_wait_timeout(connection)]
+        _connections[key] = entry
+
+    entry[2] = now
+    return entry[0]
+
+def apply_timeouts(connection):
+    """
+    Ajusta los timeouts de lectura y escritura del socket al plazo de la
+    invocación en curso (o a ``DB_READ_TIMEOUT`` fuera de una invocación).
+
+    PyMySQL aplica ``_read_timeout``/``_write_timeout`` en la siguiente
+    operación, así que sirve también para conexiones reutilizadas.
+    """
+    deadline = current_deadline()
+    timeout = deadline.timeout(DB_READ_TIMEOUT, 'database query') if deadline else DB_READ_TIMEOUT
+    connection._read_timeout = timeout
+    connection._write_timeout = timeout
+
+def get_connection_from_secret(secret_name, database, host=None, label=None):
+    """
+    Conecta usando las credenciales del secreto ``secret_name`` (en caché).
+
+    Si MySQL rechaza las credenciales, probablemente porque el secreto se rotó,
+    se descarta el secreto en caché y se vuelve a leer una sola vez.
+
+    Con ``DB_AUTH=iam`` no se lee el secreto: se conecta con un token de IAM
+    (ver ``get_iam_connection``) a ``host`` o, si no se indica, a ``RDS_ENDPOINT``.
+    """
+    if DB_AUTH == 'iam':
+        return get_iam_connection(host or os.environ['RDS_ENDPOINT'], database, label=label)
+
+    # Importación diferida: credentials depende de boto3
+    from saes_common.credentials import get_secret, invalidate_secret
+
+    secret = get_secret(secret_name)
+    try:
+        return get_connection(host or secret['host'], secret['username'], secret['password'], database, label=label)
+    except Exception as e:
+        if not is_auth_error(e):
+            raise
+        logging.info("Database rejected cached credentials, re-reading secret %s", secret_name)
+        invalidate_secret(secret_name)
+
+    secret = get_secret(secret_name)
+    return get_connection(host or secret['host'], secret['username'], secret['password'], database, label=label)
+
+def get_iam_connection(host, database, user=None, port=None, label=None):
+    """
+    Conecta con autenticación IAM de RDS (permiso ``rds-db:connect``).
+
+    El token se firma en local con las credenciales del rol (sin llamadas de
+    red) y se guarda en caché casi todo su tiempo de vida (ver
+    ``credentials.get_db_auth_token``); solo se pide al abrir una conexión
+    nueva. Si MySQL lo rechaza se genera otro y se reintenta una vez.
+
+    Raises:
+        RuntimeError: Si falta ``RDS_CA_BUNDLE``: sin verificar el certificado
+            el token (una credencial) se entregaría a cualquier servidor.
+    """
+    from saes_common.credentials import get_db_auth_token, invalidate_db_auth_token
+
+    user = user or RDS_IAM_USER
+    port = port or RDS_PORT
+    if not RDS_CA_BUNDLE:
+        raise RuntimeError("DB_AUTH=iam requires RDS_CA_BUNDLE to verify the database certificate")
+    ssl = {'ca': RDS_CA_BUNDLE}
+
+    def token():
+        return get_db_auth_token(host, port, user)
+
+    try:
+        return get_connection(host, user, token, database, ssl=ssl, label=label)
+    except Exception as e:
+        if not is_auth_error(e):
+            raise
+        logging.info("Database rejected IAM token for %s, generating a new one", user)
+        invalidate_db_auth_token(host, port, user)
+    return get_connection(host, user, token, database, ssl=ssl, label=label)
+
+def get_reader_connection_from_secret(secret_name, database, consistency_key=None, label=None):
+    """
+    Conexión para handlers de solo lectura: al reader (``RDS_READER_ENDPOINT``)
+    si está configurado, o al writer si no lo está o si ``consistency_key`` se
+    escribió hace menos de ``READ_YOUR_WRITES_WINDOW`` segundos.
+    """
+    if RDS_READER_ENDPOINT and not (consistency_key is not None and wrote_recently(consistency_key)):
+        return get_connection_from_secret(secret_name, database, host=RDS_READER_ENDPOINT, label=label)
+    return get_connection_from_secret(secret_name, database, host=os.environ.get('RDS_ENDPOINT'), label=label)
+
+def note_write(consistency_key):
+    """
+    Recuerda que ``consistency_key`` acaba de escribirse (modo read-your-writes).
+
+    Se guarda en la caché ``recent-writes``: con ``CACHE_BACKEND=redis`` la ven
+    todas las funciones; con la caché local, solo el mismo contenedor
+    (p. ej. ``RouterFunction``).
+    """
+    if READ_YOUR_WRITES:
+        # Importación diferida: la caché solo hace falta en este modo
+        from saes_common.cache import get_cache
+        get_cache('recent-writes').set(consistency_key, True, ttl=READ_YOUR_WRITES_WINDOW)
+
+def wrote_recently(consistency_key):
+    if not READ_YOUR_WRITES:
+        return False
+    from saes_common.cache import get_cache
+    return get_cache('recent-writes').get(consistency_key) is not None
+
+def is_auth_error(exc):
+    """Indica si la excepción es un rechazo de credenciales de MySQL (Access denied)."""
+    return (isinstance(exc, pymysql.err.OperationalError)
+            and bool(exc.args) and exc.args[0] == ER.ACCESS_DENIED_ERROR)
+
+def is_unknown_column_error(exc):
+    """Indica si MySQL rechazó la sentencia por una columna que no existe (migración pendiente)."""
+    return (isinstance(exc, pymysql.err.MySQLError)
+            and bool(exc.args) and exc.args[0] == ER.BAD_FIELD_ERROR)
+
+def discard_connection(connection=None):
+    """
+    Cierra y olvida una conexión del contenedor (p. ej. tras un error de red).
+
+    Sin argumentos descarta todas las conexiones abiertas.
+    """
+    for key, entry in list(_connections.items()):
+        if connection is None or entry[0] is connection:
+            del _connections[key]
+            try:
+                entry[0].close()
+            except Exception:
+                pass
+
+def _read_wait_timeout(connection):
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT @@SESSION.wait_timeout")
+            return int(cursor.fetchone()[0])
+    except Exception as e:
+        logging.warning("Could not read wait_timeout: %s", e)
+        return None
+
+def fetch_all(connection, query, params=None, cursor_class=None):
+    """Ejecuta una consulta de lectura y devuelve todas las filas."""
+    try:
+        with connection.cursor(cursor_class) as cursor:
+            cursor.execute(query, params)
+            return cursor.fetchall()
+    except Exception as e:
+        logging.error("Error executing query: %s", e)
+        raise e
+
+def fetch_all_in(connection, query, values, params=(), chunk_size=IN_CHUNK_SIZE, cursor_class=None):
+    """
+    Ejecuta ``query`` con una cláusula ``IN ({placeholders})`` parametrizada.
+
+    Si hay más de ``chunk_size`` valores se lanzan varias consultas y se
+    concatenan las filas. ``params`` son los parámetros que van antes del IN.
+
+    Example:
+        fetch_all_in(connection, "SELECT * FROM users WHERE user_id IN ({placeholders})", [1, 2, 3])
+    """
+    rows = []
+    values = list(values)
+    for start in range(0, len(values), chunk_size):
+        chunk = values[start:start + chunk_size]
+        chunk_query = query.format(placeholders=', '.join(['%s'] * len(chunk)))
+        rows.extend(fetch_all(connection, chunk_query, tuple(params) + tuple(chunk), cursor_class))
+    return rows
+
+def stream_rows(connection, query, params=None, batch_size=STREAM_BATCH_SIZE):
+    """
+    Recorre el resultado con un cursor de servidor (``SSDictCursor``).
+
+    Las filas se leen del socket de ``batch_size`` en ``batch_size`` en lugar de
+    cargar el resultado completo en memoria antes de procesarlo. Hay que
+    consumir (o cerrar) el generador antes de lanzar otra consulta en la conexión.
+    """
+    try:
+        with connection.cursor(pymysql.cursors.SSDictCursor) as cursor:
+            cursor.execute(query, params)
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield from rows
+    except Exception as e:
+        logging.error("Error executing query: %s", e)
+        raise e
+
+def fetch_one(connection, query, params=None):
+    """Ejecuta una consulta de lectura y devuelve la primera fila (o ``None``)."""
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(query, params)
+            return cursor.fetchone()
+    except Exception as e:
+        logging.error("Error executing query: %s", e)
+        raise e
+
+def execute(connection, query, params=None):
+    """Ejecuta una sentencia de escritura, la confirma y devuelve las filas afectadas."""
+    try:
+        with connection.cursor() as cursor:
+            affected = cursor.execute(query, params)
+            connection.commit()
+            return affected
+    except Exception as e:
+        logging.error("Error executing query: %s", e)
+        raise e
+
+class _CountingCursor:
+    """Envuelve un cursor y cuenta cada ``execute``/``executemany`` como un round trip."""
+
+    def __init__(self, cursor):
+        self._cursor = cursor
+        self.round_trips = 0
+
+    def execute(self, query, params=None):
+        self.round_trips += 1
+        return self._cursor.execute(query, params)
+
+    def executemany(self, query, seq):
+        # PyMySQL envía los INSERT ... VALUES como una sola sentencia de varias filas
+        self.round_trips += 1
+        return self._cursor.executemany(query, seq)
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+@contextmanager
+def transaction(connection, label):
+    """
+    Transacción explícita: ``BEGIN``, las sentencias del bloque y ``COMMIT``
+    (``ROLLBACK`` si algo falla). Un único commit, así que un único fsync.
+
+    Los round trips (BEGIN, sentencias y COMMIT/ROLLBACK) se suman a
+    ``round_trips[label]``.
+
+    Example:
+        with transaction(connection, 'create_user') as cursor:
+            cursor.execute("INSERT INTO users ...", params)
+            user_id = cursor.lastrowid
+    """
+    connection.begin()
+    with connection.cursor() as raw_cursor:
+        cursor = _CountingCursor(raw_cursor)
+        try:
+            yield cursor
+            connection.commit()
+        except Exception:
+            connection.rollback()
+            raise
+        finally:
+            round_trips[label] += cursor.round_trips + 2
+
+def close_connection(connection):
+    try:
+        connection.close()
+        logging.info("Connection closed successfully.")
+    except Exception as e:
+        logging.error("Error closing connection: %s", e)
+        raise e
+
+def prime_db_auth_tokens():
+    """Con ``DB_AUTH=iam``, genera los tokens del writer y del reader configurados."""
+    from saes_common.credentials import get_db_auth_token
+
+    for host in filter(None, (os.environ.get('RDS_ENDPOINT'), RDS_READER_ENDPOINT)):
+        try:
+            get_db_auth_token(host, RDS_PORT, RDS_IAM_USER)
+        except Exception as e:
+            # Se volverá a intentar al conectar
+            logging.warning("Could not generate IAM auth token for %s: %s", host, e)
+
+# En modo IAM los tokens se generan durante el init del contenedor, antes de la
+# primera invocación, y no en la ruta de la petición
+if DB_AUTH == 'iam':
+    prime_db_auth_tokens()
@@ -0,0 +1,127 @@
+import os
+import time
+import logging
+import threading
+import functools
+from contextlib import contextmanager
+
+from saes_common.responses import CORS_HEADERS, build_response
+
+# Milisegundos que se reservan al final de la invocación para responder un 503
+# en lugar de que Lambda corte la ejecución por timeout
+DEADLINE_RESERVE_MS = int(os.environ.get('DEADLINE_RESERVE_MS', '500'))
+
+class ServiceUnavailable(Exception):
+    """La invocación no puede completarse ahora (sin tiempo, dependencia caída); se responde 503."""
+
+class DeadlineExceeded(ServiceUnavailable):
+    """No queda tiempo de la invocación para otra llamada a MySQL o a AWS."""
+
+class Deadline:
+    """
+    Tiempo restante de una invocación, a partir de ``context.get_remaining_time_in_millis()``.
+
+    Args:
+        remaining_ms (int): Milisegundos que quedan según Lambda.
+        reserve_ms (int): Margen final que no se reparte entre las llamadas.
+        clock (callable): Reloj monotónico, sustituible en las pruebas.
+    """
+
+    def __init__(self, remaining_ms, reserve_ms=DEADLINE_RESERVE_MS, clock=time.monotonic):
+        self.clock = clock
+        self.expires_at = clock() + (remaining_ms - reserve_ms) / 1000
+        self.reserve = reserve_ms / 1000
+        self.tripped = False
+
+    @classmethod
+    def from_context(cls, context):
+        """``None`` si no hay contexto de Lambda (pruebas, benchmarks)."""
+        remaining = getattr(context, 'get_remaining_time_in_millis', None)
+        return cls(remaining()) if remaining else None
+
+    def remaining(self):
+        """Segundos que quedan antes del margen final (puede ser negativo)."""
+        if getattr(_compensating, 'active', False):
+            return self.expires_at + self.reserve - self.clock()
+        return self.expires_at - self.clock()
+
+    def check(self, operation='operation'):
+        if self.remaining() <= 0:
+            self.tripped = True
+            mark_unavailable()
+            raise DeadlineExceeded(f"No time left for {operation}")
+
+    def timeout(self, cap, operation='operation'):
+        """El menor entre ``cap`` y el tiempo restante; falla si ya no queda tiempo."""
+        self.check(operation)
+        return min(cap, self.remaining())
+
+# Plazo de la invocación en curso. Lambda atiende una invocación a la vez por
+# contenedor, así que basta una variable de módulo, que además ven los hilos
+# de los pools de saes_common.concurrency.
+_current = None
+_active = False
+# Se marca cuando algo de la invocación falla rápido (plazo agotado, circuito abierto)
+_unavailable = False
+
+# Hilos que están deshaciendo trabajo ya hecho (ver compensation())
+_compensating = threading.local()
+
+def current_deadline():
+    return _current
+
+@contextmanager
+def compensation():
+    """
+    Dentro del bloque, el hilo puede gastar también el margen final del plazo.
+
+    Para compensaciones (p. ej. borrar de Cognito un usuario que no llegó a
+    MySQL): si no se hacen en esta invocación, ya no se harán.
+    """
+    previous = getattr(_compensating, 'active', False)
+    _compensating.active = True
+    try:
+        yield
+    finally:
+        _compensating.active = previous
+
+def mark_unavailable():
+    """Marca la invocación en curso para que un error 5xx se responda como 503."""
+    global _unavailable
+    _unavailable = True
+
+def deadline_aware(handler):
+    """
+    Decora un ``lambda_handler`` para que sus llamadas a MySQL y a AWS respeten
+    el tiempo de la invocación (ver ``saes_common.db`` y ``saes_common.clients``).
+
+    Si el handler termina en error (5xx) porque se agotó el plazo o porque
+    una dependencia falló rápido (``ServiceUnavailable``, p. ej. un circuito
+    abierto), responde 503 con ``Retry-After`` en lugar del 500 genérico. Si
+    ya hay una invocación activa (p. ej. un handler llamado desde
+    ``RouterFunction``) se reutiliza su plazo.
+    """
+    @functools.wraps(handler)
+    def wrapper(event, context):
+        global _current, _active, _unavailable
+        if _active:
+            return handler(event, context)
+
+        deadline = Deadline.from_context(context)
+        _current, _active, _unavailable = deadline, True, False
+        try:
+            try:
+                response = handler(event, context)
+            except ServiceUnavailable:
+                mark_unavailable()
+                response = None
+            failed = response is None or response.get('statusCode', 200) >= 500
+            if failed and (_unavailable or (deadline is not None and deadline.remaining() <= 0)):
+                logging.warning("Dependency unavailable or deadline exceeded, returning 503")
+                return build_response(503, {"error_message": "The service is busy, please retry."},
+                                      dict(CORS_HEADERS, **{'Retry-After': '1'}))
+            return response
+        finally:
+            _current, _active, _unavailable = None, False, False
+
+    return wrapper
@@ -0,0 +1,43 @@
+import json
+import time
+from contextlib import contextmanager
+
+# Espacio de nombres de CloudWatch para las métricas de la aplicación
+NAMESPACE = 'ProjectSaes'
+
+@contextmanager
+def timed(timings, step):
+    """Guarda en ``timings[step]`` los milisegundos que tarda el bloque (aunque falle)."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[step] = round((time.perf_counter() - start) * 1000, 3)
+
+def emit(operation, values, unit='Milliseconds', **properties):
+    """
+    Escribe métricas en formato EMF (Embedded Metric Format) por stdout.
+
+    CloudWatch Logs convierte la línea en métricas sin llamadas a la API
+    ``PutMetricData`` desde la Lambda.
+
+    Args:
+        operation (str): Dimensión ``Operation`` (p. ej. ``create_user``).
+        values (dict): ``{nombre: valor}`` de cada métrica.
+        unit (str): Unidad de CloudWatch de todas las métricas.
+        properties: Campos extra del log, sin convertirse en métricas.
+    """
+    record = {
+        '_aws': {
+            'Timestamp': int(time.time() * 1000),
+            'CloudWatchMetrics': [{
+                'Namespace': NAMESPACE,
+                'Dimensions': [['Operation']],
+                'Metrics': [{'Name': name, 'Unit': unit} for name in values],
+            }],
+        },
+        'Operation': operation,
+    }
+    record.update(properties)
+    record.update(values)
+    print(json.dumps(record, default=str))
@@ -0,0 +1,70 @@
+import os
+import re
+
+from saes_common.cache import get_cache
+
+# Segundos que se reutilizan los atributos leídos de Cognito cuando el token no los trae
+PROFILE_CACHE_TTL = float(os.environ.get('PROFILE_CACHE_TTL', '300'))
+PROFILE_CACHE = 'profiles'
+
+# Claims del IdToken que describen el token y no son atributos del usuario
+TOKEN_CLAIMS = frozenset((
+    'aud', 'iss', 'exp', 'iat', 'auth_time', 'token_use', 'event_id', 'jti', 'origin_jti',
+    'at_hash', 'nonce', 'client_id', 'scope', 'username', 'identities', 'cognito:username',
+    'cognito:groups', 'cognito:roles', 'cognito:preferred_role',
+))
+
+# Campos que API Gateway o el authorizer añaden al contexto y no son claims del token
+AUTHORIZER_FIELDS = frozenset(('principalId', 'integrationLatency', 'role'))
+
+def request_claims(event):
+    """
+    Claims ya verificados por el authorizer de la ruta, o ``None`` si no lo hay.
+
+    ``CognitoAuthorizer`` los deja en ``authorizer.claims``; ``JwtAuthorizer``
+    (``authorizer/app.py``) los pone directamente en el contexto.
+    """
+    authorizer = (event.get('requestContext') or {}).get('authorizer') or {}
+    if authorizer.get('claims'):
+        return authorizer['claims']
+    if 'token_use' in authorizer:
+        return {name: value for name, value in authorizer.items() if name not in AUTHORIZER_FIELDS}
+    return None
+
+def claims_username(claims):
+    # El IdToken trae cognito:username; el AccessToken, username
+    return claims.get('cognito:username') or claims.get('username')
+
+def claims_groups(claims):
+    """
+    Grupos de ``cognito:groups``. API Gateway aplana la lista a texto
+    (``"admin"``, ``"admin,usuario"`` o ``"[admin usuario]"``); sin el claim
+    el usuario no pertenece a ningún grupo.
+    """
+    groups = claims.get('cognito:groups') or []
+    if isinstance(groups, str):
+        groups = re.split(r'[\s,]+', groups.strip('[]'))
+    return [group for group in groups if group]
+
+def claims_attributes(claims):
+    """
+    Atributos del usuario que vienen en un IdToken, o ``None`` si el token es
+    un AccessToken (que no los incluye y obliga a leerlos de Cognito).
+    """
+    if claims.get('token_use') != 'id':
+        return None
+    return {name: str(value) for name, value in claims.items() if name not in TOKEN_CLAIMS}
+
+def get_user_attributes(client, user_pool_id, username):
+    """
+    Atributos de ``admin_get_user`` a través de la caché ``profiles``
+    (``PROFILE_CACHE_TTL`` segundos): AdminGetUser tiene una cuota de RPS baja.
+
+    Returns:
+        tuple: ``(atributos, hit)``.
+    """
+    def load():
+        response = client.admin_get_user(UserPoolId=user_pool_id, Username=username)
+        return {attr['Name']: attr['Value'] for attr in response['UserAttributes']}
+
+    return get_cache(PROFILE_CACHE).get_or_load(f"profile:{username}", load, ttl=PROFILE_CACHE_TTL)
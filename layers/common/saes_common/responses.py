@@ -0,0 +1,30 @@
+import json
+
+# Cabeceras CORS que comparten las funciones expuestas al frontend
+CORS_HEADERS = {
+    'Access-Control-Allow-Origin': '*',  # Permite todas las fuentes
+    'Access-Control-Allow-Headers': 'Content-Type',
+}
+
+def cors_headers(methods):
+    """Cabeceras CORS con la lista de métodos permitidos, p. ej. ``'OPTIONS,POST'``."""
+    return dict(CORS_HEADERS, **{'Access-Control-Allow-Methods': methods})
+
+def build_response(status_code, body, headers=None):
+    """Construye la respuesta en el formato de proxy de API Gateway; ``body=None`` deja el cuerpo vacío (p. ej. 304)."""
+    response = {
+        'statusCode': status_code,
+        # default=str para fechas y decimales que devuelve PyMySQL
+        'body': '' if body is None else json.dumps(body, default=str)
+    }
+    if headers:
+        response['headers'] = headers
+    return response
+
+def request_header(event, name):
+    """Valor de la cabecera ``name`` de la petición, sin distinguir mayúsculas."""
+    name = name.lower()
+    for key, value in (event.get('headers') or {}).items():
+        if key.lower() == name:
+            return value
+    return None
@@ -0,0 +1,161 @@
+import os
+import hmac
+import json
+import time
+import base64
+import hashlib
+import logging
+import binascii
+import threading
+
+# Atributo de Cognito con el rol de la aplicación ('admin', 'usuario', ...)
+ROLE_CLAIM = 'custom:role'
+
+# Segundos mínimos entre dos descargas del JWKS por un kid desconocido (rotación de claves)
+JWKS_REFRESH_INTERVAL = float(os.environ.get('JWKS_REFRESH_INTERVAL', '60'))
+JWKS_TIMEOUT = float(os.environ.get('JWKS_TIMEOUT', '2'))
+
+# Prefijo DigestInfo de SHA-256 en las firmas RSASSA-PKCS1-v1_5 (RFC 8017, 9.2)
+_SHA256_DIGEST_INFO = bytes.fromhex('3031300d060960864801650304020105000420')
+
+class InvalidToken(Exception):
+    """El JWT no es válido: mal formado, firma incorrecta, caducado o de otro emisor."""
+
+def token_claims(token):
+    """
+    Claims del payload de un JWT, decodificado en local y **sin verificar la firma**.
+
+    Solo sirve para tokens que acabamos de recibir de Cognito por TLS (p. ej.
+    la respuesta de ``initiate_auth``); un token que llega del cliente debe
+    verificarse antes. Devuelve ``None`` si el token no tiene forma de JWT.
+    """
+    try:
+        return json.loads(_b64decode(token.split('.')[1]))
+    except (AttributeError, IndexError, binascii.Error, UnicodeDecodeError, ValueError):
+        return None
+
+def role_from_claims(claims):
+    return (claims or {}).get(ROLE_CLAIM)
+
+def issuer_url(region_name, user_pool_id):
+    return f"https://cognito-idp.{region_name}.amazonaws.com/{user_pool_id}"
+
+def fetch_jwks(url, timeout=JWKS_TIMEOUT):
+    """Descarga un JWKS y devuelve sus claves RSA como ``{kid: (n, e)}``."""
+    # Importación diferida: urllib.request arrastra http.client y ssl, y login_user no lo necesita
+    import urllib.request
+    with urllib.request.urlopen(url, timeout=timeout) as response:
+        document = json.loads(response.read())
+    return {key['kid']: (_b64int(key['n']), _b64int(key['e']))
+            for key in document.get('keys', []) if key.get('kty') == 'RSA'}
+
+class Jwks:
+    """
+    Claves públicas de un emisor, descargadas una vez por contenedor.
+
+    Un ``kid`` desconocido (Cognito rotó las claves) provoca una nueva
+    descarga, como mucho cada ``JWKS_REFRESH_INTERVAL`` segundos para que
+    tokens inventados no conviertan cada petición en una descarga.
+
+    Args:
+        url (str): URL del JWKS (``<issuer>/.well-known/jwks.json``).
+        fetch (callable): ``fetch(url) -> {kid: (n, e)}``, sustituible en las pruebas.
+        clock (callable): Reloj monotónico, sustituible en las pruebas.
+    """
+
+    def __init__(self, url, fetch=None, clock=time.monotonic):
+        self.url = url
+        self.fetch = fetch or fetch_jwks
+        self.clock = clock
+        self.keys = None
+        self.fetched_at = None
+        self._lock = threading.Lock()
+
+    def key(self, kid):
+        keys = self.keys
+        if keys is not None and kid in keys:
+            return keys[kid]
+        with self._lock:
+            if self.keys is None or (kid not in self.keys
+                                     and self.clock() - self.fetched_at >= JWKS_REFRESH_INTERVAL):
+                logging.info("Fetching JWKS from %s", self.url)
+                self.keys = self.fetch(self.url)
+                self.fetched_at = self.clock()
+            return self.keys.get(kid)
+
+# JWKS del contenedor, por emisor
+_jwks = {}
+_jwks_lock = threading.Lock()
+
+def get_jwks(issuer):
+    jwks = _jwks.get(issuer)
+    if jwks is None:
+        with _jwks_lock:
+            jwks = _jwks.setdefault(issuer, Jwks(f"{issuer}/.well-known/jwks.json"))
+    return jwks
+
+def reset_jwks():
+    """Olvida los JWKS descargados (para pruebas)."""
+    with _jwks_lock:
+        _jwks.clear()
+
+def verify_token(token, issuer, client_id=None, jwks=None, now=None):
+    """
+    Verifica en local un JWT de Cognito (RS256) y devuelve sus claims.
+
+    Comprueba la firma con la clave del JWKS del emisor, la caducidad, el
+    emisor, ``token_use`` y, si se indica ``client_id``, el cliente de la
+    aplicación (``aud`` en el IdToken, ``client_id`` en el AccessToken).
+
+    Raises:
+        InvalidToken: Si alguna comprobación falla.
+    """
+    try:
+        header_part, payload_part, signature_part = token.split('.')
+        header = json.loads(_b64decode(header_part))
+        claims = json.loads(_b64decode(payload_part))
+        signature = _b64decode(signature_part)
+    except (AttributeError, ValueError, binascii.Error, UnicodeDecodeError):
+        raise InvalidToken("Malformed token")
+    if not isinstance(header, dict) or not isinstance(claims, dict):
+        raise InvalidToken("Malformed token")
+
+    if header.get('alg') != 'RS256':
+        raise InvalidToken("Unsupported algorithm")
+    key = (jwks or get_jwks(issuer)).key(header.get('kid'))
+    if key is None:
+        raise InvalidToken("Unknown signing key")
+    if not _rs256_verify(f"{header_part}.{payload_part}".encode(), signature, *key):
+        raise InvalidToken("Invalid signature")
+
+    if claims.get('exp', 0) <= (time.time() if now is None else now):
+        raise InvalidToken("Token expired")
+    if claims.get('iss') != issuer:
+        raise InvalidToken("Unexpected issuer")
+    token_use = claims.get('token_use')
+    if token_use not in ('id', 'access'):
+        raise InvalidToken("Unexpected token_use")
+    if client_id and claims.get('aud' if token_use == 'id' else 'client_id') != client_id:
+        raise InvalidToken("Token issued for another client")
+    return claims
+
+def _rs256_verify(message, signature, n, e):
+    # RSASSA-PKCS1-v1_5 con SHA-256: basta la aritmética de enteros de Python, sin
+    # dependencias nativas en la layer; con e=65537 la exponenciación es barata
+    size = (n.bit_length() + 7) // 8
+    if len(signature) != size:
+        return False
+    s = int.from_bytes(signature, 'big')
+    # RFC 8017 (RSAVP1): el representante de la firma debe ser menor que n
+    if s >= n:
+        return False
+    encoded = pow(s, e, n).to_bytes(size, 'big')
+    digest = _SHA256_DIGEST_INFO + hashlib.sha256(message).digest()
+    expected = b'\x00\x01' + b'\xff' * (size - len(digest) - 3) + b'\x00' + digest
+    return hmac.compare_digest(encoded, expected)
+
+def _b64decode(part):
+    return base64.urlsafe_b64decode(part + '=' * (-len(part) % 4))
+
+def _b64int(part):
+    return int.from_bytes(_b64decode(part), 'big')
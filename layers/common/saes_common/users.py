@@ -0,0 +1,240 @@
+import os
+import time
+import secrets
+import string
+import logging
+import threading
+from saes_common.bloom import BloomFilter
+from saes_common.db import note_write, stream_rows, transaction
+
+logging.basicConfig(level=logging.INFO)
+
+# Caché de lectura de GET /users/{id} (ver saes_common.cache)
+USER_CACHE = 'users'
+
+# Segundos que se recuerda que un user_id no existe
+NEGATIVE_CACHE_TTL = float(os.environ.get('NEGATIVE_CACHE_TTL', '5'))
+
+# Filtro de Bloom de user_id existentes (opcional), reconstruido cada USER_ID_FILTER_TTL segundos
+USER_ID_FILTER = os.environ.get('USER_ID_FILTER', 'false').lower() == 'true'
+USER_ID_FILTER_TTL = float(os.environ.get('USER_ID_FILTER_TTL', '300'))
+USER_ID_FILTER_ERROR_RATE = float(os.environ.get('USER_ID_FILTER_ERROR_RATE', '0.01'))
+# Segundos sin reintentar tras una construcción fallida
+USER_ID_FILTER_RETRY = float(os.environ.get('USER_ID_FILTER_RETRY', '60'))
+# Ids por debajo del máximo leído que pueden seguir en transacciones sin confirmar
+USER_ID_FILTER_MARGIN = int(os.environ.get('USER_ID_FILTER_MARGIN', '1000'))
+# Segundos tras los que el máximo de una construcción anterior ya es fiable
+USER_ID_FILTER_SETTLE = float(os.environ.get('USER_ID_FILTER_SETTLE', '30'))
+
+_user_id_filter = None
+_user_id_filter_failed_at = None
+_user_id_filter_builder = None
+_user_id_filter_lock = threading.Lock()
+
+# Grupos de Cognito que ya sabemos que existen en este contenedor (warm start)
+_known_groups = set()
+
+def generate_temporary_password(length=12):
+    """Genera una contraseña temporal segura"""
+    special_characters = '^$*.[]{}()?-"!@#%&/\\,><\':;|_~+= '
+    characters = string.ascii_letters + string.digits + special_characters
+
+    while True:
+        # Genera una contraseña aleatoria
+        password = ''.join(secrets.choice(characters) for _ in range(length))
+
+        # Verifica los criterios
+        has_digit = any(char.isdigit() for char in password)
+        has_upper = any(char.isupper() for char in password)
+        has_lower = any(char.islower() for char in password)
+        has_special = any(char in special_characters for char in password)
+
+        if has_digit and has_upper and has_lower and has_special and len(password) >= 8:
+            return password
+
+def user_cache_key(user_id):
+    return f"user:{str(user_id).strip()}"
+
+def invalidate_user(user_id):
+    """
+    Quita el usuario de la caché de lectura tras modificarlo o borrarlo y, en
+    modo read-your-writes, manda sus lecturas al writer durante un momento.
+    """
+    # Importación diferida: solo los handlers que escriben usuarios usan la caché
+    from saes_common.cache import get_cache
+    get_cache(USER_CACHE).delete(user_cache_key(user_id))
+    note_write(user_cache_key(user_id))
+
+class UserIdFilter:
+    """
+    Filtro de los ``user_id`` confirmados al construirlo.
+
+    InnoDB asigna el autoincremental en el ``INSERT``, no en el commit: al
+    construir el filtro puede haber ids menores que ``max_id`` todavía sin
+    confirmar (en otro contenedor), que aparecerán después. Por eso solo se
+    dan por inexistentes los ids hasta ``trusted_max_id`` que no están en el
+    filtro; el resto va siempre a MySQL. Los borrados no se pueden quitar de
+    un filtro de Bloom: esos ids irán a MySQL y los cubre la caché negativa.
+    """
+
+    def __init__(self, bloom, max_id, built_at, trusted_max_id):
+        self.bloom = bloom
+        self.max_id = max_id
+        self.built_at = built_at
+        self.trusted_max_id = trusted_max_id
+
+    def definitely_absent(self, user_id):
+        return user_id <= 0 or (user_id <= self.trusted_max_id and user_id not in self.bloom)
+
+    def add(self, user_id):
+        self.bloom.add(user_id)
+
+def build_user_id_filter(connection, error_rate=USER_ID_FILTER_ERROR_RATE, clock=time.monotonic, previous=None):
+    """
+    Lee todos los ``user_id`` de ``users`` con un cursor de servidor y construye el filtro.
+
+    Se confía en los ids hasta ``max_id - USER_ID_FILTER_MARGIN`` o, si es
+    mayor, hasta el ``max_id`` de ``previous`` cuando este tiene al menos
+    ``USER_ID_FILTER_SETTLE`` segundos: sus transacciones ya han terminado.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT COUNT(*), COALESCE(MAX(user_id), 0) FROM users")
+        count, max_id = cursor.fetchone()
+    bloom = BloomFilter(count, error_rate)
+    for row in stream_rows(connection, "SELECT user_id FROM users WHERE user_id <= %s", (max_id,)):
+        bloom.add(row['user_id'])
+    trusted_max_id = max_id - USER_ID_FILTER_MARGIN
+    if previous is not None and clock() - previous.built_at >= USER_ID_FILTER_SETTLE:
+        trusted_max_id = max(trusted_max_id, min(previous.max_id, max_id))
+    logging.info("User id filter built: %s ids, %s bytes", count, len(bloom.bits))
+    return UserIdFilter(bloom, max_id, clock(), trusted_max_id)
+
+def refresh_user_id_filter(get_connection, clock=time.monotonic):
+    """
+    Construye el filtro y lo publica. Si falla se sigue con el anterior (o sin
+    filtro) y no se reintenta hasta pasados ``USER_ID_FILTER_RETRY`` segundos.
+    """
+    global _user_id_filter, _user_id_filter_failed_at
+    try:
+        _user_id_filter = build_user_id_filter(get_connection(), clock=clock, previous=_user_id_filter)
+        _user_id_filter_failed_at = None
+    except Exception as e:
+        logging.warning("Could not build user id filter: %s", e)
+        _user_id_filter_failed_at = clock()
+    return _user_id_filter
+
+def user_id_filter(get_connection, clock=time.monotonic):
+    """
+    Devuelve el filtro del contenedor, o ``None`` si todavía no hay ninguno.
+
+    Nunca recorre la tabla en la petición: si falta o tiene más de
+    ``USER_ID_FILTER_TTL`` segundos, se reconstruye en un hilo con la conexión
+    de ``get_connection`` (que no debe ser la de la petición) y mientras tanto
+    se usa el anterior. Un filtro viejo sigue siendo correcto: los ids creados
+    después son mayores que su ``trusted_max_id``.
+    """
+    global _user_id_filter_builder
+    current = _user_id_filter
+    if current is not None and clock() - current.built_at < USER_ID_FILTER_TTL:
+        return current
+    with _user_id_filter_lock:
+        building = _user_id_filter_builder is not None and _user_id_filter_builder.is_alive()
+        failed_recently = (_user_id_filter_failed_at is not None
+                           and clock() - _user_id_filter_failed_at < USER_ID_FILTER_RETRY)
+        if not building and not failed_recently:
+            _user_id_filter_builder = threading.Thread(target=refresh_user_id_filter, args=(get_connection, clock),
+                                                       daemon=True)
+            _user_id_filter_builder.start()
+    return current
+
+def note_user_created(user_id):
+    """Añade un usuario nuevo al filtro de este contenedor y olvida que no existía."""
+    if _user_id_filter is not None:
+        _user_id_filter.add(user_id)
+    invalidate_user(user_id)
+
+def ensure_group(client, user_pool_id, group_name):
+    """
+    Crea el grupo de Cognito si no existe, comprobándolo una sola vez por contenedor.
+
+    Si el grupo se borra después, ``admin_add_user_to_group`` fallará con
+    ``ResourceNotFoundException``; en ese caso hay que llamar a ``forget_group``
+    y volver a asegurarlo.
+    """
+    key = (user_pool_id, group_name)
+    if key in _known_groups:
+        return
+    try:
+        client.get_group(GroupName=group_name, UserPoolId=user_pool_id)
+    except client.exceptions.ResourceNotFoundException:
+        try:
+            client.create_group(GroupName=group_name, UserPoolId=user_pool_id)
+        except client.exceptions.GroupExistsException:
+            pass  # Otro contenedor lo creó a la vez
+    _known_groups.add(key)
+
+def forget_group(user_pool_id, group_name):
+    _known_groups.discard((user_pool_id, group_name))
+
+def insert_user_with_profile(connection, username, password, email, role):
+    """
+    Inserta un usuario y su perfil en una sola transacción.
+
+    El ``user_id`` sale de ``cursor.lastrowid`` (viene en el paquete OK del
+    ``INSERT``), sin otra consulta ``SELECT LAST_INSERT_ID()``. Son cuatro
+    round trips (BEGIN, dos INSERT y COMMIT) y un solo commit; si algo falla
+    no queda un usuario sin perfil.
+
+    Returns:
+        int: ``user_id`` del usuario insertado.
+    """
+    with transaction(connection, 'create_user') as cursor:
+        cursor.execute(
+            "INSERT INTO users (username, password, email, role) VALUES (%s, %s, %s, %s)",
+            (username, password, email, role)
+        )
+        user_id = cursor.lastrowid
+        cursor.execute("INSERT INTO user_profiles (user_id) VALUES (%s)", (user_id,))
+    return user_id
+
+def delete_user_with_profile(connection, user_id):
+    """Borra el usuario y su perfil en una sola transacción (deshace ``insert_user_with_profile``)."""
+    with transaction(connection, 'delete_user') as cursor:
+        cursor.execute("DELETE FROM user_profiles WHERE user_id = %s", (user_id,))
+        cursor.execute("DELETE FROM users WHERE user_id = %s", (user_id,))
+
+def insert_users_with_profiles(connection, users):
+    """
+    Inserta varios usuarios y sus perfiles en una sola transacción.
+
+    Usa ``executemany``, que PyMySQL envía como un único ``INSERT`` de varias
+    filas, para ``users`` y para ``user_profiles``. Los ids se leen por email
+    en lugar de suponer que los autoincrementales son consecutivos; si ya
+    había una fila antigua con el mismo email, gana la más reciente (la nuestra).
+
+    Args:
+        users (list): Tuplas ``(username, password, email, role)``.
+
+    Returns:
+        dict: ``{email: user_id}`` de los usuarios insertados.
+    """
+    if not users:
+        return {}
+
+    emails = [user[2] for user in users]
+    with transaction(connection, 'bulk_create_users') as cursor:
+        cursor.executemany(
+            "INSERT INTO users (username, password, email, role) VALUES (%s, %s, %s, %s)",
+            users
+        )
+        cursor.execute(
+            "SELECT email, user_id FROM users WHERE email IN ({}) ORDER BY user_id".format(
+                ', '.join(['%s'] * len(emails))),
+            emails
+        )
+        user_ids = dict(cursor.fetchall())
+        cursor.executemany(
+            "INSERT INTO user_profiles (user_id) VALUES (%s)",
+            [(user_ids[email],) for email in emails]
+        )
+    return user_ids
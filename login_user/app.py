@@ -1,10 +1,13 @@
 import json
-import boto3
 from botocore.exceptions import ClientError
 import os
+from saes_common.clients import cognito_client
+from saes_common.deadline import deadline_aware
+from saes_common.tokens import ROLE_CLAIM, role_from_claims, token_claims
 
+@deadline_aware
 def lambda_handler(event, context):
-    client = boto3.client('cognito-idp', region_name=os.environ['REGION_NAME'])
+    client = cognito_client(os.environ['REGION_NAME'])
     client_id = os.environ['CLIENT_ID']
 
     cors_headers = {
@@ -18,6 +21,16 @@ def lambda_handler(event, context):
         username = body_parameters.get('username')
         password = body_parameters.get('password')
         new_password = body_parameters.get('newPassword')  # Asegúrate de que el campo coincida con lo que se envía desde el cliente
+        refresh_token = body_parameters.get('refresh_token')
+
+        # Renovación de sesión: tokens nuevos a partir del refresh token, sin contraseña
+        if refresh_token:
+            response = client.initiate_auth(
+                ClientId=client_id,
+                AuthFlow='REFRESH_TOKEN_AUTH',
+                AuthParameters={'REFRESH_TOKEN': refresh_token}
+            )
+            return login_response(client, response, username, refresh_token, cors_headers)
 
         if not username or not password:
             return {
@@ -54,28 +67,7 @@ def lambda_handler(event, context):
                 }
             )
 
-        # Obtener el rol del usuario
-        user = client.admin_get_user(UserPoolId=os.environ['USER_POOL_ID'], Username=username)
-        role = None
-        for attr in user['UserAttributes']:
-            if attr['Name'] == 'custom:role':
-                role = attr['Value']
-                break
-
-        id_token = response['AuthenticationResult']['IdToken']
-        access_token = response['AuthenticationResult']['AccessToken']
-        refresh_token = response['AuthenticationResult']['RefreshToken']
-
-        return {
-            'statusCode': 200,
-            'headers': cors_headers,
-            'body': json.dumps({
-                'id_token': id_token,
-                'access_token': access_token,
-                'refresh_token': refresh_token,
-                'role': role  # Incluir el rol en la respuesta
-            })
-        }
+        return login_response(client, response, username, None, cors_headers)
 
     except ClientError as e:
         return {
@@ -89,3 +81,35 @@ def lambda_handler(event, context):
             'headers': cors_headers,
             'body': json.dumps({"error_message": str(e)})
         }
+
+def login_response(client, response, username, refresh_token, cors_headers):
+    """
+    Respuesta de un login o una renovación. El rol sale de los claims del
+    IdToken; solo se pregunta a Cognito si falta el claim. Cognito no
+    devuelve un refresh token nuevo al renovar (salvo con rotación), así
+    que se devuelve el que envió el cliente.
+    """
+    result = response['AuthenticationResult']
+    id_token = result['IdToken']
+    claims = token_claims(id_token)
+    role = role_from_claims(claims)
+    if role is None:
+        role = fetch_role(client, (claims or {}).get('cognito:username') or username)
+
+    return {
+        'statusCode': 200,
+        'headers': cors_headers,
+        'body': json.dumps({
+            'id_token': id_token,
+            'access_token': result['AccessToken'],
+            'refresh_token': result.get('RefreshToken', refresh_token),
+            'role': role  # Incluir el rol en la respuesta
+        })
+    }
+
+def fetch_role(client, username):
+    user = client.admin_get_user(UserPoolId=os.environ['USER_POOL_ID'], Username=username)
+    for attr in user['UserAttributes']:
+        if attr['Name'] == ROLE_CLAIM:
+            return attr['Value']
+    return None
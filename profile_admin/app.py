@@ -1,17 +1,31 @@
 import json
-import boto3
+from concurrent.futures import FIRST_COMPLETED, wait
 from botocore.exceptions import ClientError
 import os
+from saes_common.clients import cognito_client
+from saes_common.concurrency import get_executor
+from saes_common.deadline import deadline_aware
+from saes_common.metrics import emit, timed
+from saes_common.profiles import (claims_attributes, claims_groups, claims_username, get_user_attributes,
+                                   request_claims)
 
-def lambda_handler(event, context):
-    # Inicializa el cliente de Cognito
-    client = boto3.client('cognito-idp', region_name=os.environ['REGION_NAME'])
-    user_pool_id = os.environ['USER_POOL_ID']
+# Hilos para los atributos y los grupos de Cognito, en paralelo
+PROFILE_ADMIN_WORKERS = 2
 
+@deadline_aware
+def lambda_handler(event, context):
     try:
-        # Obtiene los parámetros del cuerpo de la solicitud
-        body_parameters = json.loads(event["body"])
-        username = body_parameters.get('username')
+        claims = request_claims(event)
+        if claims is not None:
+            # Detrás de CognitoAuthorizer el usuario y sus grupos vienen en el token verificado
+            username = claims_username(claims)
+            groups = claims_groups(claims)
+            user_attributes = claims_attributes(claims)
+        else:
+            # Sin authorizer (p. ej. sam local) se toma del cuerpo de la solicitud
+            body_parameters = json.loads(event["body"])
+            username = body_parameters.get('username')
+            groups = user_attributes = None
 
         # Verifica que el parámetro username esté presente
         if not username:
@@ -20,29 +34,18 @@ def lambda_handler(event, context):
                 'body': json.dumps({"error_message": "Username is required"})
             }
 
-        # Obtiene la información del usuario de Cognito
-        response = client.admin_get_user(
-            UserPoolId=user_pool_id,
-            Username=username
-        )
-
-        # Procesa la información del usuario
-        user_attributes = {}
-        for attr in response['UserAttributes']:
-            user_attributes[attr['Name']] = attr['Value']
-
-        # Verifica que el usuario sea un administrador
-        groups_response = client.admin_list_groups_for_user(
-            UserPoolId=user_pool_id,
-            Username=username
-        )
-        groups = [group['GroupName'] for group in groups_response['Groups']]
-
-        if 'admin' not in groups:
-            return {
-                'statusCode': 403,
-                'body': json.dumps({"error_message": "User is not an admin"})
-            }
+        # Verifica que el usuario sea un administrador (con los grupos del token, si los trae)
+        if groups is not None and 'admin' not in groups:
+            return forbidden()
+
+        timings = {}
+        if groups is None or user_attributes is None:
+            user_attributes = lookup_in_cognito(username, groups, user_attributes, timings)
+            if user_attributes is None:
+                # admin_get_user puede seguir en vuelo y escribir en timings: se emite una copia
+                emit('profile_admin', dict(timings), source='cognito', outcome='forbidden')
+                return forbidden()
+        emit('profile_admin', timings, source='cognito' if timings else 'claims', outcome='admin')
 
         # Retorna la información del perfil del usuario administrador
         return {
@@ -60,3 +63,53 @@ def lambda_handler(event, context):
             'statusCode': 500,
             'body': json.dumps({"error_message": str(e)})
         }
+
+def forbidden():
+    return {
+        'statusCode': 403,
+        'body': json.dumps({"error_message": "User is not an admin"})
+    }
+
+def lookup_in_cognito(username, groups, user_attributes, timings):
+    """
+    Completa en Cognito lo que no trae el token: grupos y atributos se piden
+    a la vez en el pool del contenedor. Si los grupos llegan antes y el
+    usuario no es administrador no se espera a los atributos.
+
+    Returns:
+        dict: Atributos del usuario, o ``None`` si no es administrador.
+    """
+    client = cognito_client(os.environ['REGION_NAME'])
+    user_pool_id = os.environ['USER_POOL_ID']
+    executor = get_executor('profile-admin', PROFILE_ADMIN_WORKERS)
+
+    attributes_step = groups_step = None
+    if user_attributes is None:
+        attributes_step = executor.submit(run_step, timings, 'admin_get_user',
+                                          fetch_attributes, client, user_pool_id, username)
+    if groups is None:
+        groups_step = executor.submit(run_step, timings, 'admin_list_groups_for_user',
+                                      list_groups, client, user_pool_id, username)
+
+    pending = {step for step in (attributes_step, groups_step) if step is not None}
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        if groups_step in done:
+            groups = groups_step.result()
+        if groups is not None and 'admin' not in groups:
+            # Los atributos, si siguen en vuelo, acaban en la caché de perfiles
+            if attributes_step is not None:
+                attributes_step.cancel()
+            return None
+    return user_attributes if attributes_step is None else attributes_step.result()
+
+def run_step(timings, step, func, *args):
+    with timed(timings, step):
+        return func(*args)
+
+def fetch_attributes(client, user_pool_id, username):
+    return get_user_attributes(client, user_pool_id, username)[0]
+
+def list_groups(client, user_pool_id, username):
+    response = client.admin_list_groups_for_user(UserPoolId=user_pool_id, Username=username)
+    return [group['GroupName'] for group in response['Groups']]
@@ -1,17 +1,23 @@
 import json
-import boto3
 from botocore.exceptions import ClientError
 import os
+from saes_common.clients import cognito_client
+from saes_common.deadline import deadline_aware
+from saes_common.profiles import claims_attributes, claims_username, get_user_attributes, request_claims
 
+@deadline_aware
 def lambda_handler(event, context):
-    # Inicializa el cliente de Cognito
-    client = boto3.client('cognito-idp', region_name=os.environ['REGION_NAME'])
-    user_pool_id = os.environ['USER_POOL_ID']
-
     try:
-        # Obtiene los parámetros del cuerpo de la solicitud
-        body_parameters = json.loads(event["body"])
-        username = body_parameters.get('username')
+        claims = request_claims(event)
+        if claims is not None:
+            # Detrás de CognitoAuthorizer el usuario es el del token verificado
+            username = claims_username(claims)
+            user_attributes = claims_attributes(claims)
+        else:
+            # Sin authorizer (p. ej. sam local) se toma del cuerpo de la solicitud
+            body_parameters = json.loads(event["body"])
+            username = body_parameters.get('username')
+            user_attributes = None
 
         # Verifica que el parámetro username esté presente
         if not username:
@@ -20,16 +26,10 @@ def lambda_handler(event, context):
                 'body': json.dumps({"error_message": "Username is required"})
             }
 
-        # Obtiene la información del usuario de Cognito
-        response = client.admin_get_user(
-            UserPoolId=user_pool_id,
-            Username=username
-        )
-
-        # Procesa la información del usuario
-        user_attributes = {}
-        for attr in response['UserAttributes']:
-            user_attributes[attr['Name']] = attr['Value']
+        # Solo se pregunta a Cognito (a través de la caché) si el token no trae los atributos
+        if user_attributes is None:
+            client = cognito_client(os.environ['REGION_NAME'])
+            user_attributes, _ = get_user_attributes(client, os.environ['USER_POOL_ID'], username)
 
         # Retorna la información del perfil del usuario
         return {
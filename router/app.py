@@ -0,0 +1,48 @@
+import importlib
+import logging
+from saes_common.deadline import deadline_aware
+from saes_common.responses import build_response
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+
+# Tabla de rutas del despliegue en una sola función (parámetro Lambdalith=true
+# en template.yaml): (método, recurso de API Gateway) -> módulo con lambda_handler.
+ROUTES = {
+    ('POST', '/users'): 'create_user.app',
+    ('POST', '/users/bulk'): 'bulk_create_users.app',
+    ('GET', '/users'): 'get_users.app',
+    ('GET', '/users/{id}'): 'get_user.app',
+    ('PUT', '/users/{id}'): 'update_user.app',
+    ('DELETE', '/users/{id}'): 'delete_user.app',
+    ('POST', '/login'): 'login_user.app',
+    ('POST', '/profile'): 'profile_user.app',
+    ('POST', '/admin'): 'profile_admin.app',
+}
+
+# Handlers ya importados en este contenedor
+_handlers = {}
+
+def resolve(method, resource):
+    """
+    Devuelve el ``lambda_handler`` de la ruta, o ``None`` si no existe.
+
+    Los módulos se importan en la primera petición que los usa, así que el
+    cold start solo paga el import de la ruta que lo provocó.
+    """
+    key = ((method or '').upper(), resource)
+    if key not in ROUTES:
+        return None
+    handler = _handlers.get(key)
+    if handler is None:
+        handler = importlib.import_module(ROUTES[key]).lambda_handler
+        _handlers[key] = handler
+    return handler
+
+@deadline_aware
+def lambda_handler(event, context):
+    handler = resolve(event.get('httpMethod'), event.get('resource'))
+    if handler is None:
+        logging.warning("No route for %s %s", event.get('httpMethod'), event.get('resource'))
+        return build_response(404, {"error_message": "Route not found"})
+    return handler(event, context)
@@ -0,0 +1,124 @@
+import os
+import sys
+
+# La layer compartida se monta en /opt/python dentro de Lambda; en local la
+# añadimos al path para poder importar saes_common desde los handlers.
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'layers', 'common'))
+
+import pytest
+
+
+class FakeClock:
+    """ Reloj monotónico que solo avanza cuando la prueba cambia ``now`` """
+
+    def __init__(self, now=0.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class FakeCursor:
+    """ Cursor de PyMySQL en memoria: anota cada sentencia y pide sus filas a la conexión """
+
+    def __init__(self, connection):
+        self.connection = connection
+        self.lastrowid = None
+        self.rows = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+    def execute(self, query, params=None):
+        return self._run(query, params)
+
+    def executemany(self, query, seq):
+        return self._run(query, list(seq))
+
+    def _run(self, query, params):
+        self.connection.queries.append((query, params))
+        self.connection.log.append(query)
+        self.rows = list(self.connection.respond(query, params) or [])
+        self.lastrowid = self.connection.lastrowid
+        return 1
+
+    def fetchall(self):
+        return self.rows
+
+    def fetchone(self):
+        return self.rows[0] if self.rows else None
+
+
+class FakeConnection:
+    """
+    Conexión de PyMySQL en memoria. ``respond(query, params)`` devuelve las
+    filas de cada sentencia (o lanza para simular un fallo); ``queries`` anota
+    las sentencias con sus parámetros y ``log`` también las transacciones.
+    """
+
+    def __init__(self, respond=None, lastrowid=None, wait_timeout=28800):
+        self.respond = respond or self.server_variables
+        self.lastrowid = lastrowid
+        self.wait_timeout = wait_timeout
+        self.queries = []
+        self.log = []
+        self.alive = True
+        self.closed = False
+
+    def server_variables(self, query, params):
+        return [(self.wait_timeout,)] if 'wait_timeout' in query else []
+
+    def cursor(self, cursor_class=None):
+        return FakeCursor(self)
+
+    def begin(self):
+        self.log.append('BEGIN')
+
+    def commit(self):
+        self.log.append('COMMIT')
+
+    def rollback(self):
+        self.log.append('ROLLBACK')
+
+    def ping(self):
+        if not self.alive:
+            raise ConnectionError("gone away")
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture()
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture()
+def cognito(monkeypatch):
+    """ Cliente de Cognito real con Stubber y cachés vacías """
+    from botocore.stub import Stubber
+    from saes_common import cache, clients
+
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    monkeypatch.setenv("REGION_NAME", "us-east-1")
+    monkeypatch.setenv("USER_POOL_ID", "us-east-1_test")
+    monkeypatch.setenv("CLIENT_ID", "client")
+    cache.reset_caches()
+    clients.reset_clients()
+    with Stubber(clients.cognito_client("us-east-1")) as stubber:
+        yield stubber
+    clients.reset_clients()
+    cache.reset_caches()
+
+
+@pytest.fixture(autouse=True)
+def reset_breakers():
+    """ Cada prueba empieza con los circuitos cerrados """
+    from saes_common import breaker
+    breaker.reset_breakers()
+    yield
+    breaker.reset_breakers()
@@ -0,0 +1,231 @@
+import base64
+import hashlib
+import json
+import random
+
+import pytest
+
+from authorizer import app
+from profile_admin import app as profile_admin
+from saes_common import tokens
+from saes_common.tokens import InvalidToken, Jwks, verify_token
+
+ISSUER = "https://cognito-idp.us-east-1.amazonaws.com/us-east-1_test"
+METHOD_ARN = "arn:aws:execute-api:us-east-1:123456789012:abc123/Prod/POST/profile"
+DIGEST_INFO = bytes.fromhex("3031300d060960864801650304020105000420")
+
+# Vector fijo firmado con OpenSSL 3.0 (openssl genpkey -algorithm RSA -pkeyopt rsa_keygen_bits:2048;
+# openssl dgst -sha256 -sign): comprueba la verificación contra una implementación independiente
+OPENSSL_KID = "openssl-1"
+OPENSSL_N = int(
+    "DB7EA8D9ADA2BAF08D4442B3C9AD653FEBECCF59B10BE2B9A84E28DC3B075806"
+    "DE5BE410F292A344982B3FEF3A60F64B47C5F8B6305101F0F8C907B9B2C07E24"
+    "C8BEE29F97DED544F477EE10482AD3BC979C247F832A671E24118863014CF463"
+    "C8918788961B53629ECEEF3AA196EBE555D1FF95980A58ADA8177B1F4C1EDA56"
+    "86BE71763AF64F1D3C88174C695CB789299B8BBA849B096D6FA4EE662A131E24"
+    "6D87DDFEE59804B8A0775964B48276819FF6AE86402E52B9FEC0AAA2518044C0"
+    "65749C56E9DA0164EC036DC0A55E75690867A755EC5430E3E4E6FC0BC6A0105D"
+    "5B9BBAE65FD179A343433F6061AA023B73B0345FDA9012577BE0BBD29F383485", 16)
+OPENSSL_TOKEN = (
+    "eyJraWQiOiJvcGVuc3NsLTEiLCJhbGciOiJSUzI1NiJ9."
+    "eyJzdWIiOiJhYmMiLCJpc3MiOiJodHRwczovL2NvZ25pdG8taWRwLnVzLWVhc3QtMS5hbWF6b25hd3MuY29tL3Vz"
+    "LWVhc3QtMV90ZXN0IiwiYXVkIjoiY2xpZW50IiwidG9rZW5fdXNlIjoiaWQiLCJleHAiOjQxMDI0NDQ4MDAsImNv"
+    "Z25pdG86dXNlcm5hbWUiOiJ1c2VyQGV4YW1wbGUuY29tIiwiZW1haWwiOiJ1c2VyQGV4YW1wbGUuY29tIn0."
+    "AHvbODu-7quBl50qiiZApu0Utr-GEDMLQfxRj1d34fh-_thrfOGe8M5_G-RnywXoSYdPvtjrPcxnEv5i3njyx7K-"
+    "OQNhaQzx6c2mz_9PQ6n96mCbIrHCg2GvLa70FRfWxSF2rEbGA7aMnvYddFcLuDwTs8RDAdgHW8pnsGQKYwbjEIDX"
+    "pP6YgBtZB297iW-I8BrILlHm5j3RKwPY70GX9wBeDr6cI4L2G1lEsIVY2TgeISQfY9gAuJVF9EKpIqzXg0wQZfrN"
+    "xt89D7xvV3UcOAOHL_SropvPCnkfR2BbY1v9BerDCihJo9xK2NGjHutwoQktJkvkTI3oBeAcu7cCxg")
+
+
+def is_probable_prime(n, rounds=20):
+    if n % 2 == 0:
+        return n == 2
+    d, r = n - 1, 0
+    while d % 2 == 0:
+        d, r = d // 2, r + 1
+    for _ in range(rounds):
+        x = pow(random.randrange(2, n - 1), d, n)
+        if x in (1, n - 1):
+            continue
+        for _ in range(r - 1):
+            x = pow(x, 2, n)
+            if x == n - 1:
+                break
+        else:
+            return False
+    return True
+
+
+def generate_prime(bits):
+    while True:
+        candidate = random.getrandbits(bits) | (1 << (bits - 1)) | 1
+        if is_probable_prime(candidate):
+            return candidate
+
+
+class LocalKey:
+    """ Par de claves RSA generado en la prueba (1024 bits para que sea rápido) """
+
+    def __init__(self, kid, bits=1024, e=65537):
+        while True:
+            p, q = generate_prime(bits // 2), generate_prime(bits // 2)
+            phi = (p - 1) * (q - 1)
+            if p != q and phi % e:
+                break
+        self.kid, self.n, self.e = kid, p * q, e
+        self.d = pow(e, -1, phi)
+
+    def sign(self, claims, alg="RS256"):
+        def encode(data):
+            return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+        signing_input = f"{encode(json.dumps({'alg': alg, 'kid': self.kid}).encode())}.{encode(json.dumps(claims).encode())}"
+        size = (self.n.bit_length() + 7) // 8
+        digest = DIGEST_INFO + hashlib.sha256(signing_input.encode()).digest()
+        padded = b"\x00\x01" + b"\xff" * (size - len(digest) - 3) + b"\x00" + digest
+        signature = pow(int.from_bytes(padded, "big"), self.d, self.n).to_bytes(size, "big")
+        return f"{signing_input}.{encode(signature)}"
+
+
+@pytest.fixture(scope="module")
+def key():
+    return LocalKey("key-1")
+
+
+@pytest.fixture()
+def jwks(key, monkeypatch):
+    """ JWKS local: cuenta las descargas en lugar de ir a Cognito """
+    fetches = []
+
+    def fetch(url):
+        fetches.append(url)
+        return {key.kid: (key.n, key.e)}
+
+    monkeypatch.setenv("REGION_NAME", "us-east-1")
+    monkeypatch.setenv("USER_POOL_ID", "us-east-1_test")
+    monkeypatch.setenv("CLIENT_ID", "client")
+    monkeypatch.setattr(tokens, "fetch_jwks", fetch)
+    tokens.reset_jwks()
+    yield fetches
+    tokens.reset_jwks()
+
+
+def id_claims(**extra):
+    claims = {"sub": "abc", "iss": ISSUER, "aud": "client", "token_use": "id", "exp": 4102444800,
+              "cognito:username": "user@example.com", "email": "user@example.com"}
+    claims.update(extra)
+    return claims
+
+
+def authorize(token):
+    return app.lambda_handler({"type": "TOKEN", "authorizationToken": f"Bearer {token}",
+                               "methodArn": METHOD_ARN}, None)
+
+
+def test_user_gets_cacheable_policy_for_its_routes(key, jwks):
+    result = authorize(key.sign(id_claims(**{"cognito:groups": ["usuario"]})))
+    authorize(key.sign(id_claims(**{"cognito:groups": ["usuario"]})))
+
+    statement = result["policyDocument"]["Statement"][0]
+    assert result["principalId"] == "abc"
+    assert statement["Effect"] == "Allow"
+    assert statement["Resource"] == ["arn:aws:execute-api:us-east-1:123456789012:abc123/Prod/POST/profile"]
+    assert result["context"]["role"] == "usuario"
+    assert result["context"]["email"] == "user@example.com"
+    # El JWKS se descarga una vez por contenedor
+    assert jwks == [f"{ISSUER}/.well-known/jwks.json"]
+
+
+def test_admin_policy_covers_admin_routes_and_handler_trusts_context(key, jwks):
+    result = authorize(key.sign(id_claims(**{"cognito:groups": ["admin"]})))
+
+    assert sorted(result["policyDocument"]["Statement"][0]["Resource"]) == [
+        "arn:aws:execute-api:us-east-1:123456789012:abc123/Prod/GET/users",
+        "arn:aws:execute-api:us-east-1:123456789012:abc123/Prod/POST/admin",
+        "arn:aws:execute-api:us-east-1:123456789012:abc123/Prod/POST/profile",
+        "arn:aws:execute-api:us-east-1:123456789012:abc123/Prod/POST/users/bulk",
+    ]
+    # profile_admin responde con el contexto del authorizer, sin llamar a Cognito
+    event = {"requestContext": {"authorizer": dict(result["context"], principalId="abc")}}
+    response = profile_admin.lambda_handler(event, None)
+    assert response["statusCode"] == 200
+    assert json.loads(response["body"])["user_attributes"] == {"sub": "abc", "email": "user@example.com"}
+
+
+def test_role_attribute_is_used_when_user_has_no_groups(key, jwks):
+    result = authorize(key.sign(id_claims(**{"custom:role": "usuario"})))
+
+    assert result["context"]["role"] == "usuario"
+    assert result["policyDocument"]["Statement"][0]["Effect"] == "Allow"
+
+
+def test_role_attribute_never_grants_admin(key, jwks):
+    result = authorize(key.sign(id_claims(**{"custom:role": "admin"})))
+
+    assert result["policyDocument"]["Statement"][0]["Effect"] == "Deny"
+    assert result["context"]["cognito:groups"] == ""
+    assert result["context"]["role"] == ""
+    # Aunque API Gateway dejara pasar la petición, profile_admin no ve el grupo admin
+    event = {"requestContext": {"authorizer": dict(result["context"], principalId="abc")}}
+    assert profile_admin.lambda_handler(event, None)["statusCode"] == 403
+
+
+@pytest.mark.parametrize("claims", [
+    id_claims(exp=1),
+    id_claims(iss="https://cognito-idp.us-east-1.amazonaws.com/other"),
+    id_claims(aud="another-client"),
+    id_claims(token_use="refresh"),
+])
+def test_invalid_claims_are_unauthorized(key, jwks, claims):
+    with pytest.raises(Exception, match="^Unauthorized$"):
+        authorize(key.sign(claims))
+
+
+def test_forged_or_tampered_tokens_are_rejected(key, jwks):
+    token = key.sign(id_claims())
+    header, payload, signature = token.split(".")
+    tampered = base64.urlsafe_b64encode(json.dumps(id_claims(**{"cognito:groups": ["admin"]})).encode())
+
+    with pytest.raises(InvalidToken, match="Invalid signature"):
+        verify_token(f"{header}.{tampered.rstrip(b'=').decode()}.{signature}", ISSUER)
+    with pytest.raises(InvalidToken, match="Unsupported algorithm"):
+        verify_token(key.sign(id_claims(), alg="HS256"), ISSUER)
+    with pytest.raises(InvalidToken, match="Malformed"):
+        verify_token("not-a-jwt", ISSUER)
+
+
+def test_openssl_signed_token_is_accepted():
+    jwks = Jwks("https://example.com/jwks.json", fetch=lambda url: {OPENSSL_KID: (OPENSSL_N, 65537)})
+
+    claims = verify_token(OPENSSL_TOKEN, ISSUER, client_id="client", jwks=jwks)
+
+    assert claims["sub"] == "abc"
+    assert claims["email"] == "user@example.com"
+
+
+def test_signature_not_below_modulus_is_rejected():
+    signing_input, signature = OPENSSL_TOKEN.rsplit(".", 1)
+    s = int.from_bytes(base64.urlsafe_b64decode(signature + "=" * (-len(signature) % 4)), "big")
+    # s + n tiene la misma longitud y la misma potencia módulo n, pero está fuera de rango
+    forged = (s + OPENSSL_N).to_bytes(256, "big")
+
+    assert tokens._rs256_verify(signing_input.encode(), s.to_bytes(256, "big"), OPENSSL_N, 65537)
+    assert not tokens._rs256_verify(signing_input.encode(), forged, OPENSSL_N, 65537)
+
+
+def test_unknown_kid_refetches_jwks_at_most_once_per_interval(key):
+    fetches = []
+    clock = [0.0]
+
+    def fetch(url):
+        fetches.append(url)
+        return {key.kid: (key.n, key.e)}
+
+    jwks = Jwks("https://example.com/jwks.json", fetch=fetch, clock=lambda: clock[0])
+
+    assert jwks.key(key.kid) == (key.n, key.e)
+    assert jwks.key("rotated") is None
+    assert len(fetches) == 1
+    clock[0] = tokens.JWKS_REFRESH_INTERVAL
+    assert jwks.key("rotated") is None
+    assert len(fetches) == 2
@@ -0,0 +1,195 @@
+import json
+
+import pymysql
+import pytest
+from botocore.awsrequest import AWSResponse
+from botocore.config import Config
+from botocore.exceptions import ClientError, EndpointConnectionError
+
+from saes_common import breaker, clients, db
+from saes_common.breaker import CircuitBreaker, CircuitOpen
+from saes_common.deadline import deadline_aware
+
+from .conftest import FakeConnection
+
+
+class FlakyMySQL:
+    """ Sustituto local de pymysql.connect que falla las primeras ``failures`` veces """
+
+    def __init__(self, failures):
+        self.failures = failures
+        self.attempts = 0
+
+    def __call__(self, **kwargs):
+        self.attempts += 1
+        if self.attempts <= self.failures:
+            raise pymysql.err.OperationalError(2003, "Can't connect to MySQL server")
+        return FakeConnection()
+
+
+class FlakyCognito:
+    """ Responde a cada envío de botocore con un error inyectado, sin salir a la red """
+
+    def __init__(self, fault):
+        self.fault = fault
+        self.sent = 0
+
+    def __call__(self, request, **kwargs):
+        self.sent += 1
+        if self.fault == 'unreachable':
+            raise EndpointConnectionError(endpoint_url=request.url)
+        body = json.dumps({'__type': self.fault, 'message': 'injected'}).encode()
+        status = 400 if self.fault == 'UserNotFoundException' else 500
+        return AWSResponse(request.url, status, {}, FakeRaw(body))
+
+
+class FakeRaw:
+
+    def __init__(self, body):
+        self.body = body
+
+    def stream(self, **kwargs):
+        yield self.body
+
+
+@pytest.fixture()
+def flaky_cognito(monkeypatch):
+    """ Cliente de Cognito real (sin reintentos) cuyos envíos pasan por FlakyCognito """
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    monkeypatch.setattr(clients, "_config", Config(retries={'total_max_attempts': 1}))
+    clients.reset_clients()
+
+    def make(fault):
+        flaky = FlakyCognito(fault)
+        client = clients.cognito_client("us-east-1")
+        client.meta.events.register_first('before-send', flaky)
+        return client, flaky
+
+    yield make
+    clients.reset_clients()
+
+
+def test_breaker_opens_after_threshold_and_closes_after_trial(clock):
+    circuit = CircuitBreaker('test', failure_threshold=2, reset_timeout=10, clock=clock)
+
+    circuit.before_call()
+    circuit.record_failure()
+    circuit.before_call()
+    circuit.record_failure()
+    assert circuit.state == breaker.OPEN
+    with pytest.raises(CircuitOpen):
+        circuit.before_call()
+
+    clock.now = 10
+    circuit.before_call()
+    assert circuit.state == breaker.HALF_OPEN
+    # Mientras dura la prueba el resto de llamadas siguen rechazadas
+    with pytest.raises(CircuitOpen):
+        circuit.before_call()
+    circuit.record_success()
+
+    assert circuit.state == breaker.CLOSED
+    circuit.before_call()
+
+
+def test_failed_trial_reopens_and_state_changes_are_emitted(capsys, clock):
+    circuit = CircuitBreaker('test', failure_threshold=1, reset_timeout=10, clock=clock)
+
+    circuit.record_failure()
+    clock.now = 10
+    circuit.before_call()
+    circuit.record_failure()
+
+    assert circuit.state == breaker.OPEN
+    with pytest.raises(CircuitOpen):
+        circuit.before_call()
+    records = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert [(r['previous'], r['state']) for r in records] == [
+        ('closed', 'open'), ('open', 'half_open'), ('half_open', 'open')]
+    assert all(r['Operation'] == 'test_breaker' and r['StateChange'] == 1 for r in records)
+
+
+def test_db_breaker_stops_connecting_while_mysql_is_down(monkeypatch):
+    flaky = FlakyMySQL(failures=100)
+    monkeypatch.setattr(db.pymysql, "connect", flaky)
+    monkeypatch.setattr(db, "_read_wait_timeout", lambda connection: None)
+    db.discard_connection()
+
+    for _ in range(breaker.BREAKER_FAILURE_THRESHOLD):
+        with pytest.raises(pymysql.err.OperationalError):
+            db.get_connection("host", "user", "secret", "user_management")
+    with pytest.raises(CircuitOpen):
+        db.get_connection("host", "user", "secret", "user_management")
+
+    assert flaky.attempts == breaker.BREAKER_FAILURE_THRESHOLD
+
+
+def test_db_breaker_ignores_rejected_credentials(monkeypatch):
+    def connect(**kwargs):
+        raise pymysql.err.OperationalError(1045, "Access denied")
+
+    monkeypatch.setattr(db.pymysql, "connect", connect)
+    db.discard_connection()
+
+    for _ in range(breaker.BREAKER_FAILURE_THRESHOLD + 1):
+        with pytest.raises(pymysql.err.OperationalError):
+            db.get_connection("host", "user", "wrong", "user_management")
+
+    assert breaker.get_breaker('db').state == breaker.CLOSED
+
+
+def test_handler_returns_fast_503_while_db_circuit_is_open(monkeypatch):
+    flaky = FlakyMySQL(failures=100)
+    monkeypatch.setattr(db.pymysql, "connect", flaky)
+    db.discard_connection()
+
+    @deadline_aware
+    def handler(event, context):
+        try:
+            db.get_connection("host", "user", "secret", "user_management")
+            return {'statusCode': 200, 'body': '[]'}
+        except Exception as e:
+            return {'statusCode': 500, 'body': json.dumps({"error_message": str(e)})}
+
+    responses = [handler({}, None)['statusCode'] for _ in range(breaker.BREAKER_FAILURE_THRESHOLD + 2)]
+
+    assert responses == [500] * breaker.BREAKER_FAILURE_THRESHOLD + [503, 503]
+    assert flaky.attempts == breaker.BREAKER_FAILURE_THRESHOLD
+
+
+def test_cognito_breaker_counts_outages_but_not_client_errors(flaky_cognito):
+    client, flaky = flaky_cognito('UserNotFoundException')
+    for _ in range(breaker.BREAKER_FAILURE_THRESHOLD):
+        with pytest.raises(ClientError):
+            client.admin_get_user(UserPoolId="us-east-1_test", Username="user")
+    assert breaker.get_breaker('cognito-idp').state == breaker.CLOSED
+
+    flaky.fault = 'unreachable'
+    for _ in range(breaker.BREAKER_FAILURE_THRESHOLD):
+        with pytest.raises(EndpointConnectionError):
+            client.admin_get_user(UserPoolId="us-east-1_test", Username="user")
+    assert breaker.get_breaker('cognito-idp').state == breaker.OPEN
+
+    sent = flaky.sent
+    with pytest.raises(CircuitOpen):
+        client.admin_get_user(UserPoolId="us-east-1_test", Username="user")
+    assert flaky.sent == sent
+
+
+def test_cognito_5xx_opens_circuit_and_handler_answers_503(flaky_cognito):
+    client, flaky = flaky_cognito('InternalErrorException')
+
+    @deadline_aware
+    def handler(event, context):
+        try:
+            client.admin_get_user(UserPoolId="us-east-1_test", Username="user")
+        except ClientError as e:
+            return {'statusCode': 400, 'body': json.dumps({"error_message": e.response['Error']['Message']})}
+        except Exception as e:
+            return {'statusCode': 500, 'body': json.dumps({"error_message": str(e)})}
+
+    statuses = [handler({}, None)['statusCode'] for _ in range(breaker.BREAKER_FAILURE_THRESHOLD + 1)]
+
+    assert statuses == [400] * breaker.BREAKER_FAILURE_THRESHOLD + [503]
+    assert flaky.sent == breaker.BREAKER_FAILURE_THRESHOLD
@@ -0,0 +1,186 @@
+import json
+import threading
+
+import pytest
+from botocore.exceptions import BotoCoreError, ClientError
+
+from bulk_create_users import app
+from saes_common import deadline
+from saes_common.concurrency import TokenBucket
+from saes_common.deadline import Deadline, DeadlineExceeded
+
+from .conftest import FakeConnection
+
+
+class UsernameExistsException(ClientError):
+    pass
+
+
+class FakeCognito:
+    """Cliente de Cognito mínimo y seguro entre hilos (el orden de las llamadas no es fijo)."""
+
+    class exceptions:
+        UsernameExistsException = UsernameExistsException
+        ResourceNotFoundException = type('ResourceNotFoundException', (ClientError,), {})
+
+    def __init__(self, existing=()):
+        self.existing = set(existing)
+        self.created = set()
+        self.deleted = []
+        self._lock = threading.Lock()
+
+    def get_group(self, **kwargs):
+        return {'Group': {'GroupName': kwargs['GroupName']}}
+
+    def admin_create_user(self, Username, **kwargs):
+        with self._lock:
+            if Username in self.existing:
+                raise UsernameExistsException(
+                    {'Error': {'Code': 'UsernameExistsException', 'Message': 'exists'}}, 'AdminCreateUser')
+            self.created.add(Username)
+
+    def admin_add_user_to_group(self, **kwargs):
+        pass
+
+    def admin_delete_user(self, Username, **kwargs):
+        with self._lock:
+            self.deleted.append(Username)
+
+
+def users_table(fail=False):
+    """ Conexión que guarda los emails insertados y numera sus ``user_id`` desde 1 """
+    def respond(query, params):
+        if fail and query.startswith("INSERT"):
+            raise RuntimeError("deadlock")
+        if query.startswith("INSERT INTO users"):
+            connection.inserted.extend(row[2] for row in params)
+        elif query.startswith("SELECT"):
+            return [(email, connection.inserted.index(email) + 1) for email in params]
+
+    connection = FakeConnection(respond)
+    connection.inserted = []
+    return connection
+
+
+@pytest.fixture()
+def environment(monkeypatch):
+    """ Variables de entorno y presupuesto de Cognito sin esperas """
+    monkeypatch.setenv('REGION_NAME', 'us-east-1')
+    monkeypatch.setenv('USER_POOL_ID', 'us-east-1_test')
+    monkeypatch.setenv('RDS_SECRET_NAME', 'secret')
+    monkeypatch.setenv('RDS_DB_NAME', 'user_management')
+    monkeypatch.setenv('RDS_ENDPOINT', 'localhost')
+    monkeypatch.setattr(app, 'cognito_budget', TokenBucket(1000))
+
+
+def invoke(monkeypatch, body, client, connection, content_type='text/csv'):
+    monkeypatch.setattr(app, 'cognito_client', lambda region: client)
+    monkeypatch.setattr(app, 'get_connection_from_secret', lambda *args, **kwargs: connection)
+    response = app.lambda_handler({'headers': {'Content-Type': content_type}, 'body': body}, None)
+    return response['statusCode'], json.loads(response['body'])
+
+
+def test_parse_rows_reads_csv_and_jsonl():
+    csv_rows = app.parse_rows("email,name\na@example.com,A\nb@example.com,B\n", 'text/csv')
+    jsonl_rows = app.parse_rows('{"email": "a@example.com"}\n\n{"email": "b@example.com"}\n', '')
+
+    assert [row['email'] for row in csv_rows] == ['a@example.com', 'b@example.com']
+    assert [row['email'] for row in jsonl_rows] == ['a@example.com', 'b@example.com']
+
+
+def test_parse_rows_requires_email_column():
+    with pytest.raises(ValueError):
+        app.parse_rows("name\nA\n", 'text/csv')
+
+
+def test_validate_rows_flags_invalid_and_duplicates():
+    results = app.validate_rows([{'email': 'a@example.com'}, {'email': 'nope'}, {'email': 'A@example.com'}])
+
+    assert [result['status'] for result in results] == ['pending', 'invalid', 'invalid']
+
+
+def test_bulk_create_reports_per_row_results(environment, monkeypatch):
+    client = FakeCognito(existing={'taken@example.com'})
+    connection = users_table()
+    body = "email\na@example.com\ntaken@example.com\nbad\nb@example.com\n"
+
+    status_code, data = invoke(monkeypatch, body, client, connection)
+
+    assert status_code == 200
+    assert data['summary'] == {'created': 2, 'exists': 1, 'invalid': 1}
+    assert sorted(connection.inserted) == ['a@example.com', 'b@example.com']
+    assert all('password' not in result for result in data['results'])
+    assert all(result['user_id'] for result in data['results'] if result['status'] == 'created')
+
+
+def test_bulk_create_rolls_back_cognito_when_batch_fails(environment, monkeypatch):
+    client = FakeCognito()
+    connection = users_table(fail=True)
+
+    status_code, data = invoke(monkeypatch, '{"email": "a@example.com"}\n{"email": "b@example.com"}',
+                               client, connection, content_type='application/x-ndjson')
+
+    assert status_code == 200
+    assert data['summary'] == {'error': 2}
+    assert sorted(client.deleted) == ['a@example.com', 'b@example.com']
+
+
+def test_token_bucket_waits_when_empty(clock):
+    waits = []
+
+    def sleep(seconds):
+        waits.append(seconds)
+        clock.now += seconds
+
+    bucket = TokenBucket(2, capacity=1, clock=clock, sleep=sleep)
+    bucket.acquire()
+    bucket.acquire()
+
+    assert waits == [0.5]
+
+
+def test_bulk_create_returns_results_when_deadline_runs_out(environment, monkeypatch):
+    class SlowCognito(FakeCognito):
+        def admin_add_user_to_group(self, Username, **kwargs):
+            if Username == 'b@example.com':
+                raise DeadlineExceeded("No time left for AdminAddUserToGroup")
+
+        def admin_delete_user(self, Username, **kwargs):
+            super().admin_delete_user(Username)
+            raise BotoCoreError()
+
+    def no_time_left(*args, **kwargs):
+        raise DeadlineExceeded("No time left for connect")
+
+    client = SlowCognito()
+    monkeypatch.setattr(app, 'cognito_client', lambda region: client)
+    monkeypatch.setattr(app, 'get_connection_from_secret', no_time_left)
+    response = app.lambda_handler({'body': "email\na@example.com\nb@example.com\n"}, None)
+    data = json.loads(response['body'])
+
+    # Ni el plazo ni un rollback fallido convierten la respuesta en un 500/503 sin resultados
+    assert response['statusCode'] == 200
+    assert data['summary'] == {'error': 2}
+    assert sorted(client.deleted) == ['a@example.com', 'b@example.com']
+
+
+def test_token_bucket_gives_up_instead_of_sleeping_past_deadline(monkeypatch, clock):
+    waits = []
+    bucket = TokenBucket(1, capacity=1, clock=clock, sleep=waits.append)
+    monkeypatch.setattr(deadline, '_current', Deadline(500, reserve_ms=0, clock=clock))
+
+    bucket.acquire()
+    with pytest.raises(DeadlineExceeded):
+        bucket.acquire()
+
+    assert waits == []
+
+
+def test_compensation_may_use_the_deadline_reserve(clock):
+    budget = Deadline(1000, reserve_ms=500, clock=clock)
+    clock.now = 0.6
+
+    with pytest.raises(DeadlineExceeded):
+        budget.check()
+    with deadline.compensation():
+        budget.check()
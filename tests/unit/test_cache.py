@@ -0,0 +1,210 @@
+import json
+
+import pytest
+
+from get_user import app as get_user_app
+from saes_common import cache, users
+from saes_common.bloom import BloomFilter
+from saes_common.cache import LocalCache, RedisCache
+from saes_common.users import invalidate_user
+
+from .conftest import FakeConnection
+
+
+class FakeRedis:
+    """ Sustituto local de redis.Redis con get/setex/delete y TTL en segundos """
+
+    def __init__(self, clock):
+        self.clock = clock
+        self.data = {}
+
+    def get(self, key):
+        value, expires_at = self.data.get(key, (None, 0))
+        return value if self.clock() < expires_at else None
+
+    def setex(self, key, ttl, value):
+        self.data[key] = (value.encode(), self.clock() + ttl)
+
+    def delete(self, key):
+        self.data.pop(key, None)
+
+
+@pytest.fixture(params=['local', 'redis'])
+def backend(request, clock):
+    """ Cada prueba se ejecuta con los dos backends """
+    if request.param == 'local':
+        return LocalCache(ttl=10, max_entries=2, clock=clock), clock
+    return RedisCache(FakeRedis(clock), ttl=10), clock
+
+
+def test_get_or_load_reads_through_and_expires(backend):
+    user_cache, clock = backend
+    loads = []
+
+    def loader():
+        loads.append(1)
+        return [[1, 'user']]
+
+    assert user_cache.get_or_load('user:1', loader) == ([[1, 'user']], False)
+    assert user_cache.get_or_load('user:1', loader) == ([[1, 'user']], True)
+    clock.now = 10
+    assert user_cache.get_or_load('user:1', loader)[1] is False
+    assert len(loads) == 2
+    assert user_cache.take_stats() == {'hits': 1, 'misses': 2, 'evictions': 0}
+
+
+def test_empty_results_are_not_cached(backend):
+    user_cache, _ = backend
+
+    user_cache.get_or_load('user:9', lambda: ())
+
+    assert user_cache.get('user:9') is None
+
+
+def test_local_cache_evicts_least_recently_used(clock):
+    user_cache = LocalCache(ttl=10, max_entries=2, clock=clock)
+    user_cache.set('a', 1)
+    user_cache.set('b', 2)
+    user_cache.get('a')
+    user_cache.set('c', 3)
+
+    assert user_cache.get('b') is None
+    assert user_cache.get('a') == 1
+    assert user_cache.take_stats()['evictions'] == 1
+
+
+def test_get_user_is_served_from_cache_until_invalidated(monkeypatch):
+    monkeypatch.setattr(cache, '_caches', {'users': LocalCache(ttl=60, max_entries=10)})
+    queries = []
+
+    def load_user(user_id):
+        queries.append(user_id)
+        return {'data': [[int(user_id), 'user@example.com']], 'etag': '"1-1"'}
+
+    monkeypatch.setattr(get_user_app, 'load_user', load_user)
+    event = {'pathParameters': {'id': '1'}}
+
+    first = get_user_app.lambda_handler(event, None)
+    get_user_app.lambda_handler(event, None)
+    invalidate_user('1')
+    get_user_app.lambda_handler(event, None)
+
+    assert first['statusCode'] == 200
+    assert json.loads(first['body']) == {'data': [[1, 'user@example.com']]}
+    assert queries == ['1', '1']
+
+
+def test_missing_user_is_negatively_cached(monkeypatch, clock):
+    monkeypatch.setattr(cache, '_caches', {'users': LocalCache(ttl=60, max_entries=10, clock=clock)})
+    queries = []
+    monkeypatch.setattr(get_user_app, 'load_user', lambda user_id: queries.append(user_id) or {'data': [], 'etag': None})
+    event = {'pathParameters': {'id': '404'}}
+
+    assert get_user_app.lambda_handler(event, None)['statusCode'] == 204
+    assert get_user_app.lambda_handler(event, None)['statusCode'] == 204
+    clock.now = users.NEGATIVE_CACHE_TTL
+    get_user_app.lambda_handler(event, None)
+    get_user_app.lambda_handler({'pathParameters': {'id': 'abc'}}, None)
+
+    assert queries == ['404', '404']
+
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(1000, error_rate=0.01)
+    for user_id in range(1, 1001):
+        bloom.add(user_id)
+
+    false_positives = sum(user_id in bloom for user_id in range(1001, 11001))
+
+    assert all(user_id in bloom for user_id in range(1, 1001))
+    assert false_positives < 300
+
+
+def test_user_id_filter_only_rejects_trusted_ids():
+    bloom = BloomFilter(10)
+    for user_id in (1, 2, 5):
+        bloom.add(user_id)
+    user_filter = users.UserIdFilter(bloom, max_id=5, built_at=0, trusted_max_id=3)
+
+    assert user_filter.definitely_absent(3)
+    assert not user_filter.definitely_absent(2)
+    # Quizá reservado antes de construir el filtro y confirmado después
+    assert not user_filter.definitely_absent(4)
+    # Creado después de construir el filtro, quizá en otro contenedor
+    assert not user_filter.definitely_absent(6)
+
+
+def test_id_committed_after_build_below_max_is_not_rejected(monkeypatch, clock):
+    committed = [1, 2, 4, 5]
+
+    def respond(query, params):
+        # El id 3 ya está reservado (por eso hay ids mayores) pero su transacción no ha terminado
+        return [(len(committed), max(committed))] if 'COUNT' in query else []
+
+    monkeypatch.setattr(users, 'USER_ID_FILTER_MARGIN', 3)
+    monkeypatch.setattr(users, 'stream_rows', lambda connection, query, params: [{'user_id': i} for i in committed])
+    first = users.build_user_id_filter(FakeConnection(respond), clock=clock)
+
+    assert first.trusted_max_id == 2
+    assert not first.definitely_absent(3)
+
+    # La transacción del id 3 se deshace; la siguiente construcción confía en
+    # el máximo de la anterior solo cuando ha pasado USER_ID_FILTER_SETTLE
+    committed.append(6)
+    clock.now = users.USER_ID_FILTER_SETTLE / 2
+    assert users.build_user_id_filter(FakeConnection(respond), clock=clock, previous=first).trusted_max_id == 3
+    clock.now = users.USER_ID_FILTER_SETTLE
+    second = users.build_user_id_filter(FakeConnection(respond), clock=clock, previous=first)
+
+    assert second.trusted_max_id == 5
+    assert second.definitely_absent(3)
+    assert not second.definitely_absent(6)
+
+
+def test_get_user_skips_database_for_absent_ids(monkeypatch):
+    monkeypatch.setattr(cache, '_caches', {'users': LocalCache(ttl=60, max_entries=10)})
+    monkeypatch.setattr(get_user_app, 'USER_ID_FILTER', True)
+    bloom = BloomFilter(10)
+    bloom.add(1)
+    monkeypatch.setattr(users, '_user_id_filter', users.UserIdFilter(bloom, max_id=100, built_at=float('inf'),
+                                                                       trusted_max_id=100))
+
+    def no_database(consistency_key=None):
+        raise AssertionError("database used")
+
+    monkeypatch.setattr(get_user_app, 'db_connection', no_database)
+
+    assert get_user_app.lambda_handler({'pathParameters': {'id': '42'}}, None)['statusCode'] == 204
+
+
+def test_user_id_filter_is_built_in_background_and_failures_back_off(monkeypatch, clock):
+    attempts = []
+    monkeypatch.setattr(users, '_user_id_filter', None)
+    monkeypatch.setattr(users, '_user_id_filter_failed_at', None)
+
+    def failing_connection():
+        attempts.append(clock.now)
+        raise RuntimeError("database unavailable")
+
+    def build():
+        current = users.user_id_filter(failing_connection, clock=clock)
+        users._user_id_filter_builder.join()
+        return current
+
+    # Sin filtro la petición sigue (None: consulta normal) y el fallo no se reintenta en cada petición
+    assert build() is None
+    assert build() is None
+    assert attempts == [0.0]
+    clock.now = users.USER_ID_FILTER_RETRY
+    assert build() is None
+    assert attempts == [0.0, users.USER_ID_FILTER_RETRY]
+
+
+def test_get_user_queries_database_while_filter_is_missing(monkeypatch):
+    monkeypatch.setattr(cache, '_caches', {'users': LocalCache(ttl=60, max_entries=10)})
+    monkeypatch.setattr(get_user_app, 'USER_ID_FILTER', True)
+    monkeypatch.setattr(get_user_app, 'user_id_filter', lambda get_connection: None)
+    monkeypatch.setattr(get_user_app, 'db_connection', lambda consistency_key=None: None)
+    monkeypatch.setattr(get_user_app, 'fetch_all', lambda *args, **kwargs: [{'user_id': 42, 'version': 1}])
+
+    assert get_user_app.lambda_handler({'pathParameters': {'id': '42'}}, None)['statusCode'] == 200
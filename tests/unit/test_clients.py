@@ -0,0 +1,15 @@
+from saes_common import clients
+
+
+def test_get_client_is_created_once_per_container(monkeypatch):
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    clients.reset_clients()
+
+    first = clients.cognito_client("us-east-1")
+    second = clients.get_client("cognito-idp", "us-east-1")
+
+    assert first is second
+    assert first.meta.config.retries["mode"] == "adaptive"
+    assert clients.secrets_client("us-east-1") is not first
+    clients.reset_clients()
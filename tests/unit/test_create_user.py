@@ -0,0 +1,149 @@
+import json
+
+import pytest
+from botocore.awsrequest import AWSResponse
+from botocore.config import Config
+
+from create_user import app
+from saes_common import clients, deadline, users
+
+
+@pytest.fixture()
+def cognito(cognito, monkeypatch):
+    """ Cognito con Stubber (conftest), sin grupos conocidos y con la base de datos sustituida """
+    monkeypatch.setattr(users, "_known_groups", set())
+    monkeypatch.setattr(app, "insert_db", lambda *args: 1)
+    return cognito
+
+
+class RecordingCognito:
+    """ Responde 200 a cada envío de botocore y anota la operación, sin salir a la red """
+
+    def __init__(self):
+        self.sent = []
+
+    def __call__(self, request, **kwargs):
+        self.sent.append(request.headers['X-Amz-Target'].decode().split('.')[-1])
+        return AWSResponse(request.url, 200, {}, FakeRaw(b'{}'))
+
+
+class FakeRaw:
+
+    def __init__(self, body):
+        self.body = body
+
+    def stream(self, **kwargs):
+        yield self.body
+
+
+class FakeContext:
+
+    def get_remaining_time_in_millis(self):
+        return 5000
+
+
+@pytest.fixture()
+def recording_cognito(monkeypatch):
+    """ Cliente de Cognito real cuyos envíos pasan antes por la comprobación del plazo """
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    monkeypatch.setenv("REGION_NAME", "us-east-1")
+    monkeypatch.setenv("USER_POOL_ID", "us-east-1_test")
+    monkeypatch.setattr(clients, "_config", Config(retries={'total_max_attempts': 1}))
+    monkeypatch.setattr(users, "_known_groups", {("us-east-1_test", "usuario")})
+    clients.reset_clients()
+    recording = RecordingCognito()
+    # register (no register_first): el before-send del plazo se ejecuta antes
+    clients.cognito_client("us-east-1").meta.events.register('before-send', recording)
+    yield recording
+    clients.reset_clients()
+
+
+def invoke(email):
+    response = app.lambda_handler({"body": json.dumps({"email": email})}, None)
+    return response["statusCode"], json.loads(response["body"])
+
+
+def test_existing_user_returns_400_without_precheck(cognito):
+    cognito.add_client_error("admin_create_user", service_error_code="UsernameExistsException")
+
+    status_code, body = invoke("taken@example.com")
+
+    assert status_code == 400
+    assert body == {"error_message": "User account already exists"}
+    cognito.assert_no_pending_responses()
+
+
+def test_group_is_checked_once_per_container(cognito):
+    cognito.add_response("admin_create_user", {"User": {"Username": "a@example.com"}})
+    cognito.add_client_error("get_group", service_error_code="ResourceNotFoundException")
+    cognito.add_response("create_group", {"Group": {"GroupName": "usuario"}})
+    cognito.add_response("admin_add_user_to_group", {})
+    cognito.add_response("admin_create_user", {"User": {"Username": "b@example.com"}})
+    cognito.add_response("admin_add_user_to_group", {})
+
+    assert invoke("a@example.com")[0] == 200
+    assert invoke("b@example.com")[0] == 200
+    cognito.assert_no_pending_responses()
+
+
+def test_failed_db_write_rolls_back_cognito_user(cognito, monkeypatch):
+    def failing_insert(*args):
+        raise RuntimeError("database unavailable")
+
+    monkeypatch.setattr(app, "insert_db", failing_insert)
+    cognito.add_response("admin_create_user", {"User": {"Username": "a@example.com"}})
+    cognito.add_response("get_group", {"Group": {"GroupName": "usuario"}})
+    cognito.add_response("admin_add_user_to_group", {})
+    cognito.add_response("admin_delete_user", {}, {"UserPoolId": "us-east-1_test", "Username": "a@example.com"})
+
+    status_code, body = invoke("a@example.com")
+
+    assert status_code == 500
+    assert body == {"error_message": "database unavailable"}
+    cognito.assert_no_pending_responses()
+
+
+def test_failed_group_step_rolls_back_db_rows(cognito, monkeypatch):
+    deleted = []
+    monkeypatch.setattr(app, "db_connection", lambda: None)
+    monkeypatch.setattr(app, "delete_user_with_profile", lambda connection, user_id: deleted.append(user_id))
+    users._known_groups.add(("us-east-1_test", "usuario"))
+    cognito.add_response("admin_create_user", {"User": {"Username": "a@example.com"}})
+    cognito.add_client_error("admin_add_user_to_group", service_error_code="UserNotFoundException")
+    cognito.add_response("admin_delete_user", {})
+
+    status_code, _ = invoke("a@example.com")
+
+    assert status_code == 400
+    assert deleted == [1]
+    cognito.assert_no_pending_responses()
+
+
+def test_db_connection_uses_shared_connector(monkeypatch):
+    calls = []
+    monkeypatch.setenv("RDS_SECRET_NAME", "secret")
+    monkeypatch.setenv("RDS_DB_NAME", "user_management")
+    monkeypatch.setenv("RDS_ENDPOINT", "db.example.com")
+    monkeypatch.setattr(app, "get_connection_from_secret", lambda *args, **kwargs: calls.append((args, kwargs)))
+
+    app.db_connection()
+
+    # Sin RDS_USERNAME/RDS_PASSWORD: la autenticación la decide DB_AUTH
+    assert calls == [(("secret",), {"database": "user_management", "host": "db.example.com"})]
+
+
+def test_rollback_reaches_cognito_after_deadline_expires_in_db_step(recording_cognito, monkeypatch):
+    def expiring_insert(*args):
+        budget = deadline.current_deadline()
+        budget.expires_at = budget.clock() - 0.01
+        budget.check('database')
+
+    monkeypatch.setattr(app, "insert_db", expiring_insert)
+
+    response = app.lambda_handler({"body": json.dumps({"email": "a@example.com"})}, FakeContext())
+
+    assert response["statusCode"] == 503
+    # La compensación usa el margen final: el borrado sí llega a enviarse
+    assert recording_cognito.sent[0] == "AdminCreateUser"
+    assert recording_cognito.sent[-1] == "AdminDeleteUser"
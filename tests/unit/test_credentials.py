@@ -0,0 +1,153 @@
+import json
+
+import boto3
+import pymysql
+import pytest
+from botocore.stub import Stubber
+
+from saes_common import credentials, db
+
+from .conftest import FakeConnection
+
+
+@pytest.fixture()
+def fetches():
+    """ Función fetch local que cuenta las lecturas y devuelve una versión nueva cada vez """
+    calls = []
+
+    def fetch(secret_name, region_name):
+        calls.append(secret_name)
+        return {"username": "admin", "password": f"v{len(calls)}"}
+
+    fetch.calls = calls
+    return fetch
+
+
+def test_secret_cache_hits_within_ttl(fetches, clock):
+    cache = credentials.SecretCache(fetches, ttl=300, refresh_ahead=60, clock=clock)
+
+    first = cache.get("secretsSAES")
+    clock.now = 100
+    second = cache.get("secretsSAES")
+
+    assert first is second
+    assert fetches.calls == ["secretsSAES"]
+
+
+class DeferredThread:
+    """ Hilo que no arranca hasta que la prueba lo ejecuta """
+    started = []
+
+    def __init__(self, target, daemon=None):
+        self.target = target
+
+    def start(self):
+        self.started.append(self.target)
+
+
+def test_secret_cache_refreshes_ahead_in_background(fetches, monkeypatch, clock):
+    started = DeferredThread.started = []
+    monkeypatch.setattr(credentials.threading, "Thread", DeferredThread)
+    cache = credentials.SecretCache(fetches, ttl=300, refresh_ahead=60, clock=clock)
+    cache.get("secretsSAES")
+
+    clock.now = 250
+    stale = cache.get("secretsSAES")
+    cache.get("secretsSAES")
+
+    # Se devuelve el valor actual y se programa un único refresco
+    assert stale["password"] == "v1"
+    assert len(started) == 1
+
+    started[0]()
+    assert cache.get("secretsSAES")["password"] == "v2"
+
+
+def test_secret_cache_reloads_after_expiry(fetches, clock):
+    cache = credentials.SecretCache(fetches, ttl=300, refresh_ahead=60, clock=clock)
+    cache.get("secretsSAES")
+
+    clock.now = 301
+
+    assert cache.get("secretsSAES")["password"] == "v2"
+
+
+def test_fetch_secret_reads_secrets_manager(monkeypatch):
+    client = boto3.client("secretsmanager", region_name="us-east-1")
+    stubber = Stubber(client)
+    stubber.add_response("get_secret_value",
+                         {"SecretString": json.dumps({"username": "admin", "password": "pw"})},
+                         {"SecretId": "secretsSAES"})
+    monkeypatch.setattr(credentials, "secrets_client", lambda region_name=None: client)
+
+    with stubber:
+        assert credentials.fetch_secret("secretsSAES", "us-east-1") == {"username": "admin", "password": "pw"}
+
+
+def test_connection_from_secret_refetches_rotated_secret(fetches, monkeypatch):
+    monkeypatch.setattr(credentials, "secret_cache", credentials.SecretCache(fetches))
+    attempts = []
+
+    def fake_get_connection(host, user, password, database, label=None):
+        attempts.append(password)
+        if password == "v1":
+            raise pymysql.err.OperationalError(1045, "Access denied for user 'admin'")
+        return "connection"
+
+    monkeypatch.setattr(db, "get_connection", fake_get_connection)
+
+    assert db.get_connection_from_secret("secretsSAES", "user_management", host="localhost") == "connection"
+    assert attempts == ["v1", "v2"]
+
+
+def test_db_auth_token_is_signed_locally_and_cached(monkeypatch, clock):
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "AKIDEXAMPLE")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    monkeypatch.setenv("AWS_REGION", "us-east-1")
+    monkeypatch.setattr(credentials, "auth_token_cache", credentials.SecretCache(
+        credentials.generate_db_auth_token, ttl=780, refresh_ahead=120, clock=clock))
+
+    token = credentials.get_db_auth_token("db.example.com", 3306, "iam_user")
+
+    assert token.startswith("db.example.com:3306/?Action=connect&DBUser=iam_user&")
+    assert "X-Amz-Expires=900" in token and "%2Frds-db%2Faws4_request" in token
+    clock.now = 600
+    assert credentials.get_db_auth_token("db.example.com", 3306, "iam_user") is token
+
+
+def test_iam_connection_asks_for_token_only_when_connecting(monkeypatch):
+    tokens = []
+    opened = []
+    monkeypatch.setattr(credentials, "get_db_auth_token", lambda host, port, user: tokens.append(host) or "token")
+
+    def fake_connect(**kwargs):
+        opened.append(kwargs)
+        return FakeConnection()
+
+    monkeypatch.setattr(db.pymysql, "connect", fake_connect)
+    monkeypatch.setattr(db, "_read_wait_timeout", lambda connection: None)
+    monkeypatch.setattr(db, "DB_AUTH", "iam")
+    monkeypatch.setattr(db, "RDS_IAM_USER", "iam_user")
+    monkeypatch.setattr(db, "RDS_CA_BUNDLE", "/opt/python/global-bundle.pem")
+    db.discard_connection()
+
+    first = db.get_connection_from_secret("unused", "user_management", host="db.example.com")
+    second = db.get_connection_from_secret("unused", "user_management", host="db.example.com")
+    db.discard_connection()
+
+    assert first is second
+    assert tokens == ["db.example.com"]
+    assert opened[0]["password"] == "token" and opened[0]["user"] == "iam_user"
+    assert opened[0]["ssl"] == {"ca": "/opt/python/global-bundle.pem"}
+
+
+def test_iam_connection_requires_ca_bundle(monkeypatch):
+    opened = []
+    monkeypatch.setattr(db.pymysql, "connect", lambda **kwargs: opened.append(kwargs))
+    monkeypatch.setattr(db, "DB_AUTH", "iam")
+    monkeypatch.setattr(db, "RDS_CA_BUNDLE", "")
+    db.discard_connection()
+
+    with pytest.raises(RuntimeError, match="RDS_CA_BUNDLE"):
+        db.get_connection_from_secret("unused", "user_management", host="db.example.com")
+    assert opened == []
@@ -0,0 +1,69 @@
+import pytest
+
+from saes_common import cache, db
+
+from .conftest import FakeConnection
+
+
+@pytest.fixture()
+def connections(monkeypatch):
+    """ Sustituye pymysql.connect y devuelve la lista de conexiones abiertas """
+    opened = []
+
+    def fake_connect(**kwargs):
+        connection = FakeConnection()
+        opened.append(connection)
+        return connection
+
+    monkeypatch.setattr(db.pymysql, "connect", fake_connect)
+    db.discard_connection()
+    yield opened
+    db.discard_connection()
+
+
+def test_get_connection_reuses_live_connection(connections):
+    first = db.get_connection("host", "user", "secret", "user_management")
+    second = db.get_connection("host", "user", "secret", "user_management")
+
+    assert first is second
+    assert len(connections) == 1
+
+
+def test_get_connection_reconnects_when_ping_fails(connections):
+    first = db.get_connection("host", "user", "secret", "user_management")
+    first.alive = False
+
+    second = db.get_connection("host", "user", "secret", "user_management")
+
+    assert second is not first
+    assert first.closed
+
+
+def test_get_connection_reconnects_before_wait_timeout(connections, monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(db.time, "monotonic", lambda: clock[0])
+
+    first = db.get_connection("host", "user", "secret", "user_management")
+    clock[0] += first.wait_timeout
+
+    second = db.get_connection("host", "user", "secret", "user_management")
+
+    assert second is not first
+    assert len(connections) == 2
+
+
+def test_reader_connection_honours_read_your_writes(monkeypatch):
+    hosts = []
+    monkeypatch.setattr(db, "get_connection_from_secret",
+                        lambda secret_name, database, host=None, label=None: hosts.append(host))
+    monkeypatch.setattr(db, "RDS_READER_ENDPOINT", "reader")
+    monkeypatch.setattr(db, "READ_YOUR_WRITES", True)
+    monkeypatch.setenv("RDS_ENDPOINT", "writer")
+    monkeypatch.setattr(cache, "_caches", {"recent-writes": cache.LocalCache(ttl=60, max_entries=10)})
+
+    db.get_reader_connection_from_secret("secret", "db", consistency_key="user:1")
+    db.note_write("user:1")
+    db.get_reader_connection_from_secret("secret", "db", consistency_key="user:1")
+    db.get_reader_connection_from_secret("secret", "db", consistency_key="user:2")
+
+    assert hosts == ["reader", "writer", "reader"]
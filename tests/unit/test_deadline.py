@@ -0,0 +1,164 @@
+import json
+import logging
+import socket
+import time
+
+import pytest
+from botocore.awsrequest import AWSResponse
+from botocore.httpsession import URLLib3Session
+
+from saes_common import clients, db, deadline
+from saes_common.deadline import Deadline, DeadlineExceeded, deadline_aware
+
+from .conftest import FakeConnection
+
+
+class FakeContext:
+
+    def __init__(self, remaining_ms):
+        self.remaining_ms = remaining_ms
+
+    def get_remaining_time_in_millis(self):
+        return self.remaining_ms
+
+
+def test_timeout_is_capped_by_remaining_time(clock):
+    budget = Deadline(3000, reserve_ms=500, clock=clock)
+
+    assert budget.timeout(5) == 2.5
+    assert budget.timeout(1) == 1
+    clock.now = 2.5
+    with pytest.raises(DeadlineExceeded):
+        budget.timeout(5)
+    assert budget.tripped
+
+
+def test_handler_that_swallows_timeout_returns_503():
+    @deadline_aware
+    def handler(event, context):
+        try:
+            deadline.current_deadline().check('database')
+        except Exception:
+            return {'statusCode': 500, 'body': '"Internal server error"'}
+
+    response = handler({}, FakeContext(remaining_ms=100))
+
+    assert response['statusCode'] == 503
+    assert response['headers']['Retry-After'] == '1'
+    assert deadline.current_deadline() is None
+
+
+def test_successful_response_is_kept_and_no_context_means_no_deadline():
+    @deadline_aware
+    def handler(event, context):
+        return {'statusCode': 200, 'body': json.dumps(deadline.current_deadline() is None)}
+
+    assert handler({}, None) == {'statusCode': 200, 'body': 'true'}
+
+
+def test_aws_calls_stop_when_no_time_is_left(monkeypatch):
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    clients.reset_clients()
+
+    @deadline_aware
+    def handler(event, context):
+        clients.cognito_client("us-east-1").admin_get_user(UserPoolId="us-east-1_test", Username="user")
+
+    response = handler({}, FakeContext(remaining_ms=0))
+    clients.reset_clients()
+
+    assert response['statusCode'] == 503
+
+
+def test_new_db_connection_uses_remaining_time(monkeypatch):
+    opened = []
+    monkeypatch.setattr(db.pymysql, "connect", lambda **kwargs: opened.append(kwargs) or FakeConnection())
+    monkeypatch.setattr(db, "_read_wait_timeout", lambda connection: None)
+    monkeypatch.setattr(deadline, "_current", Deadline(1500, reserve_ms=500))
+    db.discard_connection()
+
+    connection = db.get_connection("host", "user", "secret", "user_management")
+    db.discard_connection()
+
+    assert 0 < opened[0]["connect_timeout"] <= 1
+    assert 0 < connection._read_timeout <= 1
+
+
+def test_stalled_aws_attempt_returns_503_before_deadline(monkeypatch):
+    # Un endpoint que acepta la conexión y nunca responde
+    server = socket.socket()
+    server.bind(("127.0.0.1", 0))
+    server.listen()
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    monkeypatch.setenv("AWS_ENDPOINT_URL", f"http://127.0.0.1:{server.getsockname()[1]}")
+    clients.reset_clients()
+
+    @deadline_aware
+    def handler(event, context):
+        clients.cognito_client("us-east-1").admin_get_user(UserPoolId="us-east-1_test", Username="user")
+
+    start = time.monotonic()
+    try:
+        response = handler({}, FakeContext(remaining_ms=1500))
+    finally:
+        clients.reset_clients()
+        server.close()
+
+    # Sin recortar, cada intento esperaría AWS_CLIENT_READ_TIMEOUT (5 s)
+    assert response['statusCode'] == 503
+    assert time.monotonic() - start < 1.5
+
+
+class FakeRaw:
+
+    def __init__(self, body):
+        self.body = body
+
+    def stream(self, **kwargs):
+        yield self.body
+
+
+@pytest.fixture()
+def sent_timeouts(monkeypatch):
+    """ Cliente de Cognito real que anota el read timeout de cada intento en lugar de enviarlo """
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    monkeypatch.setattr(clients, "_request_timeouts", None)
+    clients.reset_clients()
+    timeouts = []
+
+    def send(request, **kwargs):
+        timeouts.append(request.context.get('read_timeout'))
+        return AWSResponse(request.url, 200, {}, FakeRaw(b'{}'))
+
+    @deadline_aware
+    def handler(event, context):
+        client = clients.cognito_client("us-east-1")
+        client.meta.events.register('before-send', send)
+        client.admin_get_user(UserPoolId="us-east-1_test", Username="user")
+
+    def call(remaining_ms):
+        handler({}, FakeContext(remaining_ms))
+        return timeouts[-1]
+
+    yield call
+    clients.reset_clients()
+
+
+def test_attempt_read_timeout_is_set_per_request(sent_timeouts):
+    assert 0 < sent_timeouts(1500) <= 1
+    # Con tiempo de sobra manda el de client_config; el pool compartido no cambia
+    assert sent_timeouts(60000) == clients.client_config().read_timeout
+
+
+def test_old_botocore_keeps_default_timeouts_and_warns_once(sent_timeouts, monkeypatch, caplog):
+    monkeypatch.delattr(URLLib3Session, "_get_request_timeout")
+
+    with caplog.at_level(logging.WARNING):
+        assert sent_timeouts(1500) is None
+        assert sent_timeouts(1500) is None
+
+    assert [r.message for r in caplog.records if "per-request timeouts" in r.message] == [
+        "botocore does not support per-request timeouts; AWS attempts are not capped at the remaining time"]
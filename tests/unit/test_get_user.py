@@ -0,0 +1,51 @@
+import json
+from collections import OrderedDict
+
+import pytest
+
+from get_user import app
+from saes_common import cache
+from saes_common.cache import LocalCache
+
+
+@pytest.fixture()
+def database(monkeypatch):
+    """ Fila de users devuelta por MySQL (con DictCursor) y caché vacía """
+    row = OrderedDict([('user_id', 1), ('username', 'user'), ('email', 'user@example.com'), ('version', 3)])
+    monkeypatch.setattr(cache, '_caches', {'users': LocalCache(ttl=60, max_entries=10)})
+    monkeypatch.setattr(app, 'db_connection', lambda consistency_key=None: None)
+    monkeypatch.setattr(app, 'fetch_all', lambda *args, **kwargs: [row])
+    return row
+
+
+def test_get_user_returns_etag_from_row_version(database):
+    response = app.lambda_handler({'pathParameters': {'id': '1'}}, None)
+
+    assert response['statusCode'] == 200
+    assert response['headers']['ETag'] == '"1-3"'
+    assert response['headers']['Cache-Control'] == 'max-age=0, must-revalidate'
+    assert json.loads(response['body']) == {'data': [[1, 'user', 'user@example.com', 3]]}
+
+
+@pytest.mark.parametrize("if_none_match", ['"1-3"', 'W/"1-3"', '"0-1", "1-3"', '*'])
+def test_matching_if_none_match_returns_304_without_body(database, if_none_match):
+    event = {'pathParameters': {'id': '1'}, 'headers': {'if-none-match': if_none_match}}
+
+    response = app.lambda_handler(event, None)
+
+    assert response['statusCode'] == 304
+    assert response['body'] == ''
+    assert response['headers']['ETag'] == '"1-3"'
+
+
+def test_stale_etag_returns_full_response(database):
+    event = {'pathParameters': {'id': '1'}, 'headers': {'If-None-Match': '"1-2"'}}
+
+    assert app.lambda_handler(event, None)['statusCode'] == 200
+
+
+def test_etag_without_version_column_changes_with_content():
+    row = OrderedDict([('user_id', 1), ('email', 'a@example.com')])
+    changed = OrderedDict([('user_id', 1), ('email', 'b@example.com')])
+
+    assert app.user_etag(row) != app.user_etag(changed)
@@ -0,0 +1,111 @@
+import pytest
+
+from get_users import app
+from saes_common import db
+
+from .conftest import FakeConnection
+
+
+def users_table(users):
+    """ Conexión cuyas consultas IN devuelven las filas de ``users`` con las columnas pedidas """
+    def respond(query, params):
+        columns = query.split("SELECT ")[1].split(" FROM")[0].split(", ")
+        rows = [users[user_id] for user_id in params if user_id in users]
+        if columns == ["*"]:
+            return rows
+        return [{column: row[column] for column in columns if column in row} for row in rows]
+
+    return FakeConnection(respond)
+
+
+def test_parse_ids_deduplicates_and_keeps_order():
+    assert app.parse_ids("3, 1,3,,2") == [3, 1, 2]
+
+
+@pytest.mark.parametrize("raw_ids", ["", "1,abc", "-1"])
+def test_parse_ids_rejects_invalid_input(raw_ids):
+    with pytest.raises(ValueError):
+        app.parse_ids(raw_ids)
+
+
+def test_parse_ids_rejects_too_many_ids(monkeypatch):
+    monkeypatch.setattr(app, "MAX_BATCH_IDS", 2)
+
+    with pytest.raises(ValueError):
+        app.parse_ids("1,2,3")
+
+
+def test_fetch_users_keys_results_and_lists_missing():
+    connection = users_table({1: {"user_id": 1}, 3: {"user_id": 3}, 4: {"user_id": 4}})
+
+    result = app.fetch_users(connection, [4, 2, 1, 3, 9])
+
+    assert result == {"data": {"4": {"user_id": 4}, "1": {"user_id": 1}, "3": {"user_id": 3}}, "missing": [2, 9]}
+    assert len(connection.queries) == 1
+
+
+def test_fetch_users_never_returns_password():
+    connection = users_table({1: {"user_id": 1, "username": "a", "email": "a@example.com", "role": "usuario",
+                                     "password": "Secret1!"}})
+
+    result = app.fetch_users(connection, [1])
+
+    assert result["data"]["1"] == {"user_id": 1, "username": "a", "email": "a@example.com", "role": "usuario"}
+    assert "password" not in connection.queries[0][0]
+
+
+def test_fetch_all_in_queries_in_chunks():
+    connection = users_table({1: {"user_id": 1}, 9: {"user_id": 9}})
+
+    rows = db.fetch_all_in(connection, "SELECT * FROM users WHERE user_id IN ({placeholders})",
+                           [4, 2, 1, 3, 9], chunk_size=2)
+
+    assert rows == [{"user_id": 1}, {"user_id": 9}]
+    assert connection.queries == [
+        ("SELECT * FROM users WHERE user_id IN (%s, %s)", (4, 2)),
+        ("SELECT * FROM users WHERE user_id IN (%s, %s)", (1, 3)),
+        ("SELECT * FROM users WHERE user_id IN (%s)", (9,)),
+    ]
+
+
+def test_cursor_round_trip():
+    token = app.encode_cursor(42)
+
+    assert "42" not in token
+    assert app.decode_cursor(token) == 42
+    assert app.decode_cursor(None) == 0
+
+
+@pytest.mark.parametrize("token", ["not-a-cursor", app.encode_cursor("42")])
+def test_decode_cursor_rejects_tampered_tokens(token):
+    with pytest.raises(ValueError):
+        app.decode_cursor(token)
+
+
+def test_parse_fields_always_selects_user_id():
+    assert app.parse_fields("email, role") == ["user_id", "email", "role"]
+    assert app.parse_fields(None) == list(app.LISTABLE_COLUMNS)
+    with pytest.raises(ValueError):
+        app.parse_fields("email,password")
+
+
+def test_list_users_pages_by_key(monkeypatch):
+    table = [{"user_id": user_id, "email": f"{user_id}@example.com"} for user_id in (2, 5, 7, 8, 11)]
+    queries = []
+
+    def fake_stream_rows(connection, query, params):
+        queries.append((query, params))
+        after_id, limit = params
+        return iter([row for row in table if row["user_id"] > after_id][:limit])
+
+    monkeypatch.setattr(app, "stream_rows", fake_stream_rows)
+
+    first = app.list_users(None, 0, 2, ["user_id", "email"])
+    second = app.list_users(None, app.decode_cursor(first["next_cursor"]), 2, ["user_id", "email"])
+    last = app.list_users(None, app.decode_cursor(second["next_cursor"]), 2, ["user_id", "email"])
+
+    assert [row["user_id"] for row in first["data"]] == [2, 5]
+    assert [row["user_id"] for row in second["data"]] == [7, 8]
+    assert [row["user_id"] for row in last["data"]] == [11]
+    assert last["next_cursor"] is None
+    assert queries[1] == ("SELECT user_id, email FROM users WHERE user_id > %s ORDER BY user_id LIMIT %s", (5, 3))
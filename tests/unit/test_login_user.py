@@ -0,0 +1,74 @@
+import base64
+import json
+
+from login_user import app
+from saes_common.tokens import token_claims
+
+
+def fake_jwt(claims):
+    payload = base64.urlsafe_b64encode(json.dumps(claims).encode()).rstrip(b"=").decode()
+    return f"eyJhbGciOiJSUzI1NiJ9.{payload}.signature"
+
+
+def login(username="user@example.com", password="Secret1!"):
+    response = app.lambda_handler({"body": json.dumps({"username": username, "password": password})}, None)
+    return response["statusCode"], json.loads(response["body"])
+
+
+def authenticated(id_token):
+    return {"AuthenticationResult": {"IdToken": id_token, "AccessToken": "access", "RefreshToken": "refresh"}}
+
+
+def test_role_comes_from_id_token_without_admin_get_user(cognito):
+    cognito.add_response("initiate_auth", authenticated(fake_jwt({"custom:role": "admin"})))
+
+    status_code, body = login()
+
+    assert status_code == 200
+    assert body["role"] == "admin"
+    cognito.assert_no_pending_responses()
+
+
+def test_missing_role_claim_falls_back_to_admin_get_user(cognito):
+    cognito.add_response("initiate_auth", authenticated(fake_jwt({"cognito:username": "user@example.com"})))
+    cognito.add_response("admin_get_user", {"Username": "user@example.com", "UserAttributes": [
+        {"Name": "custom:role", "Value": "usuario"}]})
+
+    status_code, body = login()
+
+    assert status_code == 200
+    assert body["role"] == "usuario"
+    cognito.assert_no_pending_responses()
+
+
+def test_token_claims_tolerates_malformed_tokens():
+    assert token_claims(fake_jwt({"sub": "1"})) == {"sub": "1"}
+    assert token_claims("not-a-jwt") is None
+    assert token_claims("a.!!!.c") is None
+    assert token_claims(None) is None
+
+
+def test_refresh_token_renews_session_without_password(cognito):
+    cognito.add_response("initiate_auth", {"AuthenticationResult": {
+        "IdToken": fake_jwt({"custom:role": "usuario"}), "AccessToken": "new-access"}},
+        {"ClientId": "client", "AuthFlow": "REFRESH_TOKEN_AUTH", "AuthParameters": {"REFRESH_TOKEN": "refresh"}})
+
+    response = app.lambda_handler({"body": json.dumps({"refresh_token": "refresh"})}, None)
+    body = json.loads(response["body"])
+
+    assert response["statusCode"] == 200
+    assert body["access_token"] == "new-access"
+    # Cognito no rota el refresh token: se devuelve el mismo
+    assert body["refresh_token"] == "refresh"
+    assert body["role"] == "usuario"
+    cognito.assert_no_pending_responses()
+
+
+def test_revoked_refresh_token_is_rejected(cognito):
+    cognito.add_client_error("initiate_auth", service_error_code="NotAuthorizedException",
+                             service_message="Refresh Token has been revoked")
+
+    response = app.lambda_handler({"body": json.dumps({"refresh_token": "revoked"})}, None)
+
+    assert response["statusCode"] == 400
+    assert json.loads(response["body"]) == {"error_message": "Refresh Token has been revoked"}
@@ -0,0 +1,157 @@
+import json
+import threading
+
+import pytest
+
+from profile_admin import app as profile_admin
+from profile_user import app as profile_user
+from saes_common import cache
+from saes_common.profiles import claims_groups
+
+
+def authorized(**claims):
+    return {"requestContext": {"authorizer": {"claims": claims}}, "body": None}
+
+
+def invoke(app, event):
+    response = app.lambda_handler(event, None)
+    return response["statusCode"], json.loads(response["body"])
+
+
+def test_profile_user_is_built_from_id_token_claims(cognito):
+    event = authorized(token_use="id", aud="client", **{
+        "cognito:username": "user@example.com", "email": "user@example.com", "custom:role": "usuario"})
+
+    status_code, body = invoke(profile_user, event)
+
+    assert status_code == 200
+    assert body["user_attributes"] == {"email": "user@example.com", "custom:role": "usuario"}
+    cognito.assert_no_pending_responses()
+
+
+def test_access_token_falls_back_to_cached_admin_get_user(cognito):
+    cognito.add_response("admin_get_user", {"Username": "user@example.com", "UserAttributes": [
+        {"Name": "email", "Value": "user@example.com"}]},
+        {"UserPoolId": "us-east-1_test", "Username": "user@example.com"})
+    event = authorized(token_use="access", username="user@example.com")
+
+    first = invoke(profile_user, event)
+    second = invoke(profile_user, event)
+
+    assert first == second == (200, {"message": "Profile User access successful",
+                                     "user_attributes": {"email": "user@example.com"}})
+    cognito.assert_no_pending_responses()
+
+
+def test_profile_admin_rejects_non_admin_from_claims(cognito):
+    event = authorized(token_use="id", **{"cognito:username": "user@example.com", "cognito:groups": "usuario"})
+
+    assert invoke(profile_admin, event) == (403, {"error_message": "User is not an admin"})
+    cognito.assert_no_pending_responses()
+
+
+def test_profile_admin_accepts_admin_group_from_claims(cognito):
+    event = authorized(token_use="id", **{"cognito:username": "admin@example.com", "cognito:groups": "[usuario admin]",
+                                          "email": "admin@example.com"})
+
+    status_code, body = invoke(profile_admin, event)
+
+    assert status_code == 200
+    assert body["user_attributes"] == {"email": "admin@example.com"}
+    cognito.assert_no_pending_responses()
+
+
+class FakeCognito:
+    """ Sustituto de Cognito cuyas llamadas esperan a que ``release`` se active """
+
+    def __init__(self, groups):
+        self.groups = groups
+        self.release = threading.Event()
+        self.both_in_flight = threading.Barrier(2, timeout=1)
+        self.calls = []
+
+    def admin_get_user(self, UserPoolId, Username):
+        self.calls.append("admin_get_user")
+        self.both_in_flight.wait()
+        self.release.wait(timeout=1)
+        return {"Username": Username, "UserAttributes": [{"Name": "email", "Value": Username}]}
+
+    def admin_list_groups_for_user(self, UserPoolId, Username):
+        self.calls.append("admin_list_groups_for_user")
+        self.both_in_flight.wait()
+        return {"Groups": [{"GroupName": group} for group in self.groups]}
+
+
+@pytest.fixture()
+def fake_cognito(monkeypatch):
+    """ profile_admin con un Cognito local y cachés vacías """
+    monkeypatch.setenv("REGION_NAME", "us-east-1")
+    monkeypatch.setenv("USER_POOL_ID", "us-east-1_test")
+    cache.reset_caches()
+    fakes = []
+
+    def install(groups):
+        fake = FakeCognito(groups)
+        monkeypatch.setattr(profile_admin, "cognito_client", lambda region_name=None: fake)
+        fakes.append(fake)
+        return fake
+
+    yield install
+    for fake in fakes:
+        fake.release.set()
+    cache.reset_caches()
+
+
+def test_profile_admin_without_authorizer_looks_up_both_concurrently(fake_cognito, capsys):
+    fake_cognito(["admin"]).release.set()
+
+    status_code, body = invoke(profile_admin, {"body": json.dumps({"username": "admin@example.com"})})
+
+    # La barrera solo se abre si las dos llamadas están en vuelo a la vez
+    assert status_code == 200
+    assert body["user_attributes"] == {"email": "admin@example.com"}
+    metrics = json.loads(capsys.readouterr().out.splitlines()[-1])
+    assert metrics["Operation"] == "profile_admin" and metrics["source"] == "cognito"
+    assert {"admin_get_user", "admin_list_groups_for_user"} <= set(metrics)
+
+
+def test_profile_admin_short_circuits_for_non_admin(fake_cognito):
+    # admin_get_user queda bloqueado: la respuesta no puede depender de él
+    fake = fake_cognito(["usuario"])
+
+    status_code, body = invoke(profile_admin, {"body": json.dumps({"username": "user@example.com"})})
+
+    assert (status_code, body) == (403, {"error_message": "User is not an admin"})
+    assert sorted(fake.calls) == ["admin_get_user", "admin_list_groups_for_user"]
+
+
+def test_profile_admin_emits_timings_snapshot_while_lookup_in_flight(fake_cognito, monkeypatch):
+    fake = fake_cognito(["usuario"])
+    emitted = []
+    finished = threading.Event()
+    run_step = profile_admin.run_step
+
+    def tracked_step(timings, step, *args):
+        try:
+            return run_step(timings, step, *args)
+        finally:
+            if step == "admin_get_user":
+                finished.set()
+
+    monkeypatch.setattr(profile_admin, "run_step", tracked_step)
+    monkeypatch.setattr(profile_admin, "emit", lambda operation, values, **props: emitted.append(values))
+
+    invoke(profile_admin, {"body": json.dumps({"username": "user@example.com"})})
+    fake.release.set()
+    assert finished.wait(timeout=1)
+
+    # El paso en segundo plano terminó después de emitir: no aparece en lo emitido
+    assert list(emitted[0]) == ["admin_list_groups_for_user"]
+
+
+def test_claims_groups_accepts_api_gateway_formats():
+    assert claims_groups({"cognito:groups": "admin"}) == ["admin"]
+    assert claims_groups({"cognito:groups": "admin,usuario"}) == ["admin", "usuario"]
+    assert claims_groups({"cognito:groups": "[admin usuario]"}) == ["admin", "usuario"]
+    assert claims_groups({"cognito:groups": ["admin"]}) == ["admin"]
+    assert claims_groups({}) == []
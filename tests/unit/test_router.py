@@ -0,0 +1,26 @@
+import json
+
+from router import app
+
+
+def test_unknown_route_returns_404():
+    ret = app.lambda_handler({"httpMethod": "GET", "resource": "/unknown"}, None)
+
+    assert ret["statusCode"] == 404
+    assert json.loads(ret["body"])["error_message"] == "Route not found"
+
+
+def test_route_dispatches_to_function_handler(monkeypatch):
+    calls = []
+    monkeypatch.setitem(app._handlers, ("GET", "/users/{id}"), lambda event, context: calls.append(event) or {"statusCode": 200})
+
+    event = {"httpMethod": "get", "resource": "/users/{id}", "pathParameters": {"id": "1"}}
+    ret = app.lambda_handler(event, None)
+
+    assert ret["statusCode"] == 200
+    assert calls == [event]
+
+
+def test_every_route_resolves_to_a_handler():
+    for method, resource in app.ROUTES:
+        assert callable(app.resolve(method, resource))
@@ -0,0 +1,58 @@
+import json
+
+import pymysql
+import pytest
+from pymysql.constants import ER
+
+from update_user import app
+
+from .conftest import FakeConnection
+
+
+def users_table(has_version):
+    """ Conexión a una tabla users con o sin la columna version """
+    def respond(query, params):
+        if "version" in query and not connection.has_version:
+            raise pymysql.err.OperationalError(ER.BAD_FIELD_ERROR, "Unknown column 'version' in 'field list'")
+
+    connection = FakeConnection(respond)
+    connection.has_version = has_version
+    return connection
+
+
+def statements(connection):
+    return [query for query, _ in connection.queries]
+
+
+@pytest.fixture()
+def environment(monkeypatch):
+    """ Variables de entorno y caché de usuarios sustituida """
+    monkeypatch.setenv("RDS_SECRET_NAME", "secret")
+    monkeypatch.setenv("RDS_DB_NAME", "user_management")
+    monkeypatch.setenv("RDS_ENDPOINT", "localhost")
+    monkeypatch.setattr(app, "invalidate_user", lambda user_id: None)
+
+
+def invoke(monkeypatch, connection):
+    monkeypatch.setattr(app, "get_connection_from_secret", lambda *args, **kwargs: connection)
+    event = {"pathParameters": {"id": "1"}, "body": json.dumps({"username": "a", "email": "a@example.com"})}
+    return app.lambda_handler(event, None)["statusCode"]
+
+
+def test_update_increments_version(environment, monkeypatch):
+    connection = users_table(has_version=True)
+
+    assert invoke(monkeypatch, connection) == 200
+    assert statements(connection) == [app.UPDATE_USER]
+
+
+def test_update_works_before_version_migration(environment, monkeypatch):
+    connection = users_table(has_version=False)
+
+    assert invoke(monkeypatch, connection) == 200
+    assert statements(connection) == [app.UPDATE_USER, app.UPDATE_USER_WITHOUT_VERSION]
+    # Aplicada la migración, la siguiente actualización ya usa la columna
+    connection.has_version = True
+    connection.queries.clear()
+    assert invoke(monkeypatch, connection) == 200
+    assert statements(connection) == [app.UPDATE_USER]
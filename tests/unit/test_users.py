@@ -0,0 +1,61 @@
+import pytest
+
+from saes_common import db
+from saes_common.users import insert_user_with_profile, insert_users_with_profiles
+
+from .conftest import FakeConnection
+
+
+def fail_on(table):
+    """ Respuesta de MySQL que falla al escribir en ``table`` """
+    def respond(query, params):
+        if table in query:
+            raise RuntimeError("write failed")
+
+    return respond
+
+
+def statements(connection):
+    # 'INSERT INTO users (...)' -> 'INSERT users'; BEGIN/COMMIT/ROLLBACK tal cual
+    return [' '.join(entry.split()[0:3:2]) for entry in connection.log]
+
+
+def test_insert_user_with_profile_uses_one_transaction(monkeypatch):
+    monkeypatch.setattr(db, 'round_trips', db.Counter())
+    connection = FakeConnection(lastrowid=42)
+
+    user_id = insert_user_with_profile(connection, 'a@example.com', 'pw', 'a@example.com', 'usuario')
+
+    assert user_id == 42
+    assert statements(connection) == ['BEGIN', 'INSERT users', 'INSERT user_profiles', 'COMMIT']
+    assert db.round_trips['create_user'] == 4
+
+
+def test_insert_user_with_profile_rolls_back_partial_write():
+    connection = FakeConnection(fail_on('user_profiles'))
+
+    with pytest.raises(RuntimeError):
+        insert_user_with_profile(connection, 'a@example.com', 'pw', 'a@example.com', 'usuario')
+
+    assert statements(connection) == ['BEGIN', 'INSERT users', 'INSERT user_profiles', 'ROLLBACK']
+
+
+def test_insert_users_with_profiles_maps_ids_to_new_rows():
+    # Una fila antigua con el mismo email que uno de los nuevos
+    rows = [(7, 'a@example.com')]
+    profiles = []
+
+    def respond(query, params):
+        if query.startswith("INSERT INTO users"):
+            rows.extend((100 + i, user[2]) for i, user in enumerate(params))
+        elif query.startswith("INSERT INTO user_profiles"):
+            profiles.extend(user_id for (user_id,) in params)
+        else:
+            # Sin ORDER BY, MySQL puede devolver antes la fila nueva que la antigua
+            return [(email, user_id) for user_id, email in sorted(rows, reverse="ORDER BY user_id" not in query)]
+
+    user_ids = insert_users_with_profiles(FakeConnection(respond), [
+        ('a@example.com', 'pw', 'a@example.com', 'usuario'), ('b@example.com', 'pw', 'b@example.com', 'usuario')])
+
+    assert user_ids == {'a@example.com': 100, 'b@example.com': 101}
+    assert profiles == [100, 101]
@@ -1,21 +1,22 @@
 import json
 import os
-import boto3
-import pymysql
+import logging
+from saes_common.db import get_connection_from_secret, discard_connection, execute, is_unknown_column_error
+from saes_common.deadline import deadline_aware
+from saes_common.responses import build_response
+from saes_common.users import invalidate_user
 
-def get_db_credentials():
-    client = boto3.client('secretsmanager')
-    secret_name = os.environ['RDS_SECRET_NAME']
-    secret_value = client.get_secret_value(SecretId=secret_name)
-    return json.loads(secret_value['SecretString'])
+# version cambia el ETag de GET /users/{id} (db/migrations/0001_users_version.sql)
+UPDATE_USER = "UPDATE users SET username = %s, email = %s, version = version + 1 WHERE user_id = %s"
+UPDATE_USER_WITHOUT_VERSION = "UPDATE users SET username = %s, email = %s WHERE user_id = %s"
 
+@deadline_aware
 def lambda_handler(event, context):
-    db_credentials = get_db_credentials()
-    connection = pymysql.connect(
-        host=os.environ['RDS_ENDPOINT'],
-        user=db_credentials['username'],
-        password=db_credentials['password'],
-        db=os.environ['RDS_DB_NAME']
+    # Credenciales en caché y conexión reutilizada entre invocaciones
+    connection = get_connection_from_secret(
+        os.environ['RDS_SECRET_NAME'],
+        database=os.environ['RDS_DB_NAME'],
+        host=os.environ['RDS_ENDPOINT']
     )
     try:
         user_id = event['pathParameters']['id']
@@ -23,20 +24,27 @@ def lambda_handler(event, context):
         username = body.get('username')
         email = body.get('email')
 
-        with connection.cursor() as cursor:
-            sql = "UPDATE users SET username = %s, email = %s WHERE user_id = %s"
-            cursor.execute(sql, (username, email, user_id))
-            connection.commit()
+        update_user(connection, (username, email, user_id))
+        # La siguiente lectura de GET /users/{id} irá a MySQL
+        invalidate_user(user_id)
 
-        return {
-            'statusCode': 200,
-            'body': json.dumps('User updated successfully')
-        }
+        return build_response(200, 'User updated successfully')
     except Exception as e:
         print(f"Error: {e}")
-        return {
-            'statusCode': 500,
-            'body': json.dumps('Internal server error')
-        }
-    finally:
-        connection.close()
+        discard_connection()
+        return build_response(500, 'Internal server error')
+
+def update_user(connection, params):
+    """
+    Actualiza el usuario incrementando ``version``. Sin la migración aplicada
+    actualiza solo los datos: get_user usa entonces un hash de la fila como
+    ETag, que también cambia. No se recuerda el fallo, para empezar a usar la
+    columna en cuanto exista.
+    """
+    try:
+        return execute(connection, UPDATE_USER, params)
+    except Exception as e:
+        if not is_unknown_column_error(e):
+            raise
+        logging.warning("users.version is missing, apply db/migrations/0001_users_version.sql")
+    return execute(connection, UPDATE_USER_WITHOUT_VERSION, params)